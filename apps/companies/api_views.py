@@ -3,6 +3,10 @@ API views for the companies app.
 """
 
 from rest_framework import viewsets, filters
+from apps.core.caching import CachedResponseMixin
+from apps.core.db_routing import ReplicaReadMixin
+from apps.core.pagination import StandardResultsSetPagination
+from apps.jobs.services import JobCountService
 from .models import Company
 from .serializers import (
     CompanyListSerializer, 
@@ -10,23 +14,27 @@ from .serializers import (
 )
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet for Company model with search and filtering.
     
     Provides:
     - List all companies with full details
     - Retrieve individual company details
+    - job_count/active_job_count per company (e.g. ?ordering=-active_job_count)
     """
     
-    queryset = Company.objects.prefetch_related('job_postings').all()
+    # Job counts come from per-row subqueries instead of prefetching every job
+    queryset = JobCountService.annotate(Company.objects.all(), 'company')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_generations = ('companies', 'jobs')
+    pagination_class = StandardResultsSetPagination
     
     # Search fields
     search_fields = ['name', 'description']
     
     # Ordering fields
-    ordering_fields = ['name', 'created_at', 'updated_at']
+    ordering_fields = ['name', 'created_at', 'updated_at', 'job_count', 'active_job_count']
     ordering = ['name']  # Default ordering
     
     def get_serializer_class(self):
@@ -3,23 +3,25 @@ Serializers for the companies app API.
 """
 
 from rest_framework import serializers
+from apps.core.serializers import JobCountFieldsMixin
 from .models import Company
 
 
-class CompanyListSerializer(serializers.ModelSerializer):
+class CompanyListSerializer(JobCountFieldsMixin, serializers.ModelSerializer):
     """Clean serializer for company listing views with essential fields only."""
     
     class Meta:
         model = Company
         fields = [
             'id', 'name', 'slug', 'description', 'website', 'company_size',
-            'city', 'state', 'country', 'phone', 'email', 'created_at', 'updated_at'
+            'city', 'state', 'country', 'phone', 'email', 'job_count', 'active_job_count',
+            'created_at', 'updated_at'
         ]
         depth = 1  # Include related data with depth
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
 
 
-class CompanyDetailSerializer(serializers.ModelSerializer):
+class CompanyDetailSerializer(JobCountFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer for individual company views."""
     
     class Meta:
@@ -27,6 +29,7 @@ class CompanyDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'slug', 'description', 'website', 'company_size',
             'address_line1', 'address_line2', 'city', 'state', 'postcode', 'country',
-            'phone', 'email', 'details_url', 'logo', 'created_at', 'updated_at'
+            'phone', 'email', 'details_url', 'logo', 'job_count', 'active_job_count',
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
\ No newline at end of file
@@ -3,6 +3,10 @@ API views for the core app.
 """
 
 from rest_framework import viewsets, filters
+from apps.core.caching import CachedResponseMixin
+from apps.core.db_routing import ReplicaReadMixin
+from apps.core.pagination import StandardResultsSetPagination
+from apps.jobs.services import JobCountService
 from .models import Location
 from .serializers import (
     LocationListSerializer, 
@@ -10,23 +14,27 @@ from .serializers import (
 )
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet for Location model with search and filtering.
     
     Provides:
     - List all locations with full details
     - Retrieve individual location details
+    - job_count/active_job_count per location (e.g. ?ordering=-active_job_count)
     """
     
-    queryset = Location.objects.prefetch_related('jobs').all()
+    # Job counts come from per-row subqueries instead of prefetching every job
+    queryset = JobCountService.annotate(Location.objects.all(), 'location')
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_generations = ('locations', 'jobs')
+    pagination_class = StandardResultsSetPagination
     
     # Search fields
     search_fields = ['name', 'city', 'state', 'country']
     
     # Ordering fields
-    ordering_fields = ['name', 'city', 'state', 'country', 'created_at', 'updated_at']
+    ordering_fields = ['name', 'city', 'state', 'country', 'created_at', 'updated_at', 'job_count', 'active_job_count']
     ordering = ['country', 'state', 'city', 'name']  # Default ordering
     
     def get_serializer_class(self):
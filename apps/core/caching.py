@@ -0,0 +1,222 @@
+"""
+Response caching for read-heavy API endpoints.
+
+Cached responses are keyed by path, normalized query params, the negotiated
+media type, the database read from and the current "generation" of every table they read. Writers
+bump a table's generation instead of deleting keys, so all stale entries
+become unreachable at once and expire on their own.
+
+Responses carry a strong ETag (hash of the body) and honour If-None-Match.
+
+Caching needs a cache every process shares (CACHE_URL): with the per-process
+local-memory fallback a worker's bumps never reach the web processes, so
+API_RESPONSE_CACHE_ENABLED is off without it. Long writers (scraper runs)
+wrap their work in `batched_generation_bumps()` so per-save bumps are
+coalesced instead of invalidating the cache on every row.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.http import HttpResponse, HttpResponseNotModified
+
+logger = logging.getLogger(__name__)
+
+
+GENERATION_KEY = 'gen:{}'
+RESPONSE_KEY = 'resp:{}'
+DEFAULT_RESPONSE_TIMEOUT = 5 * 60
+
+
+def _initial_generation() -> int:
+    # Time-based so a generation key that was evicted never restarts at a value
+    # an older cached response was keyed with
+    return int(time.time() * 1000)
+
+
+# Bumps inside batched_generation_bumps() are sent at most this often
+BATCHED_BUMP_INTERVAL = 30
+
+_batches = threading.local()
+
+
+def bump_generation(*tables: str) -> None:
+    """Invalidate cached responses that read any of `tables`.
+
+    Inside `batched_generation_bumps()` the tables are only collected.
+    """
+    batch = getattr(_batches, 'current', None)
+    if batch is not None:
+        batch['tables'].update(tables)
+        if time.monotonic() - batch['flushed'] >= BATCHED_BUMP_INTERVAL:
+            _flush(batch)
+        return
+    _bump(tables)
+
+
+def bump_generation_on_commit(*tables: str) -> None:
+    """`bump_generation()` once the current transaction commits.
+
+    Bumping earlier would let a reader cache the pre-commit rows under the
+    new generation.
+    """
+    transaction.on_commit(lambda: bump_generation(*tables))
+
+
+@contextmanager
+def batched_generation_bumps() -> Iterator[None]:
+    """Coalesce bumps in this thread: every BATCHED_BUMP_INTERVAL seconds and once on exit."""
+    if getattr(_batches, 'current', None) is not None:
+        yield
+        return
+    batch = _batches.current = {'tables': set(), 'flushed': time.monotonic()}
+    try:
+        yield
+    finally:
+        _batches.current = None
+        _flush(batch)
+
+
+def _flush(batch: dict) -> None:
+    tables, batch['tables'] = batch['tables'], set()
+    batch['flushed'] = time.monotonic()
+    _bump(tables)
+
+
+def _bump(tables: Iterable[str]) -> None:
+    for table in tables:
+        key = GENERATION_KEY.format(table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing key: start a new generation
+            cache.set(key, _initial_generation(), None)
+        except Exception as exc:
+            logger.warning("Could not bump cache generation for %s: %s", table, exc)
+
+
+def get_generations(tables: Iterable[str]) -> Dict[str, int]:
+    """Return the current generation of each table, creating missing ones."""
+    tables = list(tables)
+    keys = {table: GENERATION_KEY.format(table) for table in tables}
+    found = cache.get_many(list(keys.values()))
+    generations = {}
+    for table, key in keys.items():
+        value = found.get(key)
+        if value is None:
+            value = _initial_generation()
+            if not cache.add(key, value, None):
+                value = cache.get(key, value)
+        generations[table] = value
+    return generations
+
+
+def make_etag(body: bytes) -> str:
+    return '"{}"'.format(hashlib.sha256(body).hexdigest()[:40])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _response_key(request, generations: Dict[str, int], alias: str) -> str:
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw = repr((request.path, params, request.accepted_media_type, alias, sorted(generations.items())))
+    return RESPONSE_KEY.format(hashlib.sha1(raw.encode('utf-8')).hexdigest())
+
+
+def _conditional(body: bytes, content_type: str, etag: str, if_none_match: Optional[str]):
+    if etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type=content_type)
+    response['ETag'] = etag
+    return response
+
+
+class CachedResponseMixin:
+    """Cache rendered JSON for list/retrieve (and opted-in actions) of a viewset.
+
+    Set `cache_generations` to the tables the responses read, starting with
+    the viewset's own table. Only successful responses rendered as JSON are
+    cached; the browsable API is always rendered live. Model saves bump
+    generations through signals (apps.jobs.signals); API deletes bump here.
+    """
+
+    cache_generations = ()
+    cache_timeout = DEFAULT_RESPONSE_TIMEOUT
+
+    def cached_response(self, request, build: Callable):
+        """Serve `build()`'s response from cache, with ETag/304 handling."""
+        renderer = getattr(request, 'accepted_renderer', None)
+        if not settings.API_RESPONSE_CACHE_ENABLED:
+            return build()
+        if renderer is None or renderer.format != 'json' or not self.cache_generations:
+            return build()
+
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        try:
+            # Keyed by database too, so clients pinned to the primary never get
+            # a response built from a lagging replica
+            alias = router.db_for_read(self.get_queryset().model)
+            key = _response_key(request, get_generations(self.cache_generations), alias)
+            entry = cache.get(key)
+        except Exception as exc:
+            logger.warning("Response cache unavailable: %s", exc)
+            return build()
+        if entry is not None:
+            body, content_type, etag = entry
+            return _conditional(body, content_type, etag, if_none_match)
+
+        response = build()
+        if response.status_code != 200 or not hasattr(response, 'data'):
+            return response
+        body = renderer.render(
+            response.data,
+            request.accepted_media_type,
+            {'request': request, 'response': response, 'view': self},
+        )
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        etag = make_etag(body)
+        try:
+            cache.set(key, (body, content_type, etag), self.cache_timeout)
+        except Exception as exc:
+            logger.warning("Could not store cached response: %s", exc)
+        return _conditional(body, content_type, etag, if_none_match)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        if self.cache_generations:
+            bump_generation(self.cache_generations[0])
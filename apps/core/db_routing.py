@@ -0,0 +1,106 @@
+"""
+Read-replica routing.
+
+Reads go to the `replica` database only inside `read_from_replica()` (or via
+`.using(reads_alias())`). Scrapers and expire_jobs read their own writes
+(dedup checks, id batches), so everything else stays on `default`. Writes
+always go to `default`.
+
+API viewsets opt in with `ReplicaReadMixin`: safe requests read from the
+replica unless the client asks for the primary (`X-Read-From-Primary: 1`) or
+recently wrote through the API (a short-lived cookie pins it to the primary
+so it reads its own writes despite replication lag).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+
+PRIMARY_ALIAS = 'default'
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'db_pin_primary'
+PIN_HEADER = 'X-Read-From-Primary'
+
+_use_replica: ContextVar[bool] = ContextVar('use_replica', default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def reads_alias() -> str:
+    """Alias for replica-tolerant reads: the replica when configured, else the primary."""
+    return REPLICA_ALIAS if replica_configured() else PRIMARY_ALIAS
+
+
+@contextmanager
+def read_from_replica():
+    """Route ORM reads inside the block to the replica (when configured)."""
+    token = _use_replica.set(True)
+    try:
+        yield reads_alias()
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Force ORM reads inside the block to the primary."""
+    token = _use_replica.set(False)
+    try:
+        yield PRIMARY_ALIAS
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Send opted-in reads to the replica; writes and migrations to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_ALIAS
+
+
+def wants_primary(request) -> bool:
+    """Whether this request must read from the primary."""
+    return (
+        request.headers.get(PIN_HEADER) in ('1', 'true', 'True')
+        or PIN_COOKIE in request.COOKIES
+    )
+
+
+class ReplicaReadMixin:
+    """Serve safe requests of a DRF view from the replica.
+
+    Successful writes set a cookie that pins the client to the primary for
+    `DATABASE_REPLICA_PIN_SECONDS`.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS and not wants_primary(request):
+            with read_from_replica():
+                return super().dispatch(request, *args, **kwargs)
+
+        with read_from_primary():
+            response = super().dispatch(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,191 @@
+"""
+Named locks and rate limits shared by web processes, Celery workers and beat.
+
+Locks live in Redis (settings.LOCK_REDIS_URL, defaulting to the Celery
+broker): SET NX PX with a random token, and release/extend only succeed for
+the token that holds the lock, so a holder that outlived its timeout cannot
+drop someone else's lock. `extend()` also re-takes a lapsed lock nobody else
+has taken, and `keep_alive()` renews a lock while long work runs. Without redis-py or a redis:// URL they fall back
+to the Django cache's atomic `add`, which only spans processes when the
+cache is shared (CACHE_URL). `SharedTokenBucket` needs Redis: the cache has
+no atomic read-modify-write to refill and spend tokens with.
+"""
+
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import redis  # type: ignore
+    REDIS_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None  # type: ignore
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+LOCK_KEY = 'lock:{}'
+
+# Delete / re-expire the key only while it still holds the caller's token
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+_EXTEND_SCRIPT = """
+local holder = redis.call('get', KEYS[1])
+if holder == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+if not holder then
+    redis.call('set', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Refill by elapsed Redis time, then spend `ARGV[3]` tokens or return the
+# milliseconds until they will be there (nothing is spent while waiting)
+_TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('time')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local rate, capacity, wanted = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local wait = 0
+if tokens >= wanted then
+    tokens = tokens - wanted
+else
+    wait = math.ceil((wanted - tokens) * 1000 / rate)
+end
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('pexpire', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+RATE_KEY = 'ratelimit:{}'
+
+_clients = {}
+
+
+def _redis_client():
+    url = getattr(settings, 'LOCK_REDIS_URL', '') or ''
+    if not (REDIS_AVAILABLE and url.startswith(('redis://', 'rediss://', 'unix://'))):
+        return None
+    client = _clients.get(url)
+    if client is None:
+        client = _clients[url] = redis.Redis.from_url(url)
+    return client
+
+
+class DistributedLock:
+    """A lock on `name` that expires after `timeout` seconds unless extended.
+
+    `acquire()` returns the holder's token (or None when the lock is taken);
+    pass it to `extend()` and `release()`, possibly from another process.
+    """
+
+    def __init__(self, name: str, timeout: int):
+        self.key = LOCK_KEY.format(name)
+        self.timeout = max(1, int(timeout))
+        self.client = _redis_client()
+
+    def acquire(self) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if self.client is not None:
+            acquired = self.client.set(self.key, token, nx=True, px=self.timeout * 1000)
+        else:
+            acquired = cache.add(self.key, token, self.timeout)
+        return token if acquired else None
+
+    def extend(self, token: str) -> bool:
+        """Restart the timeout, re-taking the lock if it lapsed and is still free.
+
+        False when another holder has the lock.
+        """
+        if self.client is not None:
+            return bool(self.client.eval(_EXTEND_SCRIPT, 1, self.key, token, self.timeout * 1000))
+        holder = cache.get(self.key)
+        if holder == token and cache.touch(self.key, self.timeout):
+            return True
+        return holder in (None, token) and cache.add(self.key, token, self.timeout)
+
+    @contextmanager
+    def keep_alive(self, token: str) -> Iterator[threading.Event]:
+        """Extend the lock every third of its timeout while the block runs.
+
+        Yields an Event that is set if the lock is lost to another holder, so
+        the caller can treat work done meanwhile as unguarded.
+        """
+        stop, lost = threading.Event(), threading.Event()
+
+        def renew():
+            while not stop.wait(self.timeout / 3):
+                try:
+                    renewed = self.extend(token)
+                except Exception as exc:
+                    logger.warning("Could not extend lock %s: %s", self.key, exc)
+                    continue
+                if not renewed:
+                    logger.warning("Lock %s was taken over by another holder", self.key)
+                    lost.set()
+                    return
+
+        thread = threading.Thread(target=renew, name=f"keep-alive {self.key}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
+
+    def release(self, token: str) -> bool:
+        """Release the lock if `token` still holds it."""
+        try:
+            if self.client is not None:
+                return bool(self.client.eval(_RELEASE_SCRIPT, 1, self.key, token))
+            if cache.get(self.key) != token:
+                return False
+            cache.delete(self.key)
+            return True
+        except Exception as exc:
+            logger.warning("Could not release lock %s: %s", self.key, exc)
+            return False
+
+    def holder(self) -> Optional[str]:
+        """Token currently holding the lock, if any."""
+        if self.client is not None:
+            value = self.client.get(self.key)
+            return value.decode() if isinstance(value, bytes) else value
+        return cache.get(self.key)
+
+
+class SharedTokenBucket:
+    """A token bucket on `name` shared by every process: `rate` tokens per second, up to `capacity`.
+
+    Only usable with Redis (`available()`); callers keep their own
+    per-process bucket otherwise.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.key = RATE_KEY.format(name)
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.client = _redis_client()
+
+    def available(self) -> bool:
+        return self.client is not None
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` if the bucket holds them (0.0), else the seconds until it will."""
+        wait_ms = self.client.eval(_TOKEN_BUCKET_SCRIPT, 1, self.key, self.rate, self.capacity, tokens)
+        return int(wait_ms) / 1000
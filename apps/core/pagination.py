@@ -0,0 +1,12 @@
+"""
+Pagination classes for the API.
+"""
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """Page-number pagination with a client-adjustable page size (?page_size=, max 500)."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -54,7 +54,22 @@ from rest_framework import serializers
 from .models import Location
 
 
-class LocationListSerializer(serializers.ModelSerializer):
+class JobCountFieldsMixin(serializers.Serializer):
+    """Read-only `job_count`/`active_job_count` annotated by JobCountService.
+
+    Freshly created rows are not annotated and report 0.
+    """
+    job_count = serializers.SerializerMethodField()
+    active_job_count = serializers.SerializerMethodField()
+
+    def get_job_count(self, obj):
+        return getattr(obj, 'job_count', 0)
+
+    def get_active_job_count(self, obj):
+        return getattr(obj, 'active_job_count', 0)
+
+
+class LocationListSerializer(JobCountFieldsMixin, serializers.ModelSerializer):
     """Complete serializer for location listing views with all fields."""
     
     class Meta:
@@ -64,12 +79,13 @@ class LocationListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class LocationDetailSerializer(serializers.ModelSerializer):
+class LocationDetailSerializer(JobCountFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer for individual location views."""
     
     class Meta:
         model = Location
         fields = [
-            'id', 'name', 'city', 'state', 'country', 'created_at', 'updated_at'
+            'id', 'name', 'city', 'state', 'country', 'job_count', 'active_job_count',
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
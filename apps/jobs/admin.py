@@ -4,7 +4,13 @@ Admin configuration for job models.
 
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import JobPosting, JobScript, JobScheduler, JobSyncRun, JobSyncPortalResult, JobSyncJobResult
+
+from apps.core.caching import bump_generation
+from .models import (
+    JobChange, JobDelivery, JobFacetCount, JobPosting, JobScript, JobScheduler, JobSourceTTL,
+    JobSyncRun, JobSyncPortalResult, JobSyncJobResult, JobSyncOutbox, JobSyncPortalState,
+)
+from .services import JobChangeLogService, JobSyncOutboxService
 
 
 @admin.register(JobPosting)
@@ -51,7 +57,7 @@ class JobPostingAdmin(admin.ModelAdmin):
         'location__city'
     ]
 
-    readonly_fields = ['slug', 'scraped_at', 'updated_at', 'external_url_link']
+    readonly_fields = ['slug', 'scraped_at', 'updated_at', 'external_url_link', 'salary_min_annual', 'salary_max_annual', 'closing_at']
 
     date_hierarchy = 'scraped_at'
     ordering = ['-scraped_at']
@@ -61,10 +67,10 @@ class JobPostingAdmin(admin.ModelAdmin):
             'fields': ('title', 'slug', 'description', 'company', 'posted_by')
         }),
         ('Job Details', {
-            'fields': ('job_category', 'job_type', 'experience_level', 'work_mode', 'location', 'job_closing_date','skills', 'preferred_skills')
+            'fields': ('job_category', 'job_type', 'experience_level', 'work_mode', 'location', 'job_closing_date', 'closing_at', 'skills', 'preferred_skills')
         }),
         ('Salary Information', {
-            'fields': ('salary_min', 'salary_max', 'salary_currency', 'salary_type', 'salary_raw_text'),
+            'fields': ('salary_min', 'salary_max', 'salary_currency', 'salary_type', 'salary_raw_text', 'salary_min_annual', 'salary_max_annual'),
             
         }),
         ('External Source', {
@@ -107,18 +113,28 @@ class JobPostingAdmin(admin.ModelAdmin):
 
     def mark_as_inactive(self, request, queryset):
         """Mark selected jobs as inactive."""
-        count = queryset.update(status='inactive')
+        count = JobChangeLogService.update(queryset, status='inactive')
+        bump_generation('jobs')
         self.message_user(request, f'{count} jobs marked as inactive.')
 
     mark_as_inactive.short_description = 'Mark selected jobs as inactive'
 
     def mark_as_active(self, request, queryset):
         """Mark selected jobs as active."""
-        count = queryset.update(status='active')
+        count = JobChangeLogService.update(queryset, status='active')
+        bump_generation('jobs')
         self.message_user(request, f'{count} jobs marked as active.')
 
     mark_as_active.short_description = 'Mark selected jobs as active'
 
+    def delete_model(self, request, obj):
+        JobChangeLogService.delete(JobPosting.objects.filter(pk=obj.pk))
+        bump_generation('jobs')
+
+    def delete_queryset(self, request, queryset):
+        JobChangeLogService.delete(queryset)
+        bump_generation('jobs')
+
     def export_selected_jobs(self, request, queryset):
         """Export selected jobs."""
         count = queryset.count()
@@ -148,6 +164,29 @@ class JobSchedulerAdmin(admin.ModelAdmin):
     readonly_fields = ['crontab', 'periodic_task', 'last_run_at']
 
 
+@admin.register(JobSourceTTL)
+class JobSourceTTLAdmin(admin.ModelAdmin):
+    list_display = ['id', 'source', 'ttl_days', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    search_fields = ['source']
+
+
+@admin.register(JobFacetCount)
+class JobFacetCountAdmin(admin.ModelAdmin):
+    list_display = ['id', 'dimension', 'value', 'active_count', 'total_count', 'updated_at']
+    list_filter = ['dimension']
+    search_fields = ['value']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(JobChange)
+class JobChangeAdmin(admin.ModelAdmin):
+    list_display = ['seq', 'job_id', 'op', 'changed_at']
+    list_filter = ['op']
+    search_fields = ['job_id']
+    readonly_fields = ['seq', 'job_id', 'op', 'changed_at']
+
+
 @admin.register(JobSyncRun)
 class JobSyncRunAdmin(admin.ModelAdmin):
     list_display = ['id', 'status', 'incremental', 'jobs_fetched', 'total_synced', 'started_at', 'finished_at']
@@ -158,8 +197,8 @@ class JobSyncRunAdmin(admin.ModelAdmin):
 
 @admin.register(JobSyncPortalResult)
 class JobSyncPortalResultAdmin(admin.ModelAdmin):
-    list_display = ['id', 'run', 'portal_name', 'target_url', 'batch_size', 'success_count', 'failure_count', 'success_rate']
-    list_filter = ['portal_name']
+    list_display = ['id', 'run', 'portal_name', 'status', 'target_url', 'batch_size', 'jobs_fetched', 'chunks_done', 'chunks_total', 'success_count', 'failure_count', 'skipped_count', 'success_rate', 'finished_at']
+    list_filter = ['portal_name', 'status']
     search_fields = ['portal_name', 'target_url']
 
 
@@ -169,3 +208,34 @@ class JobSyncJobResultAdmin(admin.ModelAdmin):
     list_filter = ['was_success', 'response_status', 'created_at']
     search_fields = ['job_id', 'request_url', 'error']
     readonly_fields = ['created_at']
+
+
+@admin.register(JobDelivery)
+class JobDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'portal_name', 'job_id', 'payload_hash', 'delivered_at']
+    list_filter = ['portal_name']
+    search_fields = ['job_id']
+    readonly_fields = ['portal_name', 'job_id', 'payload_hash', 'delivered_at']
+
+
+@admin.register(JobSyncPortalState)
+class JobSyncPortalStateAdmin(admin.ModelAdmin):
+    list_display = ['portal_name', 'high_water_mark', 'updated_at']
+    search_fields = ['portal_name']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(JobSyncOutbox)
+class JobSyncOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'job_id', 'status', 'attempts', 'next_attempt_at', 'enqueued_at', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['job_id', 'last_error']
+    readonly_fields = ['job_id', 'attempts', 'last_error', 'enqueued_at', 'updated_at']
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        """Re-queue the selected entries for immediate delivery."""
+        count = JobSyncOutboxService.enqueue(queryset.values_list('job_id', flat=True))
+        self.message_user(request, f'{count} outbox entries queued for delivery.')
+
+    retry_now.short_description = 'Retry selected entries now'
@@ -2,13 +2,26 @@
 API views for the jobs app.
 """
 
-from rest_framework import viewsets, filters, permissions
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from rest_framework import viewsets, filters, permissions, status
 from rest_framework.decorators import action
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
-from django.db.models import Q, Count
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import router
+from django.db.models import F, Q
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
+from apps.core.caching import CachedResponseMixin, bump_generation
+from apps.core.db_routing import ReplicaReadMixin
+from . import exporters
 from .models import JobPosting, JobScript, JobScheduler
+from .services import JobChangeLogService, JobFacetService, JobSearchService
 from django.http import StreamingHttpResponse
 from django_celery_beat.models import (
     CrontabSchedule,
@@ -19,6 +32,7 @@ from django_celery_beat.models import (
 )
 from .serializers import (
     JobPostingListSerializer,
+    JobPostingListRowSerializer,
     JobPostingDetailSerializer,
     JobPostingFullSerializer,
     JobScriptListSerializer,
@@ -35,7 +49,71 @@ from .models import JobSyncRun, JobSyncPortalResult, JobSyncJobResult
 from .serializers import JobSyncRunSerializer, JobSyncPortalResultSerializer, JobSyncJobResultSerializer
 
 
-class JobPostingViewSet(viewsets.ModelViewSet):
+def _encode_feed_cursor(updated_at, pk) -> str:
+    """Encode a (updated_at, id) feed position as an opaque URL-safe token."""
+    raw = f"{updated_at.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_feed_cursor(token: str):
+    """Decode a feed cursor into (updated_at, id). Raises ValueError if malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        updated_raw, pk_raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').rsplit('|', 1)
+        updated_at = parse_datetime(updated_raw)
+        pk = int(pk_raw)
+    except (ValueError, UnicodeError, binascii.Error) as exc:
+        raise ValueError('Invalid cursor') from exc
+    if updated_at is None:
+        raise ValueError('Invalid cursor')
+    if timezone.is_naive(updated_at):
+        updated_at = timezone.make_aware(updated_at, dt_timezone.utc)
+    return updated_at, pk
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """Negotiation for the export action, where ?format= picks the file format."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        # Export bodies are streamed directly; only error responses are rendered
+        return renderers[0], renderers[0].media_type
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """Ranked full-text search over `JobPosting.search_vector` on PostgreSQL.
+
+    Falls back to trigram word similarity on the title when the full-text
+    query matches nothing (typos). Other backends use DRF's icontains search
+    over `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not JobSearchService.is_supported():
+            return super().filter_queryset(request, queryset, view)
+        terms = ' '.join(self.get_search_terms(request))
+        if not terms:
+            return queryset
+
+        # An explicit ?ordering= wins over relevance
+        ranked = not request.query_params.get(api_settings.ORDERING_PARAM)
+        query = SearchQuery(terms, search_type='websearch', config=JobSearchService.CONFIG)
+        matches = queryset.filter(search_vector=query)
+        if matches.exists():
+            if ranked:
+                matches = matches.annotate(
+                    search_rank=SearchRank(F('search_vector'), query)
+                ).order_by('-search_rank', '-scraped_at')
+            return matches
+
+        fuzzy = queryset.filter(title__trigram_word_similar=terms)
+        if ranked:
+            fuzzy = fuzzy.annotate(
+                search_similarity=TrigramWordSimilarity(terms, 'title')
+            ).order_by('-search_similarity', '-scraped_at')
+        return fuzzy
+
+
+class JobPostingViewSet(ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet for JobPosting model with external_source filtering.
 
@@ -43,12 +121,20 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     - List all jobs with external_source filter
     - Retrieve individual job details
     - External sources listing
+
+    List, retrieve and feed responses are cached per query and job-data
+    generation (see apps.core.caching). GET requests, including exports,
+    read from the replica when one is configured (see apps.core.db_routing).
     """
 
     queryset = JobPosting.objects.select_related('company', 'location', 'posted_by').all()
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_generations = ('jobs', 'companies', 'locations')
+    # Cursor feed pages stop this far behind now; see feed()
+    FEED_SETTLE_SECONDS = 5
+    # Search runs after ordering so relevance order can replace the default ordering
+    filter_backends = [filters.OrderingFilter, JobSearchFilter]
 
-    # Search fields
+    # Search fields (icontains fallback when full-text search is unavailable)
     search_fields = [
         'title', 'description', 'company__name', 'location__name',
         'location__city', 'location__state', 'tags'
@@ -57,6 +143,7 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     # Ordering fields
     ordering_fields = [
         'title', 'scraped_at', 'date_posted', 'salary_min', 'salary_max',
+        'salary_min_annual', 'salary_max_annual',
         'company__name', 'location__name'
     ]
     ordering = ['-scraped_at']  # Default ordering
@@ -71,6 +158,30 @@ class JobPostingViewSet(viewsets.ModelViewSet):
             return JobPostingListSerializer
         return JobPostingDetailSerializer
 
+    def list(self, request, *args, **kwargs):
+        """List jobs.
+
+        Query params (besides filters, search and ordering):
+        - fields: comma-separated top-level keys to return (e.g. id,title,company)
+        - compact: 1/true to truncate descriptions and reduce company/location to id and name
+        - full: 1/true for every model field (ModelSerializer path)
+        """
+        if self.get_serializer_class() is not JobPostingListSerializer:
+            return super().list(request, *args, **kwargs)
+        return self.cached_response(request, lambda: self._list_rows(request))
+
+    def _list_rows(self, request):
+        fields_param = request.query_params.get('fields')
+        fields = [name.strip() for name in fields_param.split(',')] if fields_param else None
+        compact = request.query_params.get('compact') in ('1', 'true', 'True')
+        row_serializer = JobPostingListRowSerializer(fields=fields, compact=compact)
+
+        rows = self.filter_queryset(self.get_queryset()).values(*row_serializer.columns())
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(row_serializer.serialize(page))
+        return Response(row_serializer.serialize(rows))
+
     def get_queryset(self):
         """
         Optionally restricts the returned jobs by filtering against
@@ -106,19 +217,56 @@ class JobPostingViewSet(viewsets.ModelViewSet):
                 # Ignore invalid month/year values silently to avoid breaking existing clients
                 pass
 
+        # Annualized AUD salary range (e.g., ?salary_min_annual=100000&salary_max_annual=150000)
+        # - salary_min_annual: jobs whose annualized lower bound is at least this amount
+        # - salary_max_annual: jobs whose annualized upper bound is at most this amount
+        for param, lookup in (
+            ('salary_min_annual', 'salary_min_annual__gte'),
+            ('salary_max_annual', 'salary_max_annual__lte'),
+        ):
+            value = self.request.query_params.get(param)
+            if value:
+                try:
+                    amount = Decimal(value)
+                except InvalidOperation:
+                    continue
+                # NaN and Infinity are valid Decimals but not amounts
+                if amount.is_finite():
+                    queryset = queryset.filter(**{lookup: amount})
+
         return queryset
 
 
 
+    def perform_destroy(self, instance):
+        # Bulk-style delete so the change log gets a tombstone
+        JobChangeLogService.delete(JobPosting.objects.filter(pk=instance.pk))
+        bump_generation('jobs')
+
     @action(detail=False, methods=['get'])
     def external_sources(self, request):
         """Get all external sources with job counts."""
-        sources = JobPosting.objects.values('external_source').annotate(
-            job_count=Count('id'),
-            active_jobs=Count('id', filter=Q(status='active'))
-        ).order_by('-active_jobs')
+        sources = [
+            {'external_source': row['value'], 'job_count': row['job_count'], 'active_jobs': row['active_jobs']}
+            for row in JobFacetService.facets()['external_source']
+        ]
+        return Response(sources)
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Job counts per source, category, job type, state and work mode.
 
-        return Response(list(sources))
+        Query params:
+        - dimensions: optional comma-separated subset (e.g. external_source,state)
+
+        Served from the precomputed facet table; see JobFacetService.
+        """
+        facets = JobFacetService.facets()
+        requested = request.query_params.get('dimensions')
+        if requested:
+            wanted = {name.strip() for name in requested.split(',')}
+            facets = {name: rows for name, rows in facets.items() if name in wanted}
+        return Response(facets)
 
     @action(
         detail=False,
@@ -129,13 +277,32 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     def feed(self, request):
         """Public, read-only job feed for network sharing.
 
+        Two pagination modes:
+        - Cursor mode (pass `cursor`, empty for the first page): items ordered by
+          (updated_at, id) ascending. Each response carries `next_cursor`; pass it
+          back to get the following page, or later to poll for new changes.
+          Every page is an index range scan regardless of depth. Jobs changed
+          in the last FEED_SETTLE_SECONDS are held back until the next poll,
+          so a save whose transaction commits a little late is not passed
+          over; a transaction left open longer than that can still be missed.
+          Consumers that must see every change should follow /jobs/changes.
+        - Offset mode (compatibility, no `cursor`): newest first, `offset`/`limit`.
+
         Query params:
-        - since: ISO8601 datetime (e.g., 2025-09-04T00:00:00Z) or UNIX epoch seconds
+        - cursor: opaque cursor from a previous `next_cursor` (enables cursor mode)
+        - since: ISO8601 datetime (e.g., 2025-09-04T00:00:00Z) or UNIX epoch seconds;
+          in cursor mode this is the starting position when `cursor` is empty
         - limit: max items to return (default 100, max 500)
-        - offset: pagination offset (default 0)
+        - offset: pagination offset (default 0, offset mode only)
         - status: filter by status (default 'active')
         - external_source: optional source filter (icontains)
+
+        Responses are cached until job data changes and carry an ETag; polls
+        with a matching If-None-Match get 304 Not Modified.
         """
+        return self.cached_response(request, lambda: self._build_feed(request))
+
+    def _build_feed(self, request):
         # Parse 'since'
         since_param = request.query_params.get('since')
         since_dt = None
@@ -143,11 +310,11 @@ class JobPostingViewSet(viewsets.ModelViewSet):
             try:
                 # Try epoch seconds
                 if since_param.isdigit():
-                    since_dt = timezone.datetime.fromtimestamp(int(since_param), tz=timezone.utc)
+                    since_dt = datetime.fromtimestamp(int(since_param), tz=dt_timezone.utc)
                 else:
                     parsed = parse_datetime(since_param)
                     if parsed is not None:
-                        since_dt = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed, timezone.utc)
+                        since_dt = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed, dt_timezone.utc)
             except Exception:
                 since_dt = None
 
@@ -174,11 +341,30 @@ class JobPostingViewSet(viewsets.ModelViewSet):
             qs = qs.filter(status=status_param)
         if external_source:
             qs = qs.filter(external_source__icontains=external_source)
-        if since_dt:
-            qs = qs.filter(Q(updated_at__gte=since_dt) | Q(scraped_at__gte=since_dt))
 
-        qs = qs.order_by('-updated_at', '-scraped_at')
-        items = list(qs[offset:offset + limit])
+        cursor_param = request.query_params.get('cursor')
+        cursor_mode = cursor_param is not None
+        if cursor_mode and cursor_param:
+            try:
+                cursor_updated_at, cursor_id = _decode_feed_cursor(cursor_param)
+            except ValueError:
+                return Response({'detail': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            qs = qs.filter(
+                Q(updated_at__gt=cursor_updated_at) | Q(updated_at=cursor_updated_at, id__gt=cursor_id)
+            )
+        elif since_dt:
+            # updated_at is always >= scraped_at, so a single indexed range covers both
+            qs = qs.filter(updated_at__gte=since_dt)
+
+        if cursor_mode:
+            qs = qs.filter(updated_at__lte=timezone.now() - timedelta(seconds=self.FEED_SETTLE_SECONDS))
+            qs = qs.order_by('updated_at', 'id')
+            items = list(qs[:limit + 1])
+            has_more = len(items) > limit
+            items = items[:limit]
+        else:
+            qs = qs.order_by('-updated_at', '-scraped_at')
+            items = list(qs[offset:offset + limit])
 
         def to_feed_item(obj: JobPosting):
             # Salary
@@ -219,6 +405,20 @@ class JobPostingViewSet(viewsets.ModelViewSet):
             }
 
         data = [to_feed_item(obj) for obj in items]
+        if cursor_mode:
+            if items:
+                next_cursor = _encode_feed_cursor(items[-1].updated_at, items[-1].pk)
+            else:
+                # Nothing new: hand back the same position so pollers can keep it
+                next_cursor = cursor_param or (_encode_feed_cursor(since_dt, 0) if since_dt else None)
+            return Response({
+                'count': len(data),
+                'limit': limit,
+                'next_cursor': next_cursor,
+                'has_more': has_more,
+                'server_time': timezone.now().isoformat(),
+                'results': data,
+            })
         return Response({
             'count': len(data),
             'offset': offset,
@@ -231,114 +431,103 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     @action(
         detail=False,
         methods=['get'],
-        url_path='export',
+        url_path='changes',
         permission_classes=[permissions.AllowAny]
     )
+    def changes(self, request):
+        """Incremental change feed from the job change log, in sequence order.
+
+        Query params:
+        - after_seq: last `seq` already applied (default 0 = from the start)
+        - limit: max entries to return (default 500, max 1000)
+
+        Each entry is {seq, job_id, op, changed_at, job}. `op` is insert,
+        update or delete; `job` is the job's current list representation (any
+        status), or null for deletes and for jobs deleted since. Apply
+        inserts/updates as upserts and deletes as removals, then continue
+        from `next_after_seq`. Old entries are compacted, so reading from
+        after_seq=0 doubles as a full snapshot. A cursor older than the
+        retention window gets 410 Gone: restart from after_seq=0.
+        """
+        try:
+            after_seq = int(request.query_params.get('after_seq', '0'))
+        except ValueError:
+            return Response({'detail': 'after_seq must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', '500'))
+        except ValueError:
+            limit = 500
+        limit = max(1, min(1000, limit))
+
+        if not JobChangeLogService.cursor_is_valid(after_seq):
+            return Response(
+                {'detail': 'after_seq is older than the change-log retention; re-sync from after_seq=0'},
+                status=status.HTTP_410_GONE,
+            )
+
+        entries, has_more = JobChangeLogService.changes(after_seq, limit)
+        row_serializer = JobPostingListRowSerializer()
+        job_ids = {entry['job_id'] for entry in entries if entry['op'] != 'delete'}
+        rows = JobPosting.objects.filter(id__in=job_ids).values(*row_serializer.columns())
+        jobs = {job['id']: job for job in row_serializer.serialize(rows)}
+        for entry in entries:
+            entry['job'] = jobs.get(entry['job_id']) if entry['op'] != 'delete' else None
+
+        return Response({
+            'count': len(entries),
+            'next_after_seq': entries[-1]['seq'] if entries else after_seq,
+            'has_more': has_more,
+            'server_time': timezone.now().isoformat(),
+            'results': entries,
+        })
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='export',
+        permission_classes=[permissions.AllowAny],
+        content_negotiation_class=ExportContentNegotiation,
+    )
     def export(self, request):
         """Stream ALL job data over the network.
 
         Query params:
-        - format: ndjson (default) or json
+        - format: ndjson (default), json, csv, parquet or arrow (Arrow IPC file;
+          parquet/arrow need pyarrow)
         - external_source: optional icontains filter
         - status: optional exact match filter (if omitted, includes all statuses)
+
+        Rows are read column-wise from a server-side cursor and encoded per
+        chunk. JSON/CSV bodies are gzip or zstd compressed when Accept-Encoding
+        allows; Parquet/Arrow are written in zstd-compressed row groups.
         """
         fmt = (request.query_params.get('format') or 'ndjson').lower()
-        external_source = request.query_params.get('external_source')
-        status_param = request.query_params.get('status')
-
-        qs = JobPosting.objects.select_related('company', 'location', 'posted_by')
-        if external_source:
-            qs = qs.filter(external_source__icontains=external_source)
-        if status_param:
-            qs = qs.filter(status=status_param)
-        qs = qs.order_by('id')  # stable ordering for full export
-
-        def serialize(obj: JobPosting):
-            # Salary text
-            salary_text = obj.salary_raw_text or ''
-            if not salary_text:
-                try:
-                    salary_text = obj.salary_display
-                except Exception:
-                    salary_text = ''
-            # Remote flag
-            remote_allowed = False
-            try:
-                remote_allowed = 'remote' in (obj.work_mode or '').lower()
-            except Exception:
-                remote_allowed = False
-
-            return {
-                'id': obj.pk,
-                'title': obj.title,
-                'slug': obj.slug,
-                'description': obj.description or '',
-                'company': getattr(obj.company, 'name', ''),
-                'company_id': getattr(obj.company, 'id', None),
-                'location': getattr(obj.location, 'name', '') if obj.location_id else '',
-                'location_id': obj.location_id,
-                'posted_by': str(getattr(obj.posted_by, 'username', '')),
-                'job_category': obj.job_category,
-                'job_type': obj.job_type,
-                'experience_level': obj.experience_level or '',
-                'work_mode': obj.work_mode or '',
-                'salary_min': obj.salary_min,
-                'salary_max': obj.salary_max,
-                'salary_currency': obj.salary_currency,
-                'salary_type': obj.salary_type,
-                'salary_raw_text': obj.salary_raw_text or '',
-                'salary_display': salary_text,
-                'external_source': obj.external_source,
-                'external_url': obj.external_url,
-                'external_id': obj.external_id,
-                'status': obj.status,
-                'posted_ago': obj.posted_ago or '',
-                'date_posted': obj.date_posted.isoformat() if obj.date_posted else None,
-                'expired_at': obj.expired_at.isoformat() if obj.expired_at else None,
-                'tags': obj.tags or '',
-                'tags_list': obj.tags_list,
-                'job_closing_date': obj.job_closing_date or '',
-                'skills': obj.skills or '',
-                'preferred_skills': obj.preferred_skills or '',
-                'additional_info': obj.additional_info or {},
-                'scraped_at': obj.scraped_at.isoformat() if obj.scraped_at else None,
-                'updated_at': obj.updated_at.isoformat() if obj.updated_at else None,
-                'remote_allowed': remote_allowed,
-            }
-
-        if fmt == 'json':
-            import json as _json
-
-            def json_stream():
-                yield '['
-                first = True
-                for obj in qs.iterator(chunk_size=1000):
-                    item = serialize(obj)
-                    if first:
-                        first = False
-                    else:
-                        yield ','
-                    yield _json.dumps(item, ensure_ascii=False)
-                yield ']'
-
-            resp = StreamingHttpResponse(json_stream(), content_type='application/json; charset=utf-8')
-            resp['Content-Disposition'] = 'attachment; filename="jobs_export.json"'
-            return resp
-
-        # Default: NDJSON (one JSON object per line)
-        import json as _json
-
-        def ndjson_stream():
-            for obj in qs.iterator(chunk_size=1000):
-                yield _json.dumps(serialize(obj), ensure_ascii=False) + "\n"
-
-        resp = StreamingHttpResponse(ndjson_stream(), content_type='application/x-ndjson; charset=utf-8')
-        resp['Content-Disposition'] = 'attachment; filename="jobs_export.ndjson"'
+        unavailable = exporters.format_unavailable_reason(fmt)
+        if unavailable:
+            return Response({'detail': unavailable}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = exporters.export_queryset(
+            external_source=request.query_params.get('external_source'),
+            status=request.query_params.get('status'),
+        )
+        # The body is streamed after dispatch returns, so bind the routed alias now
+        qs = qs.using(router.db_for_read(JobPosting))
+        _, content_type, extension, compressible = exporters.FORMATS[fmt]
+        encoding = None
+        if compressible:
+            encoding = exporters.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+        body = exporters.compress_stream(exporters.iter_export(qs, fmt), encoding)
+        resp = StreamingHttpResponse(body, content_type=content_type)
+        resp['Content-Disposition'] = f'attachment; filename="jobs_export.{extension}"'
+        resp['Vary'] = 'Accept-Encoding'
+        if encoding:
+            resp['Content-Encoding'] = encoding
         return resp
 
 
-class ReadOnlyListViewSet(viewsets.ReadOnlyModelViewSet):
-    """Base class for read-only list/retrieve endpoints."""
+class ReadOnlyListViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """Base class for read-only list/retrieve endpoints (served from the read replica)."""
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
 
 
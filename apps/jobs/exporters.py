@@ -0,0 +1,362 @@
+"""
+Bulk job export helpers.
+
+Rows are read with `values_list()` over a server-side cursor, so no model
+instances are built. Derived fields are computed per chunk, and each chunk is
+encoded into one bytes block (with orjson when it is installed). JSON and CSV
+output can be gzip or zstd compressed as it streams; Parquet and Arrow IPC
+(via pyarrow) are written in row groups and compress internally.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .models import JobPosting
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Rows per Parquet row group / Arrow record batch
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# (output key, ORM lookup) for every column read from the database
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('title', 'title'),
+    ('slug', 'slug'),
+    ('description', 'description'),
+    ('company', 'company__name'),
+    ('company_id', 'company_id'),
+    ('location', 'location__name'),
+    ('location_id', 'location_id'),
+    ('posted_by', 'posted_by__username'),
+    ('job_category', 'job_category'),
+    ('job_type', 'job_type'),
+    ('experience_level', 'experience_level'),
+    ('work_mode', 'work_mode'),
+    ('salary_min', 'salary_min'),
+    ('salary_max', 'salary_max'),
+    ('salary_currency', 'salary_currency'),
+    ('salary_type', 'salary_type'),
+    ('salary_raw_text', 'salary_raw_text'),
+    ('external_source', 'external_source'),
+    ('external_url', 'external_url'),
+    ('external_id', 'external_id'),
+    ('status', 'status'),
+    ('posted_ago', 'posted_ago'),
+    ('date_posted', 'date_posted'),
+    ('expired_at', 'expired_at'),
+    ('tags', 'tags'),
+    ('job_closing_date', 'job_closing_date'),
+    ('skills', 'skills'),
+    ('preferred_skills', 'preferred_skills'),
+    ('additional_info', 'additional_info'),
+    ('scraped_at', 'scraped_at'),
+    ('updated_at', 'updated_at'),
+]
+
+# Text columns exported as '' instead of null
+_BLANK_AS_EMPTY = (
+    'description', 'location', 'posted_by', 'experience_level', 'work_mode', 'salary_raw_text',
+    'posted_ago', 'tags', 'job_closing_date', 'skills', 'preferred_skills',
+)
+
+# Key order of an exported row
+EXPORT_FIELDS = [
+    'id', 'title', 'slug', 'description', 'company', 'company_id', 'location', 'location_id',
+    'posted_by', 'job_category', 'job_type', 'experience_level', 'work_mode', 'salary_min',
+    'salary_max', 'salary_currency', 'salary_type', 'salary_raw_text', 'salary_display',
+    'external_source', 'external_url', 'external_id', 'status', 'posted_ago', 'date_posted',
+    'expired_at', 'tags', 'tags_list', 'job_closing_date', 'skills', 'preferred_skills',
+    'additional_info', 'scraped_at', 'updated_at', 'remote_allowed',
+]
+
+
+def export_queryset(external_source: Optional[str] = None, status: Optional[str] = None):
+    """Return the job queryset for a full export, in stable id order."""
+    qs = JobPosting.objects.all()
+    if external_source:
+        qs = qs.filter(external_source__icontains=external_source)
+    if status:
+        qs = qs.filter(status=status)
+    return qs.order_by('id')
+
+
+def _build_rows(raw_rows: List[tuple]) -> List[Dict]:
+    """Turn one chunk of `values_list` tuples into export dicts."""
+    keys = [key for key, _ in EXPORT_COLUMNS]
+    format_salary = JobPosting.format_salary
+    split_tags = JobPosting.split_tags
+    rows = []
+    for raw in raw_rows:
+        row = dict(zip(keys, raw))
+        for key in _BLANK_AS_EMPTY:
+            if row[key] is None:
+                row[key] = ''
+        row['additional_info'] = row['additional_info'] or {}
+        row['salary_display'] = row['salary_raw_text'] or format_salary(
+            row['salary_min'], row['salary_max'], row['salary_currency'],
+            row['salary_type'], row['salary_raw_text'],
+        )
+        row['tags_list'] = split_tags(row['tags'])
+        row['remote_allowed'] = 'remote' in row['work_mode'].lower()
+        rows.append({key: row[key] for key in EXPORT_FIELDS})
+    return rows
+
+
+def iter_row_chunks(qs, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """Yield export rows in lists of up to `chunk_size`, streaming from the DB cursor."""
+    cursor = qs.values_list(*[lookup for _, lookup in EXPORT_COLUMNS]).iterator(chunk_size=chunk_size)
+    while True:
+        raw_rows = list(islice(cursor, chunk_size))
+        if not raw_rows:
+            return
+        yield _build_rows(raw_rows)
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Encode `obj` as UTF-8 JSON, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def iter_ndjson(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Encode row chunks as NDJSON, one bytes block per chunk."""
+    for rows in chunks:
+        yield b''.join(dumps(row) + b'\n' for row in rows)
+
+
+def iter_json_array(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Encode row chunks as a single JSON array."""
+    yield b'['
+    first = True
+    for rows in chunks:
+        if not rows:
+            continue
+        block = b','.join(dumps(row) for row in rows)
+        yield block if first else b',' + block
+        first = False
+    yield b']'
+
+
+def iter_csv(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Encode row chunks as CSV with a header row.
+
+    `tags_list` is dropped (it duplicates `tags`) and `additional_info` is
+    written as a JSON string.
+    """
+    fields = [field for field in EXPORT_FIELDS if field != 'tags_list']
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in chunks:
+        for row in rows:
+            values = []
+            for field in fields:
+                value = row[field]
+                if field == 'additional_info':
+                    value = dumps(value).decode('utf-8')
+                elif isinstance(value, (datetime, date)):
+                    value = value.isoformat()
+                values.append(value)
+            writer.writerow(values)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def arrow_schema():
+    """Arrow schema for exported rows (`additional_info` is a JSON string)."""
+    timestamp = pa.timestamp('us', tz='UTC')
+    salary = pa.decimal128(12, 2)
+    types = {
+        'id': pa.int64(),
+        'company_id': pa.int64(),
+        'location_id': pa.int64(),
+        'salary_min': salary,
+        'salary_max': salary,
+        'date_posted': timestamp,
+        'expired_at': timestamp,
+        'scraped_at': timestamp,
+        'updated_at': timestamp,
+        'tags_list': pa.list_(pa.string()),
+        'remote_allowed': pa.bool_(),
+    }
+    return pa.schema([(field, types.get(field, pa.string())) for field in EXPORT_FIELDS])
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be taken after each write."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _iter_tables(chunks: Iterable[List[Dict]], schema, row_group_size: int):
+    """Group row chunks into Arrow tables of about `row_group_size` rows."""
+    pending: List[Dict] = []
+    for rows in chunks:
+        for row in rows:
+            row['additional_info'] = dumps(row['additional_info']).decode('utf-8')
+        pending.extend(rows)
+        if len(pending) >= row_group_size:
+            yield pa.Table.from_pylist(pending, schema=schema)
+            pending = []
+    if pending:
+        yield pa.Table.from_pylist(pending, schema=schema)
+
+
+def iter_parquet(chunks: Iterable[List[Dict]], row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> Iterator[bytes]:
+    """Encode row chunks as a zstd-compressed Parquet file, one row group at a time."""
+    schema = arrow_schema()
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for table in _iter_tables(chunks, schema, row_group_size):
+            writer.write_table(table, row_group_size=row_group_size)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_arrow(chunks: Iterable[List[Dict]], row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> Iterator[bytes]:
+    """Encode row chunks as an Arrow IPC file (Feather v2), one record batch at a time."""
+    schema = arrow_schema()
+    sink = _DrainableSink()
+    writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+    try:
+        for table in _iter_tables(chunks, schema, row_group_size):
+            writer.write_table(table, max_chunksize=row_group_size)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+# format -> (encoder, content type, file extension, compress with Accept-Encoding)
+FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8', 'ndjson', True),
+    'json': (iter_json_array, 'application/json; charset=utf-8', 'json', True),
+    'csv': (iter_csv, 'text/csv; charset=utf-8', 'csv', True),
+    'parquet': (iter_parquet, 'application/vnd.apache.parquet', 'parquet', False),
+    'arrow': (iter_arrow, 'application/vnd.apache.arrow.file', 'arrow', False),
+}
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+
+def format_unavailable_reason(fmt: str) -> Optional[str]:
+    """Return why `fmt` cannot be produced here, or None if it can."""
+    if fmt not in FORMATS:
+        return f"Unknown export format '{fmt}'. Choose one of: {', '.join(FORMATS)}"
+    if fmt in COLUMNAR_FORMATS and not PYARROW_AVAILABLE:
+        return f"format={fmt} requires pyarrow, which is not installed"
+    return None
+
+
+def iter_export(qs, fmt: str) -> Iterator[bytes]:
+    """Stream `qs` encoded in export format `fmt`."""
+    encoder = FORMATS[fmt][0]
+    return encoder(iter_row_chunks(qs))
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick 'zstd' or 'gzip' from an Accept-Encoding header, or None for identity."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    if ZSTD_AVAILABLE and accepted.get('zstd', 0) > 0:
+        return 'zstd'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    """Compress a bytes stream incrementally with the given content encoding."""
+    if encoding is None:
+        yield from chunks
+        return
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    elif encoding == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
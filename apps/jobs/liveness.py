@@ -0,0 +1,218 @@
+"""
+Job URL liveness checking.
+
+Checks whether external job URLs still exist using an asyncio HTTP client
+with a global concurrency cap and a per-host connection limit, so one slow or
+strict job board is never hit by more than a handful of parallel requests.
+
+Jobs are picked for rechecking by `last_checked_at`: never-checked jobs first,
+then the stalest, limited to jobs whose per-source recheck interval (derived
+from the source TTL) has elapsed.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from django.db.models import F, Q
+
+from .models import JobPosting
+from .services import SourceTTLService
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+
+# Check outcomes
+LIVE = 'live'
+GONE = 'gone'  # HTTP 404/410
+ERROR = 'error'  # network/TLS error or timeout: inconclusive
+
+# How many times a job is rechecked within its source TTL
+RECHECKS_PER_TTL = 15
+
+
+def ttl_days_for_source(source: str, ttl_by_source: Dict[str, int]) -> int:
+    """Return the TTL (days) for an external_source, matching keys as substrings."""
+    return SourceTTLService.ttl_days_for(source, ttl_by_source)
+
+
+def recheck_interval_for_source(source: str, ttl_by_source: Dict[str, int]) -> timedelta:
+    """Short-lived sources are rechecked more often than long-lived ones."""
+    ttl_days = ttl_days_for_source(source, ttl_by_source)
+    return timedelta(hours=max(6, ttl_days * 24 // RECHECKS_PER_TTL))
+
+
+def due_for_check_q(now: datetime, ttl_by_source: Dict[str, int]) -> Q:
+    """Build a filter matching jobs whose liveness recheck is due.
+
+    Sources sharing a recheck interval are grouped so the filter stays small.
+    """
+    sources_by_interval: Dict[timedelta, List[str]] = defaultdict(list)
+    sources = (
+        JobPosting.objects
+        .filter(status__in=['active', 'inactive'])
+        .order_by()
+        .values_list('external_source', flat=True)
+        .distinct()
+    )
+    for source in sources:
+        sources_by_interval[recheck_interval_for_source(source, ttl_by_source)].append(source)
+
+    due_q = Q(last_checked_at__isnull=True)
+    for interval, grouped in sources_by_interval.items():
+        due_q |= Q(external_source__in=grouped, last_checked_at__lt=now - interval)
+    return due_q
+
+
+def iter_due_batches(
+    now: datetime,
+    ttl_by_source: Dict[str, int],
+    batch_size: int,
+    base_filter: Optional[Q] = None,
+) -> Iterable[List[Tuple[int, str, str]]]:
+    """Yield (id, external_url, status) batches of jobs due for a liveness check.
+
+    Never-checked jobs come first, then the stalest. Batches are keyset
+    paginated on (`last_checked_at`, `id`), so iteration always moves forward
+    whether or not the caller records a batch (see `record_results`).
+    """
+    due_q = due_for_check_q(now, ttl_by_source)
+    qs = JobPosting.objects.filter(due_q, status__in=['active', 'inactive'])
+    if base_filter is not None:
+        qs = qs.filter(base_filter)
+    qs = qs.order_by(F('last_checked_at').asc(nulls_first=True), 'id').values_list(
+        'id', 'external_url', 'status', 'last_checked_at'
+    )
+    after_q = None
+    while True:
+        rows = list((qs.filter(after_q) if after_q is not None else qs)[:batch_size])
+        if not rows:
+            return
+        yield [row[:3] for row in rows]
+        last_id, last_checked_at = rows[-1][0], rows[-1][3]
+        if last_checked_at is None:
+            after_q = Q(last_checked_at__isnull=True, id__gt=last_id) | Q(last_checked_at__isnull=False)
+        else:
+            after_q = Q(last_checked_at__gt=last_checked_at) | Q(last_checked_at=last_checked_at, id__gt=last_id)
+
+
+def record_results(results: List[Tuple[int, str]], now: datetime) -> Dict[str, int]:
+    """Persist check outcomes with grouped UPDATEs.
+
+    `check_fail_count` counts consecutive GONE results: LIVE resets it and
+    inconclusive ERRORs leave it alone. `last_checked_at` is bookkeeping
+    only and does not bump `updated_at`.
+    """
+    by_outcome: Dict[str, List[int]] = defaultdict(list)
+    for job_id, outcome in results:
+        by_outcome[outcome].append(job_id)
+
+    if by_outcome[LIVE]:
+        JobPosting.objects.filter(id__in=by_outcome[LIVE]).update(last_checked_at=now, check_fail_count=0)
+    if by_outcome[GONE]:
+        JobPosting.objects.filter(id__in=by_outcome[GONE]).update(
+            last_checked_at=now, check_fail_count=F('check_fail_count') + 1
+        )
+    if by_outcome[ERROR]:
+        JobPosting.objects.filter(id__in=by_outcome[ERROR]).update(last_checked_at=now)
+    return {outcome: len(ids) for outcome, ids in by_outcome.items()}
+
+
+class LivenessChecker:
+    """Asyncio URL checker with global and per-host concurrency limits."""
+
+    def __init__(self, total_limit: int = 32, per_host_limit: int = 4, timeout_seconds: float = 10):
+        self.total_limit = max(1, total_limit)
+        self.per_host_limit = max(1, per_host_limit)
+        self.timeout_seconds = timeout_seconds
+
+    @staticmethod
+    def _host(url: str) -> str:
+        try:
+            return urlsplit(url).netloc.lower()
+        except ValueError:
+            return ''
+
+    @staticmethod
+    def _outcome_for_status(status_code: int) -> Optional[str]:
+        if status_code in (404, 410):
+            return GONE
+        if status_code < 400:
+            return LIVE
+        # 403/405/5xx on HEAD: inconclusive, retry with GET
+        return None
+
+    async def _fetch_status_aiohttp(self, session, method: str, url: str) -> int:
+        async with session.request(method, url, allow_redirects=True) as resp:
+            return resp.status
+
+    def _fetch_status_requests(self, method: str, url: str) -> int:
+        import requests
+        resp = requests.request(
+            method, url, allow_redirects=True, timeout=self.timeout_seconds,
+            headers={'User-Agent': USER_AGENT}, stream=True,
+        )
+        resp.close()
+        return resp.status_code
+
+    async def _check_one(self, session, host_limits, global_limit, url: str) -> str:
+        if not url:
+            return ERROR
+        # Take the host slot first so requests queued for one busy board do not hold global slots
+        async with host_limits[self._host(url)], global_limit:
+            try:
+                outcome = None
+                for method in ('HEAD', 'GET'):
+                    if session is not None:
+                        status_code = await self._fetch_status_aiohttp(session, method, url)
+                    else:
+                        status_code = await asyncio.to_thread(self._fetch_status_requests, method, url)
+                    outcome = self._outcome_for_status(status_code)
+                    if outcome is not None:
+                        return outcome
+                return LIVE
+            except Exception as exc:
+                logger.debug("Liveness check failed for %s: %s", url, exc)
+                return ERROR
+
+    async def check_many(self, items: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Check (job_id, url) pairs concurrently and return (job_id, outcome) pairs."""
+        global_limit = asyncio.Semaphore(self.total_limit)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+
+        async def run_all(session):
+            outcomes = await asyncio.gather(
+                *(self._check_one(session, host_limits, global_limit, url) for _, url in items)
+            )
+            return [(job_id, outcome) for (job_id, _), outcome in zip(items, outcomes)]
+
+        if not AIOHTTP_AVAILABLE:
+            return await run_all(None)
+
+        connector = aiohttp.TCPConnector(limit=self.total_limit, limit_per_host=self.per_host_limit)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers={'User-Agent': USER_AGENT}
+        ) as session:
+            return await run_all(session)
+
+    def check_batch(self, items: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Synchronous wrapper for callers outside an event loop (scripts, Celery)."""
+        if not items:
+            return []
+        return asyncio.run(self.check_many(items))
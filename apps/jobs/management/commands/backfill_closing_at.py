@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.jobs.models import JobChange, JobPosting
+from apps.jobs.services import ClosingDateParser, JobChangeLogService
+
+
+class Command(BaseCommand):
+    help = "Parse job_closing_date strings once and store them in JobPosting.closing_at"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000, help='Rows to load and update per batch'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-parse every row with a closing date, not only rows missing closing_at',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true', help='Count changes without writing'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        qs = (
+            JobPosting.objects
+            .filter(job_closing_date__isnull=False)
+            .exclude(job_closing_date__exact='')
+            .only('id', 'job_closing_date', 'closing_at')
+            .order_by('id')
+        )
+        if not options['all']:
+            qs = qs.filter(closing_at__isnull=True)
+
+        scanned, changed, unparsed = 0, 0, 0
+        last_id = 0
+        while True:
+            batch = list(qs.filter(id__gt=last_id)[:chunk_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+
+            to_update = []
+            for job in batch:
+                parsed = ClosingDateParser.parse(job.job_closing_date)
+                if parsed is None:
+                    unparsed += 1
+                if parsed != job.closing_at:
+                    job.closing_at = parsed
+                    to_update.append(job)
+
+            changed += len(to_update)
+            if to_update and not options['dry_run']:
+                with transaction.atomic():
+                    JobPosting.objects.bulk_update(to_update, ['closing_at'])
+                    JobChangeLogService.record([job.id for job in to_update], JobChange.OP_UPDATE)
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} jobs. {verb} {changed} closing_at values. Unparseable: {unparsed}."
+        ))
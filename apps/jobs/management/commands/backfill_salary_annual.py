@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.jobs.models import JobChange, JobPosting
+from apps.jobs.services import JobChangeLogService
+
+
+class Command(BaseCommand):
+    help = "Compute salary_min_annual/salary_max_annual for existing JobPosting rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000, help='Rows to load and update per batch'
+        )
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Only process rows where both annualized columns are empty',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true', help='Count changes without writing'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        qs = JobPosting.objects.only(
+            'id', 'salary_min', 'salary_max', 'salary_type', 'salary_currency',
+            'salary_raw_text', 'salary_min_annual', 'salary_max_annual',
+        ).order_by('id')
+        if options['only_missing']:
+            qs = qs.filter(salary_min_annual__isnull=True, salary_max_annual__isnull=True)
+
+        scanned, changed = 0, 0
+        last_id = 0
+        while True:
+            # Keyset pagination keeps each batch query cheap regardless of table size
+            batch = list(qs.filter(id__gt=last_id)[:chunk_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+
+            to_update = []
+            for job in batch:
+                annual_min, annual_max = job.compute_annual_salary()
+                if annual_min != job.salary_min_annual or annual_max != job.salary_max_annual:
+                    job.salary_min_annual = annual_min
+                    job.salary_max_annual = annual_max
+                    to_update.append(job)
+
+            changed += len(to_update)
+            if to_update and not options['dry_run']:
+                with transaction.atomic():
+                    JobPosting.objects.bulk_update(to_update, ['salary_min_annual', 'salary_max_annual'])
+                    JobChangeLogService.record([job.id for job in to_update], JobChange.OP_UPDATE)
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} jobs. {verb} {changed} annualized salary rows."
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.models import JobPosting
+from apps.jobs.services import JobSearchService
+
+
+class Command(BaseCommand):
+    help = "Rebuild JobPosting.search_vector in the database (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000, help='Rows to update per statement'
+        )
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Only process rows without a search_vector (otherwise rebuild all, e.g. after company renames)',
+        )
+
+    def handle(self, *args, **options):
+        if not JobSearchService.is_supported():
+            raise CommandError("search_vector is only maintained on PostgreSQL")
+
+        chunk_size = max(1, options['chunk_size'])
+        qs = JobPosting.objects.order_by('id')
+        if options['only_missing']:
+            qs = qs.filter(search_vector__isnull=True)
+
+        vector = JobSearchService.vector_from_columns()
+        updated = 0
+        last_id = 0
+        while True:
+            # Keyset pagination; each chunk is one set-based UPDATE computed in the database
+            ids = list(qs.filter(id__gt=last_id).values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            updated += JobPosting.objects.filter(id__in=ids).update(search_vector=vector)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search_vector for {updated} jobs."))
@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.jobs.models import JobPosting
+from apps.jobs.serializers import JobPostingListRowSerializer, JobPostingListSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare JobPostingListSerializer with the values()-based row serializer on real rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Rows per page (default: 100)')
+        parser.add_argument('--iterations', type=int, default=20, help='Pages to serialize per variant')
+        parser.add_argument('--compact', action='store_true', help='Also time compact mode')
+
+    def _time(self, func, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) / iterations
+
+    def handle(self, *args, **options):
+        rows = max(1, options['rows'])
+        iterations = max(1, options['iterations'])
+        base = JobPosting.objects.order_by('id')
+        if not base.exists():
+            raise CommandError("No JobPosting rows to benchmark")
+
+        model_qs = base.select_related('company', 'location', 'posted_by')
+        row_serializer = JobPostingListRowSerializer()
+        values_qs = base.values(*row_serializer.columns())
+
+        # Outputs must match byte for byte when rendered
+        instances = list(model_qs[:rows])
+        value_rows = list(values_qs[:rows])
+        renderer = JSONRenderer()
+        model_out = renderer.render(JobPostingListSerializer(instances, many=True).data)
+        rows_out = renderer.render(row_serializer.serialize(value_rows))
+        if model_out != rows_out:
+            raise CommandError("Row serializer output differs from JobPostingListSerializer")
+        page = len(instances)
+
+        variants = [
+            ('ModelSerializer', lambda: JobPostingListSerializer(instances, many=True).data,
+             lambda: JobPostingListSerializer(list(model_qs[:rows]), many=True).data),
+            ('Row serializer', lambda: row_serializer.serialize(value_rows),
+             lambda: row_serializer.serialize(list(values_qs[:rows]))),
+        ]
+        if options['compact']:
+            compact = JobPostingListRowSerializer(compact=True)
+            compact_qs = base.values(*compact.columns())
+            compact_rows = list(compact_qs[:rows])
+            variants.append((
+                'Row serializer (compact)', lambda: compact.serialize(compact_rows),
+                lambda: compact.serialize(list(compact_qs[:rows])),
+            ))
+
+        self.stdout.write(f"{page} rows per page, {iterations} iterations (outputs identical)")
+        baseline = None
+        for name, serialize_only, end_to_end in variants:
+            serialize_s = self._time(serialize_only, iterations)
+            total_s = self._time(end_to_end, iterations)
+            baseline = baseline or serialize_s
+            self.stdout.write(
+                f"{name:<26} serialize {serialize_s * 1000:8.2f} ms/page ({page / serialize_s:10.0f} rows/s, "
+                f"{baseline / serialize_s:5.1f}x)   with query {total_s * 1000:8.2f} ms/page"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
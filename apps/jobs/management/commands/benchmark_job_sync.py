@@ -0,0 +1,313 @@
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+from apps.companies.models import Company
+from apps.core.models import Location
+from apps.jobs.models import JobDelivery, JobPosting, JobSyncPortalState, JobSyncRun
+from script.job_data_sync import JobDataSynchronizer
+from script.sync_test_receiver import serve
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    resource = None
+    RESOURCE_AVAILABLE = False
+
+
+class _QueryCounter:
+    """execute_wrapper counting queries on every connection, including sync worker threads'."""
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def attach(self, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def _peak_rss_mb():
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure JobDataSynchronizer throughput against a local stand-in portal: seeds synthetic jobs, "
+        "runs a full and an incremental sync and reports jobs/sec, push latency, peak RSS and queries. "
+        "Run it against a test database."
+    )
+
+    SOURCE = 'sync-benchmark.invalid'
+    PORTAL_PREFIX = 'benchmark_'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=2000, help='Synthetic jobs to seed (default: 2000)')
+        parser.add_argument('--changed', type=int, default=None,
+                            help='Jobs edited before the incremental run (default: 10%% of --jobs)')
+        parser.add_argument('--portals', type=int, default=1, help='Stand-in portals to push to (default: 1)')
+        parser.add_argument('--mode', choices=['batch', 'single'], default='batch',
+                            help='Push through the bulk endpoint or one request per job')
+        parser.add_argument('--batch-size', type=int, default=25, help='Jobs per bulk request (default: 25)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight per portal')
+        parser.add_argument('--rate-limit', type=float, default=0, help='Client-side requests/sec per portal (0: off)')
+        parser.add_argument('--fetch-chunk-size', type=int, default=1000, help='sync.fetch_chunk_size')
+        parser.add_argument('--latency', type=float, default=0.02, help='Receiver seconds per request')
+        parser.add_argument('--item-error-rate', type=float, default=0.0, help='Receiver share of rejected jobs')
+        parser.add_argument('--throttle-rate', type=float, default=0.0, help='Receiver share of requests answered 429')
+        parser.add_argument('--max-rps', type=float, default=0.0, help='Receiver answers 429 beyond this rate')
+        parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After sent with 429s')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for receiver errors and edits')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+        parser.add_argument('--log-file', default=None,
+                            help='Write sync logs to this file as well (default: stdout only, not job_sync.log)')
+        parser.add_argument('--keep', action='store_true', help='Keep seeded jobs, sync runs and ledger rows')
+        parser.add_argument('--allow-existing-jobs', action='store_true',
+                            help='Run even though the database has other jobs (they are synced too)')
+
+    # -- setup ---------------------------------------------------------------
+
+    def _seed(self, count, rng):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username='sync-benchmark')
+        company, _ = Company.objects.get_or_create(slug='sync-benchmark', defaults={'name': 'Sync Benchmark Pty Ltd'})
+        location, _ = Location.objects.get_or_create(
+            name='Benchmark City NSW', defaults={'city': 'Benchmark City', 'state': 'NSW'}
+        )
+        words = ('python', 'django', 'sql', 'aws', 'react', 'nursing', 'retail', 'logistics', 'finance', 'support')
+        paragraph = ' '.join(rng.choice(words) for _ in range(60))
+        # Backdated, so only the edited jobs are newer than the full run's high-water mark
+        backdated = timezone.now() - timedelta(days=2)
+        batch = []
+        for index in range(count):
+            skills = rng.sample(words, 4)
+            batch.append(JobPosting(
+                title=f'Benchmark Engineer {index}',
+                slug=f'sync-benchmark-{index}',
+                description=f'<p>{paragraph}</p>' * 4,
+                company=company,
+                posted_by=user,
+                location=location,
+                job_category='technology',
+                experience_level='Mid-level',
+                work_mode='Hybrid',
+                salary_min=80000 + index % 50 * 1000,
+                salary_max=120000 + index % 50 * 1000,
+                salary_raw_text='$80k - $120k',
+                external_source=self.SOURCE,
+                external_url=f'https://{self.SOURCE}/jobs/{index}',
+                external_id=f'bench-{index}',
+                tags=','.join(skills),
+                skills=', '.join(skills[:2]),
+                additional_info={'benefits': ['Parking', 'Training'], 'seed': index},
+                job_closing_date='31 December 2099',
+            ))
+            if len(batch) == 1000:
+                JobPosting.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            JobPosting.objects.bulk_create(batch)
+        JobPosting.objects.filter(external_source=self.SOURCE).update(
+            scraped_at=backdated, updated_at=backdated, date_posted=backdated,
+        )
+
+    def _config(self, base_url, options):
+        portals = {}
+        for index in range(1, max(1, options['portals']) + 1):
+            portal = {
+                'type': 'local',
+                'enabled': True,
+                'base_url': base_url,
+                'endpoint_path': '/jobs/external/create/',
+                'concurrency': max(1, options['concurrency']),
+                'batch_size': max(1, options['batch_size']),
+            }
+            if options['mode'] == 'batch':
+                portal['batch_endpoint_path'] = '/jobs/external/bulk-create/'
+            if options['rate_limit']:
+                portal['rate_limit'] = options['rate_limit']
+            portals[f'{self.PORTAL_PREFIX}{index}'] = portal
+        return {
+            'database': {'type': 'django'},
+            'portals': portals,
+            'sync': {
+                'batch_size': max(1, options['batch_size']),
+                'fetch_chunk_size': max(1, options['fetch_chunk_size']),
+                'incremental': True,
+                'sync_interval_minutes': 60,
+            },
+        }
+
+    def _cleanup(self, portal_names, first_run_id):
+        JobDelivery.objects.filter(portal_name__in=portal_names).delete()
+        JobSyncPortalState.objects.filter(portal_name__in=portal_names).delete()
+        if first_run_id is not None:
+            JobSyncRun.objects.filter(id__gt=first_run_id, portal_results__portal_name__in=portal_names).delete()
+        JobPosting.objects.filter(external_source=self.SOURCE).delete()
+
+    # -- measurement ---------------------------------------------------------
+
+    def _phase(self, name, sync, incremental, state, latencies, counter):
+        latencies.clear()
+        receiver_before = dict(state.stats)
+        queries_before = counter.count
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        result = sync.sync_jobs(incremental=incremental)
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+        if result.get('status') != 'success':
+            raise CommandError(f"{name} sync failed: {result.get('error') or result}")
+
+        jobs = result['jobs_fetched']
+        portals = result['portals'].values()
+        requests_made = state.stats['requests'] - receiver_before['requests']
+        p50, p99 = _percentile(latencies, 50), _percentile(latencies, 99)
+        return {
+            'phase': name,
+            'jobs': jobs,
+            'pushed': sum(p['success'] for p in portals),
+            'failed': sum(p['failed'] for p in portals),
+            'unchanged': sum(p['skipped'] for p in portals),
+            'seconds': round(wall, 3),
+            'jobs_per_sec': round(jobs / wall, 1) if wall else None,
+            'cpu_ms_per_job': round(cpu * 1000 / jobs, 3) if jobs else None,
+            'requests': requests_made,
+            'throttled': state.stats['throttled'] - receiver_before['throttled'],
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p99_ms': round(p99 * 1000, 1) if p99 is not None else None,
+            'queries': counter.count - queries_before,
+            'queries_per_1k_jobs': round((counter.count - queries_before) * 1000 / jobs, 1) if jobs else None,
+            'peak_rss_mb': _peak_rss_mb(),
+        }
+
+    def _print(self, report):
+        self.stdout.write(
+            f"{report['settings']['jobs']} jobs, {report['settings']['portals']} portal(s), "
+            f"{report['settings']['mode']} mode, receiver latency {report['settings']['latency'] * 1000:g} ms"
+        )
+        header = (f"{'phase':<12}{'jobs':>7}{'pushed':>8}{'failed':>7}{'unchgd':>7}{'sec':>8}{'jobs/s':>9}"
+                  f"{'cpu ms/job':>11}{'reqs':>7}{'429s':>6}{'p50 ms':>8}{'p99 ms':>8}{'queries':>9}{'q/1k':>8}"
+                  f"{'RSS MB':>8}")
+        self.stdout.write(header)
+        for row in report['phases']:
+            values = [row[key] if row[key] is not None else '-' for key in (
+                'jobs', 'pushed', 'failed', 'unchanged', 'seconds', 'jobs_per_sec', 'cpu_ms_per_job', 'requests',
+                'throttled', 'p50_ms', 'p99_ms', 'queries', 'queries_per_1k_jobs', 'peak_rss_mb',
+            )]
+            self.stdout.write(
+                f"{row['phase']:<12}{values[0]:>7}{values[1]:>8}{values[2]:>7}{values[3]:>7}{values[4]:>8}"
+                f"{values[5]:>9}{values[6]:>11}{values[7]:>7}{values[8]:>6}{values[9]:>8}{values[10]:>8}"
+                f"{values[11]:>9}{values[12]:>8}{values[13]:>8}"
+            )
+
+    def handle(self, *args, **options):
+        count = max(1, options['jobs'])
+        changed = count // 10 if options['changed'] is None else max(0, min(options['changed'], count))
+        if JobPosting.objects.exclude(external_source=self.SOURCE).exists() and not options['allow_existing_jobs']:
+            raise CommandError(
+                "The database already has jobs, which a full sync would push too. Point DB_NAME (or the "
+                "SQLite default) at a test database, or pass --allow-existing-jobs."
+            )
+        rng = random.Random(options['seed'])
+        random.seed(options['seed'])
+
+        server, state = serve(
+            port=0, latency=options['latency'], item_error_rate=options['item_error_rate'],
+            throttle_rate=options['throttle_rate'], max_rps=options['max_rps'], retry_after=options['retry_after'],
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        config = self._config(f'http://127.0.0.1:{server.server_address[1]}', options)
+        portal_names = list(config['portals'])
+        first_run_id = JobSyncRun.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        counter = _QueryCounter()
+        connection_created.connect(counter.attach)
+        for connection in connections.all():
+            counter.attach(connection)
+        if options['verbosity'] < 2:
+            # Push failures are counted in the report
+            logging.disable(logging.ERROR)
+        config_file = None
+        try:
+            self._cleanup(portal_names, None)
+            seed_started = time.perf_counter()
+            self._seed(count, rng)
+            seed_seconds = time.perf_counter() - seed_started
+
+            with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+                json.dump(config, f)
+                config_file = f.name
+            sync = JobDataSynchronizer(config_file=config_file, log_file=options['log_file'])
+            latencies = []
+            lock = threading.Lock()
+
+            def record_latency(response, *args, **kwargs):
+                with lock:
+                    latencies.append(response.elapsed.total_seconds())
+
+            for adapter in sync.portals.values():
+                adapter.session.hooks['response'].append(record_latency)
+
+            phases = [self._phase('full', sync, False, state, latencies, counter)]
+            edited = rng.sample(
+                list(JobPosting.objects.filter(external_source=self.SOURCE).values_list('id', flat=True)), changed
+            )
+            JobPosting.objects.filter(id__in=edited).update(title='Benchmark Engineer (edited)',
+                                                            updated_at=timezone.now())
+            phases.append(self._phase('incremental', sync, True, state, latencies, counter))
+        finally:
+            logging.disable(logging.NOTSET)
+            connection_created.disconnect(counter.attach)
+            server.shutdown()
+            server.server_close()
+            if config_file:
+                os.unlink(config_file)
+            if not options['keep']:
+                self._cleanup(portal_names, first_run_id)
+
+        report = {
+            'settings': {
+                key: options[key] for key in (
+                    'portals', 'mode', 'batch_size', 'concurrency', 'rate_limit', 'fetch_chunk_size', 'latency',
+                    'item_error_rate', 'throttle_rate', 'max_rps', 'retry_after', 'seed',
+                )
+            },
+            'database': connections['default'].vendor,
+            'seed_seconds': round(seed_seconds, 3),
+            'phases': phases,
+        }
+        report['settings'].update(jobs=count, changed=changed)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self._print(report)
+        self.stdout.write(self.style.SUCCESS(f"Benchmark complete ({report['database']}, seeded in {seed_seconds:.1f}s)."))
@@ -0,0 +1,101 @@
+import base64
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from script.job_data_sync import (
+    ENCRYPTION_AVAILABLE, DatabaseConnector, DataEncryption, EnvelopeCodec, decode_envelope,
+)
+
+
+class _Headers(dict):
+    """Case-insensitive header lookup, as receivers get from their framework."""
+
+    def get(self, key, default=None):
+        for name, value in self.items():
+            if name.lower() == key.lower():
+                return value
+        return default
+
+
+class Command(BaseCommand):
+    help = "Compare wire bytes and CPU per job of per-job encryption with batch envelopes on real rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=500, help='Jobs to encode (default: 500)')
+        parser.add_argument('--batch-size', type=int, default=25, help='Jobs per request (default: 25)')
+        parser.add_argument('--iterations', type=int, default=3, help='Repetitions per variant')
+
+    def _batches(self, jobs, size):
+        return [jobs[start:start + size] for start in range(0, len(jobs), size)]
+
+    def _time(self, func, iterations):
+        started = time.process_time()
+        for _ in range(iterations):
+            result = func()
+        return (time.process_time() - started) / iterations, result
+
+    def handle(self, *args, **options):
+        if not ENCRYPTION_AVAILABLE:
+            raise CommandError("cryptography is not installed")
+        connector = DatabaseConnector({'type': 'django'})
+        connector.connect()
+        jobs = list(connector.fetch_jobs(limit=max(1, options['jobs'])))
+        if not jobs:
+            raise CommandError("No JobPosting rows to benchmark")
+        batches = self._batches(jobs, max(1, options['batch_size']))
+        iterations = max(1, options['iterations'])
+        key = base64.urlsafe_b64encode(b'benchmark-only-key-32-bytes-long').decode()
+        encryptor = DataEncryption(key)
+
+        def per_job_encode():
+            # Mirrors JobDataSynchronizer._prepare_payload_for_transmission (Fernet, then base64 again)
+            bodies = []
+            for batch in batches:
+                items = [
+                    {'encrypted': True, 'data': base64.b64encode(encryptor.encrypt_data(job)).decode('utf-8'),
+                     'timestamp': '2025-01-01T00:00:00'}
+                    for job in batch
+                ]
+                bodies.append((json.dumps(items).encode('utf-8'), _Headers({'Content-Type': 'application/json'})))
+            return bodies
+
+        def per_job_decode(bodies):
+            return [
+                encryptor.decrypt_data(base64.b64decode(item['data']))
+                for body, _ in bodies for item in json.loads(body)
+            ]
+
+        variants = [
+            ('plain JSON (no encryption)',
+             lambda: [(json.dumps(batch).encode('utf-8'), None) for batch in batches],
+             lambda bodies: [job for body, _ in bodies for job in json.loads(body)]),
+            ('per-job Fernet + base64', per_job_encode, per_job_decode),
+        ]
+        for compression in EnvelopeCodec.available_compressions():
+            for transport in EnvelopeCodec.TRANSPORTS:
+                codec = EnvelopeCodec(encryptor, compression, transport)
+                variants.append((
+                    f'envelope {compression}/{transport}',
+                    lambda codec=codec: [
+                        (body, _Headers(headers)) for body, headers in (codec.encode(batch) for batch in batches)
+                    ],
+                    lambda bodies: [job for body, headers in bodies for job in decode_envelope(body, headers, key)],
+                ))
+
+        count = len(jobs)
+        self.stdout.write(f"{count} jobs in {len(batches)} requests of up to {options['batch_size']}")
+        baseline = None
+        for name, encode, decode in variants:
+            encode_s, bodies = self._time(encode, iterations)
+            decode_s, decoded = self._time(lambda: decode(bodies), iterations)
+            if len(decoded) != count:
+                raise CommandError(f"{name}: decoded {len(decoded)} of {count} jobs")
+            per_job = sum(len(body) for body, _ in bodies) / count
+            baseline = baseline or per_job
+            self.stdout.write(
+                f"{name:<30} {per_job:9.0f} B/job ({per_job / baseline:5.2f}x plain)   "
+                f"encode {encode_s / count * 1e6:7.1f} us/job   decode {decode_s / count * 1e6:7.1f} us/job"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
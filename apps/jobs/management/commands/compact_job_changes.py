@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.services import JobChangeLogService
+
+
+class Command(BaseCommand):
+    help = "Compact JobChange entries older than JOB_CHANGES_RETENTION_DAYS (expire_jobs also does this)"
+
+    def handle(self, *args, **options):
+        superseded, tombstones = JobChangeLogService.compact()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {superseded} superseded entries and {tombstones} old tombstones."
+        ))
@@ -0,0 +1,51 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs import exporters
+
+
+class Command(BaseCommand):
+    help = "Write a job export snapshot (same rows as /api/jobs/export/) to a local file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', dest='fmt', default='parquet', choices=list(exporters.FORMATS),
+            help='Output format (default: parquet)',
+        )
+        parser.add_argument(
+            '--output', help='Output file path (default: jobs_export.<ext> in the current directory)'
+        )
+        parser.add_argument('--external-source', help='Optional icontains filter on external_source')
+        parser.add_argument('--status', help='Optional exact status filter (default: all statuses)')
+
+    def handle(self, *args, **options):
+        fmt = options['fmt']
+        unavailable = exporters.format_unavailable_reason(fmt)
+        if unavailable:
+            raise CommandError(unavailable)
+
+        extension = exporters.FORMATS[fmt][2]
+        output = options['output'] or f"jobs_export.{extension}"
+        qs = exporters.export_queryset(
+            external_source=options['external_source'], status=options['status']
+        )
+
+        # Write to a temp file and rename so readers never see a partial snapshot
+        started = time.perf_counter()
+        tmp_path = f"{output}.part"
+        try:
+            with open(tmp_path, 'wb') as fh:
+                for data in exporters.iter_export(qs, fmt):
+                    fh.write(data)
+            os.replace(tmp_path, output)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        size_mb = os.path.getsize(output) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {output} ({fmt}, {size_mb:.1f} MB) in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.services import JobSyncLogService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete sync result rows older than JOB_SYNC_RESULT_RETENTION_DAYS and sync runs older than "
+        "JOB_SYNC_RUN_RETENTION_DAYS (expire_jobs also does this)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--result-days', type=int, default=None, help='Override the per-job result retention')
+        parser.add_argument('--run-days', type=int, default=None, help='Override the run retention')
+
+    def handle(self, *args, **options):
+        results, runs = JobSyncLogService.prune(result_days=options['result_days'], run_days=options['run_days'])
+        self.stdout.write(self.style.SUCCESS(f"Removed {results} job results and {runs} sync runs."))
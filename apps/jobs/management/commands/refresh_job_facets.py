@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.services import JobFacetService
+
+
+class Command(BaseCommand):
+    help = "Recompute the JobFacetCount summary table and clear the cached facets"
+
+    def handle(self, *args, **options):
+        rows = JobFacetService.refresh()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {rows} facet values."))
@@ -0,0 +1,28 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.db_routing import PRIMARY_ALIAS, REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto the replica (local two-database setup only)"
+
+    def handle(self, *args, **options):
+        databases = settings.DATABASES
+        if REPLICA_ALIAS not in databases:
+            raise CommandError("No 'replica' database configured")
+        primary, replica = databases[PRIMARY_ALIAS], databases[REPLICA_ALIAS]
+        if not all(db['ENGINE'].endswith('sqlite3') for db in (primary, replica)):
+            raise CommandError("Only SQLite databases can be copied; use real replication for PostgreSQL")
+
+        # Online backup: consistent snapshot even while the primary is being written
+        source = sqlite3.connect(str(primary['NAME']))
+        target = sqlite3.connect(str(replica['NAME']))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Copied {primary['NAME']} to {replica['NAME']}."))
@@ -0,0 +1,70 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert django-celery-beat schedules for the incremental and full job sync (jobs.sync_jobs) "
+        "and the sync outbox drain (jobs.drain_sync_outbox)"
+    )
+
+    INCREMENTAL_TASK_NAME = "job_sync_incremental"
+    FULL_TASK_NAME = "job_sync_full"
+    DRAIN_TASK_NAME = "job_sync_outbox_drain"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--config", help="Sync config whose `scheduler` section sets the intervals")
+        parser.add_argument("--incremental-minutes", type=int, default=None,
+                            help="Incremental sync interval (default: scheduler.incremental_interval_minutes or 60)")
+        parser.add_argument("--full-hours", type=int, default=None,
+                            help="Full sync interval (default: scheduler.full_sync_interval_hours or 24)")
+        parser.add_argument("--drain-seconds", type=int, default=None,
+                            help="Outbox drain interval (default: scheduler.outbox_drain_interval_seconds or 60)")
+        parser.add_argument("--disable", action="store_true", help="Disable all three schedules")
+
+    def _scheduler_config(self, config_path):
+        from script.run_job_sync import default_config_file
+
+        config_path = config_path or default_config_file()
+        if not config_path:
+            return {}
+        with open(config_path) as f:
+            return json.load(f).get("scheduler") or {}
+
+    def _upsert(self, name, task, every, period, kwargs, enabled):
+        interval, _ = IntervalSchedule.objects.get_or_create(every=every, period=period)
+        _, created = PeriodicTask.objects.update_or_create(
+            name=name,
+            defaults={
+                "task": task,
+                "interval": interval,
+                "crontab": None,
+                "kwargs": json.dumps(kwargs),
+                "enabled": enabled,
+            },
+        )
+        return created
+
+    def handle(self, *args, **options):
+        scheduler = self._scheduler_config(options["config"])
+        incremental_minutes = options["incremental_minutes"] or int(scheduler.get("incremental_interval_minutes", 60))
+        full_hours = options["full_hours"] or int(scheduler.get("full_sync_interval_hours", 24))
+        drain_seconds = options["drain_seconds"] or int(scheduler.get("outbox_drain_interval_seconds", 60))
+        enabled = not options["disable"]
+
+        created = [
+            name for name, task, every, period, kwargs in (
+                (self.INCREMENTAL_TASK_NAME, "jobs.sync_jobs", incremental_minutes, IntervalSchedule.MINUTES,
+                 {"incremental": True}),
+                (self.FULL_TASK_NAME, "jobs.sync_jobs", full_hours, IntervalSchedule.HOURS, {"incremental": False}),
+                (self.DRAIN_TASK_NAME, "jobs.drain_sync_outbox", drain_seconds, IntervalSchedule.SECONDS, {}),
+            )
+            if self._upsert(name, task, every, period, kwargs, enabled)
+        ]
+        self.stdout.write(self.style.SUCCESS(
+            f"Job sync schedules upserted. incremental=every {incremental_minutes}m full=every {full_hours}h "
+            f"drain=every {drain_seconds}s enabled={enabled} created={created}"
+        ))
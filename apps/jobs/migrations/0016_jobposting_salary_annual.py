@@ -0,0 +1,31 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_jobsyncrun_jobsyncportalresult_jobsyncjobresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_max_annual',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Upper salary bound annualized to AUD (computed on save)', max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_min_annual',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Lower salary bound annualized to AUD (computed on save)', max_digits=12, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'salary_min_annual'], name='jobs_jobpos_status_6c080f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'salary_max_annual'], name='jobs_jobpos_status_871d19_idx'),
+        ),
+    ]
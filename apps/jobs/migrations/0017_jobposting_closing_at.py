@@ -0,0 +1,22 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_jobposting_salary_annual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='closing_at',
+            field=models.DateTimeField(blank=True, help_text='Parsed job_closing_date (computed on save)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'closing_at'], name='jobs_jobpos_status_dd9362_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_jobposting_closing_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='check_fail_count',
+            field=models.PositiveIntegerField(default=0, help_text='Consecutive liveness checks that returned 404/410 or failed'),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='last_checked_at',
+            field=models.DateTimeField(blank=True, help_text='Last external URL liveness check', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'last_checked_at'], name='jobs_jobpos_status_cf98a7_idx'),
+        ),
+    ]
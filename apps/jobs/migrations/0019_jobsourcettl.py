@@ -0,0 +1,30 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:20
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_jobposting_liveness'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSourceTTL',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text="external_source value or substring (e.g. 'seek.com.au', 'workday'); 'default' for the fallback", max_length=100, unique=True)),
+                ('ttl_days', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Job Source TTL',
+                'verbose_name_plural': 'Job Source TTLs',
+                'ordering': ['source'],
+            },
+        ),
+    ]
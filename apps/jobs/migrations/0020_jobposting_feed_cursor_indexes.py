@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_jobsourcettl'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'updated_at', 'id'], name='jobs_jobpos_status_814b1a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['updated_at', 'id'], name='jobs_jobpos_updated_370fbf_idx'),
+        ),
+    ]
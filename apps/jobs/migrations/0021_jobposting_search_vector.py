@@ -0,0 +1,43 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:26
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# GIN indexes only exist on PostgreSQL; other backends (SQLite dev) fall back to icontains search
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS jobs_jobpos_search_vector_gin '
+        'ON jobs_jobposting USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS jobs_jobpos_title_trgm '
+        'ON jobs_jobposting USING gin (title gin_trgm_ops)'
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS jobs_jobpos_search_vector_gin')
+    schema_editor.execute('DROP INDEX IF EXISTS jobs_jobpos_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_jobposting_feed_cursor_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='jobposting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
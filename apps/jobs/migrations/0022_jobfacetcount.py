@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_jobposting_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=30)),
+                ('value', models.CharField(blank=True, max_length=255)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Job Facet Count',
+                'verbose_name_plural': 'Job Facet Counts',
+                'ordering': ['dimension', '-active_count', 'value'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jobfacetcount',
+            constraint=models.UniqueConstraint(fields=('dimension', 'value'), name='uniq_job_facet_dimension_value'),
+        ),
+    ]
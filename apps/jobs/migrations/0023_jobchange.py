@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+# Seed one insert per existing job so replaying the log from seq 0 covers the whole table
+def seed_existing_jobs(apps, schema_editor):
+    JobChange = apps.get_model('jobs', 'JobChange')
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    now = django.utils.timezone.now()
+    ids = JobPosting.objects.order_by('id').values_list('id', flat=True)
+    last_id = 0
+    while True:
+        chunk = list(ids.filter(id__gt=last_id)[:5000])
+        if not chunk:
+            break
+        last_id = chunk[-1]
+        JobChange.objects.bulk_create([JobChange(job_id=job_id, op='insert', changed_at=now) for job_id in chunk])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_jobfacetcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('job_id', models.BigIntegerField(db_index=True)),
+                ('op', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update'), ('delete', 'Delete')], max_length=6)),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Job Change',
+                'verbose_name_plural': 'Job Changes',
+                'ordering': ['seq'],
+            },
+        ),
+        migrations.RunPython(seed_existing_jobs, migrations.RunPython.noop),
+    ]
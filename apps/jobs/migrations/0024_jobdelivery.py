@@ -0,0 +1,52 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:51
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_jobchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('portal_name', models.CharField(max_length=120)),
+                ('job_id', models.CharField(max_length=120)),
+                ('payload_hash', models.CharField(max_length=64)),
+                ('delivered_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Job Delivery',
+                'verbose_name_plural': 'Job Deliveries',
+                'ordering': ['portal_name', 'job_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSyncPortalState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('portal_name', models.CharField(max_length=120, unique=True)),
+                ('high_water_mark', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Job Sync Portal State',
+                'verbose_name_plural': 'Job Sync Portal States',
+                'ordering': ['portal_name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='skipped_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='jobdelivery',
+            constraint=models.UniqueConstraint(fields=('portal_name', 'job_id'), name='jobdelivery_portal_job_uniq'),
+        ),
+    ]
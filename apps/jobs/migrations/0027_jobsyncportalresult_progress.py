@@ -0,0 +1,56 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:03
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+# Portal results written before this migration take their run's outcome
+def settle_existing_results(apps, schema_editor):
+    JobSyncPortalResult = apps.get_model('jobs', 'JobSyncPortalResult')
+    JobSyncRun = apps.get_model('jobs', 'JobSyncRun')
+    runs = JobSyncRun.objects.filter(id=OuterRef('run_id'))
+    JobSyncPortalResult.objects.exclude(run__status='running').update(
+        status=Subquery(runs.values('status')[:1]),
+        finished_at=Subquery(runs.values('finished_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0026_jobsyncjobresult_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='chunks_done',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='chunks_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='jobs_fetched',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobsyncportalresult',
+            name='status',
+            field=models.CharField(default='running', max_length=20),
+        ),
+        migrations.RunPython(settle_existing_results, migrations.RunPython.noop),
+    ]
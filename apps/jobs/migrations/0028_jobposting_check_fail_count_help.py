@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0027_jobsyncportalresult_progress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobposting',
+            name='check_fail_count',
+            field=models.PositiveIntegerField(default=0, help_text='Consecutive liveness checks that returned 404/410'),
+        ),
+    ]
@@ -2,11 +2,13 @@
 Job models for the job scraper application.
 """
 
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
 from apps.companies.models import Company
 from apps.core.models import Location
+from .services import ClosingDateParser, JobSearchService, SalaryNormalizationService
 from django_celery_beat.models import PeriodicTask, CrontabSchedule
 from django.utils import timezone
 from django.core.validators import MinValueValidator
@@ -77,6 +79,14 @@ class JobPosting(models.Model):
         ('other', 'Other'),
     ]
 
+    # Fields that feed the annualized salary columns
+    SALARY_SOURCE_FIELDS = frozenset({
+        'salary_min', 'salary_max', 'salary_type', 'salary_currency', 'salary_raw_text',
+    })
+
+    # Fields that feed search_vector
+    SEARCH_SOURCE_FIELDS = frozenset({'title', 'description', 'tags', 'company', 'location'})
+
     # Allow runtime extension of choices for new categories encountered during scraping
     # Admin/forms will render newly appended choices without migrations
 
@@ -102,6 +112,14 @@ class JobPosting(models.Model):
     salary_currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES, default='AUD')
     salary_type = models.CharField(max_length=10, choices=SALARY_TYPE_CHOICES, default='yearly')
     salary_raw_text = models.CharField(max_length=200, blank=True, help_text="Original salary text")
+    salary_min_annual = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True,
+        help_text="Lower salary bound annualized to AUD (computed on save)"
+    )
+    salary_max_annual = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True,
+        help_text="Upper salary bound annualized to AUD (computed on save)"
+    )
 
     # External Source Information
     external_source = models.CharField(max_length=100, default='seek.com.au')
@@ -113,6 +131,10 @@ class JobPosting(models.Model):
     posted_ago = models.CharField(max_length=50, blank=True, help_text="Relative date like '2 days ago'")
     date_posted = models.DateTimeField(null=True, blank=True)
     expired_at = models.DateTimeField(null=True, blank=True, help_text="When the job was marked expired")
+    last_checked_at = models.DateTimeField(null=True, blank=True, help_text="Last external URL liveness check")
+    check_fail_count = models.PositiveIntegerField(
+        default=0, help_text="Consecutive liveness checks that returned 404/410"
+    )
     tags = models.TextField(blank=True, help_text="Comma-separated tags or skills")
 
     # Timestamps
@@ -122,6 +144,12 @@ class JobPosting(models.Model):
     # Additional Data
     additional_info = models.JSONField(default=dict, blank=True, help_text="Store any additional scraped data")
     job_closing_date = models.CharField(null=True, blank=True)
+    closing_at = models.DateTimeField(
+        null=True, blank=True, help_text="Parsed job_closing_date (computed on save)"
+    )
+    # Weighted full-text document (PostgreSQL only, computed on save). Its GIN index and
+    # the trigram index on title are created in migration 0021.
+    search_vector = SearchVectorField(null=True, editable=False)
     skills = models.CharField(null=True, blank=True, max_length=200)
     preferred_skills = models.CharField(null=True, blank=True, max_length=200)
 
@@ -133,6 +161,13 @@ class JobPosting(models.Model):
             models.Index(fields=['external_source', 'status']),
             models.Index(fields=['job_category', 'location']),
             models.Index(fields=['company', 'status']),
+            models.Index(fields=['status', 'salary_min_annual']),
+            models.Index(fields=['status', 'salary_max_annual']),
+            models.Index(fields=['status', 'closing_at']),
+            models.Index(fields=['status', 'last_checked_at']),
+            # Keyset pagination for the /jobs/feed cursor
+            models.Index(fields=['status', 'updated_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def __str__(self):
@@ -147,26 +182,141 @@ class JobPosting(models.Model):
                 unique_slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = unique_slug
-        super().save(*args, **kwargs)
+        self.salary_min_annual, self.salary_max_annual = self.compute_annual_salary()
+        # Cleared or unparseable closing dates clear closing_at, so expiry never uses a stale date
+        self.closing_at = ClosingDateParser.parse(self.job_closing_date)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+        # vector_for reads company and location; skip it for saves that would not store it
+        store_vector = JobSearchService.is_supported() and (
+            update_fields is None or bool(self.SEARCH_SOURCE_FIELDS.intersection(update_fields))
+        )
+        if store_vector:
+            self.search_vector = JobSearchService.vector_for(self)
+        if update_fields is not None:
+            if self.SALARY_SOURCE_FIELDS.intersection(update_fields):
+                update_fields |= {'salary_min_annual', 'salary_max_annual'}
+            if 'job_closing_date' in update_fields:
+                update_fields.add('closing_at')
+            if store_vector:
+                update_fields.add('search_vector')
+            kwargs['update_fields'] = update_fields
+        # post_save logs the change and queues it for sync; keep that in the row's transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def compute_annual_salary(self):
+        """Return (min, max) salary annualized to AUD from the raw salary fields."""
+        return SalaryNormalizationService.annual_range(
+            salary_min=self.salary_min,
+            salary_max=self.salary_max,
+            salary_type=self.salary_type,
+            currency=self.salary_currency,
+            raw_text=self.salary_raw_text,
+        )
+
+    @staticmethod
+    def split_tags(tags):
+        """Split a comma-separated tags string into a list."""
+        return [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else []
+
+    @staticmethod
+    def format_salary(salary_min, salary_max, salary_currency, salary_type, salary_raw_text):
+        """Format salary fields for display (shared by `salary_display` and bulk exports)."""
+        if salary_min and salary_max:
+            if salary_min == salary_max:
+                return f"{salary_currency} {salary_min:,.0f} per {salary_type}"
+            else:
+                return f"{salary_currency} {salary_min:,.0f} - {salary_max:,.0f} per {salary_type}"
+        elif salary_min:
+            return f"{salary_currency} {salary_min:,.0f} per {salary_type}"
+        elif salary_raw_text:
+            return salary_raw_text
+        return "Salary not specified"
 
     @property
     def tags_list(self):
         """Return tags as a list."""
-        return [tag.strip() for tag in self.tags.split(',') if tag.strip()] if self.tags else []
+        return self.split_tags(self.tags)
 
     @property
     def salary_display(self):
         """Return formatted salary string."""
-        if self.salary_min and self.salary_max:
-            if self.salary_min == self.salary_max:
-                return f"{self.salary_currency} {self.salary_min:,.0f} per {self.salary_type}"
-            else:
-                return f"{self.salary_currency} {self.salary_min:,.0f} - {self.salary_max:,.0f} per {self.salary_type}"
-        elif self.salary_min:
-            return f"{self.salary_currency} {self.salary_min:,.0f} per {self.salary_type}"
-        elif self.salary_raw_text:
-            return self.salary_raw_text
-        return "Salary not specified"
+        return self.format_salary(
+            self.salary_min, self.salary_max, self.salary_currency, self.salary_type, self.salary_raw_text
+        )
+
+class JobSourceTTL(models.Model):
+    """Lifetime for jobs from one source that have no closing date.
+
+    Overrides settings.JOB_TTL_BY_SOURCE and the built-in defaults.
+    """
+    source = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="external_source value or substring (e.g. 'seek.com.au', 'workday'); 'default' for the fallback",
+    )
+    ttl_days = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['source']
+        verbose_name = 'Job Source TTL'
+        verbose_name_plural = 'Job Source TTLs'
+
+    def __str__(self):
+        return f"{self.source}: {self.ttl_days} days"
+
+
+class JobFacetCount(models.Model):
+    """Precomputed job counts per facet value, maintained by JobFacetService."""
+    dimension = models.CharField(max_length=30)
+    value = models.CharField(max_length=255, blank=True)
+    total_count = models.PositiveIntegerField(default=0)
+    active_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['dimension', '-active_count', 'value']
+        verbose_name = 'Job Facet Count'
+        verbose_name_plural = 'Job Facet Counts'
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value'], name='uniq_job_facet_dimension_value'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.value}: {self.active_count}/{self.total_count}"
+
+
+class JobChange(models.Model):
+    """Append-only log of JobPosting inserts, updates and deletes, written by JobChangeLogService.
+
+    `job_id` is not a foreign key so tombstones outlive the deleted rows.
+    """
+    OP_INSERT = 'insert'
+    OP_UPDATE = 'update'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [
+        (OP_INSERT, 'Insert'),
+        (OP_UPDATE, 'Update'),
+        (OP_DELETE, 'Delete'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    job_id = models.BigIntegerField(db_index=True)
+    op = models.CharField(max_length=6, choices=OP_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['seq']
+        verbose_name = 'Job Change'
+        verbose_name_plural = 'Job Changes'
+
+    def __str__(self):
+        return f"#{self.seq} {self.op} job {self.job_id}"
 
 
 class JobScript(models.Model):
@@ -292,7 +442,17 @@ class JobSyncPortalResult(models.Model):
     batch_size = models.PositiveIntegerField(default=0)
     success_count = models.PositiveIntegerField(default=0)
     failure_count = models.PositiveIntegerField(default=0)
+    # Jobs whose payload matched the portal's last successful delivery
+    skipped_count = models.PositiveIntegerField(default=0)
     success_rate = models.FloatField(default=0.0, validators=[MinValueValidator(0.0)])
+    status = models.CharField(max_length=20, default='running')  # running, success, error, locked
+    # Progress of Celery-driven runs (apps.jobs.tasks.sync_jobs): jobs selected
+    # for this portal and the chunk tasks they were split into
+    jobs_fetched = models.PositiveIntegerField(default=0)
+    chunks_total = models.PositiveIntegerField(default=0)
+    chunks_done = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['portal_name']
@@ -313,10 +473,88 @@ class JobSyncJobResult(models.Model):
     response_body = models.TextField(blank=True)
     was_success = models.BooleanField(default=False)
     error = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ['-created_at']
 
     def __str__(self):
         return f"Job {self.job_id} -> {self.portal_result.portal_name} ({'OK' if self.was_success else 'FAIL'})"
+
+
+class JobDelivery(models.Model):
+    """Last successful delivery of a job to a portal, written by JobDeliveryLedgerService.
+
+    `payload_hash` fingerprints the portal-specific payload before encryption,
+    so a job is pushed again only when what the portal would receive changed.
+    """
+    portal_name = models.CharField(max_length=120)
+    job_id = models.CharField(max_length=120)
+    payload_hash = models.CharField(max_length=64)
+    delivered_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['portal_name', 'job_id']
+        constraints = [
+            models.UniqueConstraint(fields=['portal_name', 'job_id'], name='jobdelivery_portal_job_uniq'),
+        ]
+        verbose_name = 'Job Delivery'
+        verbose_name_plural = 'Job Deliveries'
+
+    def __str__(self):
+        return f"Job {self.job_id} -> {self.portal_name} @ {self.delivered_at:%Y-%m-%d %H:%M:%S}"
+
+
+class JobSyncPortalState(models.Model):
+    """Per-portal incremental sync position.
+
+    Every job whose `updated_at` is at or after `high_water_mark` may still be
+    undelivered; older jobs have been delivered (or were unchanged).
+    """
+    portal_name = models.CharField(max_length=120, unique=True)
+    high_water_mark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['portal_name']
+        verbose_name = 'Job Sync Portal State'
+        verbose_name_plural = 'Job Sync Portal States'
+
+    def __str__(self):
+        return f"{self.portal_name} @ {self.high_water_mark}"
+
+
+class JobSyncOutbox(models.Model):
+    """Pending portal delivery of a created or changed job, written by JobSyncOutboxService.
+
+    One row per job: further changes before delivery re-arm the same row.
+    Workers claim due rows, push the job to every portal and delete the row on
+    success; failures are retried with exponential backoff until `max_attempts`,
+    after which the row is parked as dead.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DEAD, 'Dead'),
+    ]
+
+    job_id = models.BigIntegerField(unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # Re-set on every enqueue; a worker only settles the row it claimed
+    enqueued_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='jobsyncoutbox_due_idx'),
+        ]
+        verbose_name = 'Job Sync Outbox Entry'
+        verbose_name_plural = 'Job Sync Outbox'
+
+    def __str__(self):
+        return f"Job {self.job_id} ({self.status}, {self.attempts} attempts)"
@@ -2,6 +2,9 @@
 Serializers for the jobs app API.
 """
 
+from decimal import Decimal
+
+from django.utils import timezone
 from rest_framework import serializers
 from .models import JobPosting, JobScript, JobScheduler
 from django_celery_beat.models import (
@@ -50,8 +53,9 @@ class JobPostingListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'company', 'location', 'posted_by', 'salary_display',
             'title', 'slug', 'description', 'job_category', 'job_type', 
-            'experience_level', 'work_mode', 'job_closing_date',
+            'experience_level', 'work_mode', 'job_closing_date', 'closing_at',
             'salary_min', 'salary_max', 'salary_currency', 'salary_type', 'salary_raw_text',
+            'salary_min_annual', 'salary_max_annual',
             'external_source', 'external_url', 'external_id', 'status',
             'posted_ago', 'date_posted', 'expired_at',
             'tags', 'skills', 'preferred_skills', 'tags_list',
@@ -60,10 +64,156 @@ class JobPostingListSerializer(serializers.ModelSerializer):
         depth = 1  # Include related data with depth
         read_only_fields = [
             'id', 'slug', 'posted_by', 'salary_display', 'tags_list',
-            'scraped_at', 'updated_at'
+            'salary_min_annual', 'salary_max_annual', 'closing_at', 'scraped_at', 'updated_at'
         ]
 
 
+class JobPostingListRowSerializer:
+    """Builds `JobPostingListSerializer` output straight from `.values()` rows.
+
+    Same keys and value formats as the ModelSerializer, but without model
+    instances or per-row serializer field objects, so list pages are several
+    times cheaper to produce.
+
+    - fields: optional top-level keys to include (sparse fieldsets); only the
+      columns they need are selected
+    - compact: truncate `description` and reduce `company`/`location` to id and name
+    """
+
+    FIELDS = JobPostingListSerializer.Meta.fields
+    COMPACT_DESCRIPTION_CHARS = 280
+
+    # Top-level key -> columns it needs (keys not listed need the same-named column)
+    COLUMNS = {
+        'company': [
+            'company__id', 'company__name', 'company__slug', 'company__description',
+            'company__created_at', 'company__updated_at',
+        ],
+        'location': [
+            'location__id', 'location__name', 'location__city', 'location__state',
+            'location__country', 'location__created_at', 'location__updated_at',
+        ],
+        'posted_by': ['posted_by__username'],
+        'salary_display': ['salary_min', 'salary_max', 'salary_currency', 'salary_type', 'salary_raw_text'],
+        'tags_list': ['tags'],
+    }
+    COMPACT_COLUMNS = {
+        'company': ['company__id', 'company__name'],
+        'location': ['location__id', 'location__name'],
+    }
+
+    DATETIME_FIELDS = ('closing_at', 'date_posted', 'expired_at', 'scraped_at', 'updated_at')
+    DECIMAL_FIELDS = ('salary_min', 'salary_max', 'salary_min_annual', 'salary_max_annual')
+    DECIMAL_QUANTUM = Decimal('0.01')
+
+    def __init__(self, fields=None, compact: bool = False):
+        if fields:
+            wanted = set(fields)
+            self.fields = [name for name in self.FIELDS if name in wanted] or list(self.FIELDS)
+        else:
+            self.fields = list(self.FIELDS)
+        self.compact = compact
+        # Same conversion as DRF's DateTimeField with the default ISO 8601 output
+        self._timezone = timezone.get_current_timezone()
+        # Companies/locations repeat across a page; each nested dict is built once per serialize()
+        self._nested = {'company': {}, 'location': {}}
+        self._formatters = [(name, self._formatter(name)) for name in self.fields]
+
+    def columns(self):
+        """Columns to pass to `.values()` for the selected fields."""
+        columns = []
+        for name in self.fields:
+            needed = (self.COMPACT_COLUMNS if self.compact else {}).get(name) or self.COLUMNS.get(name, [name])
+            for column in needed:
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def _format_datetime(self, value):
+        if value is None:
+            return None
+        if timezone.is_aware(value):
+            value = value.astimezone(self._timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def _format_decimal(self, value):
+        # Matches DRF's DecimalField(decimal_places=2) with COERCE_DECIMAL_TO_STRING
+        return '{:f}'.format(value.quantize(self.DECIMAL_QUANTUM)) if value is not None else None
+
+    def _company(self, row):
+        if self.compact:
+            return {'id': row['company__id'], 'name': row['company__name']}
+        return {
+            'id': row['company__id'],
+            'name': row['company__name'],
+            'slug': row['company__slug'],
+            'description': row['company__description'],
+            'created_at': self._format_datetime(row['company__created_at']),
+            'updated_at': self._format_datetime(row['company__updated_at']),
+        }
+
+    def _location(self, row):
+        if self.compact:
+            return {'id': row['location__id'], 'name': row['location__name']}
+        return {
+            'id': row['location__id'],
+            'name': row['location__name'],
+            'city': row['location__city'],
+            'state': row['location__state'],
+            'country': row['location__country'],
+            'created_at': self._format_datetime(row['location__created_at']),
+            'updated_at': self._format_datetime(row['location__updated_at']),
+        }
+
+    def _truncate(self, value):
+        if value and len(value) > self.COMPACT_DESCRIPTION_CHARS:
+            return value[:self.COMPACT_DESCRIPTION_CHARS].rstrip() + '…'
+        return value
+
+    def _formatter(self, name):
+        """Return a row -> value callable for one output key."""
+        if name == 'company':
+            companies = self._nested['company']
+            return lambda row: companies.get(row['company__id']) or companies.setdefault(
+                row['company__id'], self._company(row)
+            )
+        if name == 'location':
+            locations = self._nested['location']
+            return lambda row: None if row['location__id'] is None else (
+                locations.get(row['location__id'])
+                or locations.setdefault(row['location__id'], self._location(row))
+            )
+        if name == 'posted_by':
+            return lambda row: row['posted_by__username']
+        if name == 'salary_display':
+            format_salary = JobPosting.format_salary
+            return lambda row: format_salary(
+                row['salary_min'], row['salary_max'], row['salary_currency'],
+                row['salary_type'], row['salary_raw_text'],
+            )
+        if name == 'tags_list':
+            split_tags = JobPosting.split_tags
+            return lambda row: split_tags(row['tags'])
+        if name in self.DATETIME_FIELDS:
+            return lambda row: self._format_datetime(row[name])
+        if name in self.DECIMAL_FIELDS:
+            return lambda row: self._format_decimal(row[name])
+        if name == 'description' and self.compact:
+            return lambda row: self._truncate(row[name])
+        return lambda row: row[name]
+
+    def to_representation(self, row) -> dict:
+        return {name: formatter(row) for name, formatter in self._formatters}
+
+    def serialize(self, rows) -> list:
+        for cache in self._nested.values():
+            cache.clear()
+        return [self.to_representation(row) for row in rows]
+
+
 class JobPostingDetailSerializer(serializers.ModelSerializer):
     """Detailed serializer for individual job views."""
     
@@ -78,15 +228,16 @@ class JobPostingDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'slug', 'description', 'company', 'location', 
             'posted_by', 'job_category', 'job_type', 'experience_level', 
-            'work_mode', 'job_closing_date', 'salary_min', 'salary_max', 'salary_currency', 
+            'work_mode', 'job_closing_date', 'closing_at', 'salary_min', 'salary_max', 'salary_currency', 
             'salary_type', 'salary_raw_text', 'salary_display', 
+            'salary_min_annual', 'salary_max_annual',
             'external_source', 'external_url', 'external_id', 'status', 
             'posted_ago', 'date_posted', 'expired_at', 'tags', 'skills', 'preferred_skills', 'tags_list', 
             'additional_info', 'scraped_at', 'updated_at'
         ]
         read_only_fields = [
             'id', 'slug', 'posted_by', 'salary_display', 'tags_list',
-            'scraped_at', 'updated_at'
+            'salary_min_annual', 'salary_max_annual', 'closing_at', 'scraped_at', 'updated_at'
         ]
 
 
@@ -108,8 +259,8 @@ class JobPostingFullSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JobPosting
-        fields = '__all__'
-        read_only_fields = ['id', 'slug', 'scraped_at', 'updated_at']
+        exclude = ['search_vector']
+        read_only_fields = ['id', 'slug', 'salary_min_annual', 'salary_max_annual', 'closing_at', 'scraped_at', 'updated_at']
 
 class JobScriptListSerializer(serializers.ModelSerializer):
     """Serializer for listing JobScript entries."""
@@ -210,8 +361,10 @@ class JobSyncPortalResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobSyncPortalResult
         fields = [
-            'id', 'run', 'portal_name', 'target_url', 'batch_size',
-            'success_count', 'failure_count', 'success_rate'
+            'id', 'run', 'portal_name', 'target_url', 'batch_size', 'status',
+            'jobs_fetched', 'chunks_total', 'chunks_done',
+            'success_count', 'failure_count', 'skipped_count', 'success_rate',
+            'error_message', 'finished_at'
         ]
         read_only_fields = ['id']
 
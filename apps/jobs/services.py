@@ -1,9 +1,31 @@
 """
-Job categorization service for automatic job classification.
+Job services for classification, salary/closing-date normalization, search, facets, the change log
+and portal sync delivery.
 """
 
+import logging
+import random
 import re
-from typing import Optional
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple
+
+from dateutil import parser as date_parser
+from django.contrib.postgres.search import SearchVector
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import CharField, Count, Exists, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _chunks(items, size):
+    """Yield lists of at most `size` of `items`."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 
 class JobCategorizationService:
@@ -186,4 +208,929 @@ class JobCategorizationService:
                 if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
                     found_keywords.append(keyword)
         
-        return list(set(found_keywords))  # Remove duplicates
\ No newline at end of file
+        return list(set(found_keywords))  # Remove duplicates
+
+class SalaryNormalizationService:
+    """Parse salary text and convert salary figures to annualized AUD amounts.
+
+    Scrapers store `salary_min`/`salary_max` in whatever period the board
+    advertises (hourly, daily, ...). The annualized values produced here are
+    written to `JobPosting.salary_min_annual`/`salary_max_annual` on save so
+    salary-range queries can run against an index.
+    """
+
+    # Australian full-time conventions: 38 hour week, 5 day week, 52 weeks
+    ANNUAL_MULTIPLIERS = {
+        'hourly': Decimal(38 * 52),
+        'daily': Decimal(5 * 52),
+        'weekly': Decimal(52),
+        'monthly': Decimal(12),
+        'yearly': Decimal(1),
+    }
+
+    # Static fallback conversion rates; override with settings.SALARY_RATES_TO_AUD
+    DEFAULT_RATES_TO_AUD = {
+        'AUD': Decimal('1'),
+        'USD': Decimal('1.50'),
+        'EUR': Decimal('1.65'),
+        'GBP': Decimal('1.90'),
+    }
+
+    # Annual amounts outside this window are treated as parsing noise
+    MIN_ANNUAL = Decimal('1000')
+    MAX_ANNUAL = Decimal('5000000')
+
+    PERIOD_PATTERNS = [
+        ('hourly', r'\b(?:per\s*hour|an?\s*hour|hourly|p\.?\s?h\.?|/\s*h(?:ou)?r|ph)\b'),
+        ('daily', r'\b(?:per\s*day|a\s*day|daily|p\.?\s?d\.?|/\s*day)\b'),
+        ('weekly', r'\b(?:per\s*week|a\s*week|weekly|p\.?\s?w\.?|/\s*w(?:ee)?k)\b'),
+        ('monthly', r'\b(?:per\s*month|a\s*month|monthly|p\.?\s?m\.?|/\s*month)\b'),
+        ('yearly', r'\b(?:per\s*(?:year|annum)|a\s*year|annual(?:ly)?|yearly|p\.?\s?a\.?|/\s*(?:yr|year))\b'),
+    ]
+
+    # Words that make figures salary figures; periods (PERIOD_PATTERNS) count too
+    SALARY_CONTEXT_PATTERN = re.compile(
+        r'\b(?:salary|salaries|package|base|super(?:annuation)?|remuneration|wages?|pay|rate|ote|compensation)\b',
+        re.IGNORECASE,
+    )
+    # Words a bare figure or range such as "$45 - $50" or "Up to AUD 90k" may carry
+    BARE_AMOUNT_WORDS = frozenset({'k', 'aud', 'usd', 'eur', 'gbp', 'up', 'to', 'from'})
+    # A figure this large reads as an annual salary even without salary words
+    MIN_BARE_ANNUAL = Decimal('10000')
+
+    AMOUNT_PATTERN = re.compile(r'(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?\s*(k\b)?', re.IGNORECASE)
+
+    @classmethod
+    def rates_to_aud(cls) -> dict:
+        """Return currency -> AUD conversion rates, honouring settings overrides."""
+        from django.conf import settings
+
+        rates = dict(cls.DEFAULT_RATES_TO_AUD)
+        for code, raw_rate in (getattr(settings, 'SALARY_RATES_TO_AUD', None) or {}).items():
+            try:
+                rate = Decimal(str(raw_rate))
+            except (InvalidOperation, ValueError):
+                rate = Decimal(0)
+            if not rate.is_finite() or rate <= 0:
+                logger.warning("Ignoring SALARY_RATES_TO_AUD[%r]: %r is not a positive rate", code, raw_rate)
+                continue
+            rates[str(code).upper()] = rate
+        return rates
+
+    @classmethod
+    def detect_period(cls, text: str) -> Optional[str]:
+        """Return the salary period mentioned in `text`, or None if absent."""
+        if not text:
+            return None
+        lowered = text.lower()
+        for period, pattern in cls.PERIOD_PATTERNS:
+            if re.search(pattern, lowered):
+                return period
+        return None
+
+    @classmethod
+    def has_salary_context(cls, text: str, amounts) -> bool:
+        """True when the figures in `text` read as a salary.
+
+        That is a salary word or period, an annual-sized figure, or nothing
+        but figures (a bare "$45 - $50").
+        """
+        if cls.detect_period(text) or cls.SALARY_CONTEXT_PATTERN.search(text):
+            return True
+        if max(amounts) >= cls.MIN_BARE_ANNUAL:
+            return True
+        return set(re.findall(r'[a-z]+', text.lower())) <= cls.BARE_AMOUNT_WORDS
+
+    @classmethod
+    def parse(cls, text: str) -> dict:
+        """
+        Parse free-form salary text such as "$80k - $95k + super" or "$45/hr".
+
+        Args:
+            text: Raw salary text from the job board
+
+        Returns:
+            Dict with salary_min, salary_max (Decimal or None), salary_currency
+            and salary_type keys, matching the JobPosting field names.
+        """
+        result = {
+            'salary_min': None,
+            'salary_max': None,
+            'salary_currency': 'AUD',
+            'salary_type': 'yearly',
+        }
+        if not text:
+            return result
+
+        upper = text.upper()
+        for code in cls.DEFAULT_RATES_TO_AUD:
+            if code in upper:
+                result['salary_currency'] = code
+                break
+        if '£' in text:
+            result['salary_currency'] = 'GBP'
+        elif '€' in text:
+            result['salary_currency'] = 'EUR'
+
+        # Ignore superannuation percentages like "+ 11.5% super"
+        cleaned = re.sub(r'\d+(?:\.\d+)?\s*%', ' ', text)
+        amounts = []
+        for whole, fraction, thousands in cls.AMOUNT_PATTERN.findall(cleaned):
+            value = Decimal(whole.replace(',', ''))
+            if fraction:
+                value += Decimal(f"0.{fraction}")
+            if thousands:
+                value *= 1000
+            if value > 0:
+                amounts.append(value)
+
+        # "80-100k" style ranges apply the suffix to both ends
+        if len(amounts) >= 2 and amounts[0] < 1000 <= amounts[1] and re.search(r'\d\s*[-–]\s*\d+\s*k\b', cleaned, re.IGNORECASE):
+            amounts[0] *= 1000
+
+        if amounts and not cls.has_salary_context(text, amounts):
+            # e.g. "2 x $50 vouchers": figures, but not a salary
+            amounts = []
+
+        if amounts:
+            result['salary_min'] = min(amounts[:2])
+            result['salary_max'] = max(amounts[:2])
+
+        period = cls.detect_period(text)
+        if period:
+            result['salary_type'] = period
+        elif result['salary_max'] is not None and result['salary_max'] < 200:
+            # Bare small figures on Australian boards are hourly rates
+            result['salary_type'] = 'hourly'
+        return result
+
+    @classmethod
+    def annualize(cls, amount, salary_type: str = 'yearly', currency: str = 'AUD') -> Optional[Decimal]:
+        """Convert a single amount to an annual AUD figure, or None when implausible."""
+        if amount in (None, ''):
+            return None
+        try:
+            value = Decimal(str(amount))
+        except (InvalidOperation, ValueError, TypeError):
+            return None
+        if value <= 0:
+            return None
+        multiplier = cls.ANNUAL_MULTIPLIERS.get((salary_type or 'yearly').lower(), Decimal(1))
+        rate = cls.rates_to_aud().get((currency or 'AUD').upper(), Decimal(1))
+        annual = (value * multiplier * rate).quantize(Decimal('0.01'))
+        if annual < cls.MIN_ANNUAL or annual > cls.MAX_ANNUAL:
+            return None
+        return annual
+
+    @classmethod
+    def annual_range(cls, salary_min=None, salary_max=None, salary_type: str = 'yearly',
+                     currency: str = 'AUD', raw_text: str = '') -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """
+        Return the annualized AUD (min, max) for a job's salary fields.
+
+        Falls back to parsing `raw_text` when neither structured bound is set.
+        A single known bound is used for both ends so range filters still match.
+        """
+        if salary_min in (None, '') and salary_max in (None, '') and raw_text:
+            parsed = cls.parse(raw_text)
+            salary_min, salary_max = parsed['salary_min'], parsed['salary_max']
+            salary_type = parsed['salary_type']
+            currency = parsed['salary_currency']
+
+        annual_min = cls.annualize(salary_min, salary_type, currency)
+        annual_max = cls.annualize(salary_max, salary_type, currency)
+        if annual_min is None:
+            annual_min = annual_max
+        if annual_max is None:
+            annual_max = annual_min
+        if annual_min is not None and annual_max is not None and annual_min > annual_max:
+            annual_min, annual_max = annual_max, annual_min
+        return annual_min, annual_max
+
+
+class ClosingDateParser:
+    """Parse free-form job closing dates into timezone-aware datetimes."""
+
+    @classmethod
+    def parse(cls, raw_value: str) -> Optional[datetime]:
+        """
+        Parse a `job_closing_date` string.
+
+        - Accepts many formats via dateutil.parser (day-first, fuzzy)
+        - If time is missing, assume end-of-day (23:59:59)
+        - Returns None when parsing fails
+        """
+        if not raw_value:
+            return None
+        try:
+            dt = date_parser.parse(str(raw_value), dayfirst=True, fuzzy=True)
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+        # If parsed value has no time (midnight), interpret as end-of-day
+        if dt.time() == time(0, 0):
+            dt = datetime.combine(dt.date(), time(23, 59, 59))
+
+        # Make timezone-aware if naive
+        if timezone.is_naive(dt):
+            dt = timezone.make_aware(dt, timezone.get_current_timezone())
+        return dt
+
+
+class SourceTTLService:
+    """Resolve per-source job lifetimes (in days) for TTL-based expiry."""
+
+    # Built-in fallback; keys match external_source exactly or as a substring
+    DEFAULT_TTL_BY_SOURCE = {
+        "seek.com.au": 30,
+        "jora": 30,
+        "jooble": 30,
+        "workday": 60,
+        "greenhouse": 60,
+        "default": 45,
+    }
+
+    @classmethod
+    def ttl_table(cls) -> dict:
+        """
+        Return the effective TTL table.
+
+        Precedence: active JobSourceTTL rows, then settings.JOB_TTL_BY_SOURCE,
+        then DEFAULT_TTL_BY_SOURCE.
+        """
+        from django.conf import settings
+        from .models import JobSourceTTL
+
+        table = dict(cls.DEFAULT_TTL_BY_SOURCE)
+        for source, raw_days in (getattr(settings, 'JOB_TTL_BY_SOURCE', None) or {}).items():
+            try:
+                days = int(raw_days)
+            except (TypeError, ValueError):
+                days = 0
+            if days <= 0:
+                # One bad entry must not drop the overrides after it
+                logger.warning("Ignoring JOB_TTL_BY_SOURCE[%r]: %r is not a positive number of days", source, raw_days)
+                continue
+            table[str(source).lower()] = days
+        try:
+            for source, days in JobSourceTTL.objects.filter(is_active=True).values_list('source', 'ttl_days'):
+                table[source.lower()] = days
+        except DatabaseError:
+            # Table may not exist yet (before migrations)
+            pass
+        return table
+
+    @classmethod
+    def ttl_days_for(cls, source: str, table: Optional[dict] = None) -> int:
+        """Return the TTL for an external_source, preferring exact then substring matches."""
+        table = table if table is not None else cls.ttl_table()
+        source_l = (source or '').lower()
+        if source_l in table:
+            return table[source_l]
+        # Longest key first so 'seek.com.au' beats a generic 'seek'
+        for key in sorted(table, key=len, reverse=True):
+            if key != 'default' and key in source_l:
+                return table[key]
+        return table.get('default', 45)
+
+
+class JobSearchService:
+    """Weighted full-text search document for job postings (PostgreSQL only).
+
+    Weights: title A, company/location B, description/tags C.
+    """
+
+    CONFIG = 'english'
+
+    @staticmethod
+    def is_supported() -> bool:
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def location_text(location) -> str:
+        if location is None:
+            return ''
+        return ' '.join(part for part in (location.name, location.city, location.state) if part)
+
+    @classmethod
+    def _document(cls, title, company, location, description, tags):
+        return (
+            SearchVector(title, weight='A', config=cls.CONFIG)
+            + SearchVector(company, location, weight='B', config=cls.CONFIG)
+            + SearchVector(description, tags, weight='C', config=cls.CONFIG)
+        )
+
+    @classmethod
+    def vector_for(cls, job):
+        """Search vector expression for one unsaved/saving job, built from its values."""
+        return cls._document(
+            Value(job.title or '', output_field=CharField()),
+            Value(job.company.name if job.company_id else '', output_field=CharField()),
+            Value(cls.location_text(job.location if job.location_id else None), output_field=CharField()),
+            Value(job.description or '', output_field=CharField()),
+            Value(job.tags or '', output_field=CharField()),
+        )
+
+    @classmethod
+    def vector_from_columns(cls):
+        """Search vector expression over stored columns, for bulk UPDATEs."""
+        from apps.companies.models import Company
+        from apps.core.models import Location
+
+        company_name = Company.objects.filter(pk=OuterRef('company_id')).order_by().values('name')[:1]
+        location_text = (
+            Location.objects
+            .filter(pk=OuterRef('location_id'))
+            .order_by()
+            .annotate(text=Concat('name', Value(' '), 'city', Value(' '), 'state', output_field=CharField()))
+            .values('text')[:1]
+        )
+        return cls._document(
+            'title', Subquery(company_name), Subquery(location_text), 'description', 'tags'
+        )
+
+
+class JobFacetService:
+    """Job counts by source/category/type/state/work mode for filter sidebars.
+
+    Counts live in the JobFacetCount table, recomputed by `refresh()` at the
+    end of every expire_jobs pass (hourly) or with `refresh_job_facets`.
+    Saves do not touch it, so inserts stay cheap and the counts lag by up to
+    a pass. Reads are served from the cache for CACHE_TIMEOUT, and a
+    refresh clears it.
+    """
+
+    # facet name -> JobPosting lookup
+    DIMENSIONS = {
+        'external_source': 'external_source',
+        'job_category': 'job_category',
+        'job_type': 'job_type',
+        'state': 'location__state',
+        'work_mode': 'work_mode',
+    }
+    CACHE_KEY = 'jobs:facets'
+    CACHE_TIMEOUT = 10 * 60
+
+    @classmethod
+    def refresh(cls) -> int:
+        """Recompute all facet counts with one GROUP BY per dimension and replace the table."""
+        from .models import JobFacetCount, JobPosting
+
+        rows = []
+        for dimension, lookup in cls.DIMENSIONS.items():
+            grouped = (
+                JobPosting.objects
+                .order_by()
+                .values(lookup)
+                .annotate(total=Count('id'), active=Count('id', filter=Q(status='active')))
+            )
+            merged = {}
+            for entry in grouped:
+                value = entry[lookup] or ''
+                total, active = merged.get(value, (0, 0))
+                merged[value] = (total + entry['total'], active + entry['active'])
+            rows.extend(
+                JobFacetCount(dimension=dimension, value=value, total_count=total, active_count=active)
+                for value, (total, active) in merged.items()
+            )
+
+        with transaction.atomic():
+            JobFacetCount.objects.all().delete()
+            JobFacetCount.objects.bulk_create(rows)
+        cache.delete(cls.CACHE_KEY)
+        return len(rows)
+
+    @classmethod
+    def facets(cls) -> dict:
+        """Return {dimension: [{'value', 'job_count', 'active_jobs'}, ...]} ordered by active jobs."""
+        from .models import JobFacetCount
+
+        cached = cache.get(cls.CACHE_KEY)
+        if cached is not None:
+            return cached
+
+        stored = (
+            JobFacetCount.objects
+            .order_by('dimension', '-active_count', 'value')
+            .values_list('dimension', 'value', 'total_count', 'active_count')
+        )
+        rows = list(stored)
+        if not rows:
+            # First use: build the summary table
+            cls.refresh()
+            rows = list(stored.all())
+
+        result = {dimension: [] for dimension in cls.DIMENSIONS}
+        for dimension, value, total, active in rows:
+            if dimension in result:
+                result[dimension].append({'value': value, 'job_count': total, 'active_jobs': active})
+        cache.set(cls.CACHE_KEY, result, cls.CACHE_TIMEOUT)
+        return result
+
+
+class JobCountService:
+    """Job counts per company/location, annotated as correlated subqueries.
+
+    The counts are only evaluated for the rows on the requested page (unless
+    ordering by them), using the foreign-key index on JobPosting.
+    """
+
+    @classmethod
+    def annotate(cls, queryset, fk_field: str):
+        """Add `job_count` and `active_job_count` to a Company/Location queryset."""
+        from .models import JobPosting
+
+        jobs = JobPosting.objects.filter(**{fk_field: OuterRef('pk')}).order_by().values(fk_field)
+        total = jobs.annotate(count=Count('id')).values('count')
+        active = jobs.filter(status='active').annotate(count=Count('id')).values('count')
+        return queryset.annotate(
+            job_count=Coalesce(Subquery(total), 0),
+            active_job_count=Coalesce(Subquery(active), 0),
+        )
+
+
+class JobChangeLogService:
+    """Append-only JobPosting change log (JobChange) for incremental consumers.
+
+    Saves are logged by a post_save signal, inside the save's transaction
+    (JobPosting.save() is atomic). Bulk UPDATEs and DELETEs must go
+    through `update()` and `delete()`, which log every touched id in the same
+    transaction (there are no signals for them). Consumers read the log in
+    `seq` order with `changes()`.
+
+    `compact()` keeps only the latest entry per job among entries older than
+    the retention and drops old tombstones, so replaying from seq 0 costs
+    about one entry per live job plus recent changes: that replay is the
+    snapshot for new consumers. Cursors older than the retention may have
+    missed dropped tombstones and must restart from 0.
+
+    Appends are serialized until their transaction commits, so seqs become
+    visible in seq order and a consumer never moves past a lower seq that
+    commits later. On PostgreSQL a transaction-level advisory lock does this;
+    SQLite already holds its write lock until commit. The lock is taken
+    after the change itself (the row save, UPDATE or DELETE), so it spans
+    only the append and the commit; transactions that log changes should
+    commit soon after logging them, which is why `update()` and `delete()`
+    commit every `WRITE_CHUNK_SIZE` jobs.
+    """
+
+    CHUNK_SIZE = 5000
+    WRITE_CHUNK_SIZE = 500
+    DEFAULT_RETENTION_DAYS = 7
+    # pg_advisory_xact_lock key held by change-log appends until commit
+    APPEND_LOCK_ID = 0x6A6F62636867
+
+    @classmethod
+    def _lock_appends(cls) -> None:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [cls.APPEND_LOCK_ID])
+
+    @classmethod
+    def record(cls, job_ids, op: str) -> int:
+        """Append one `op` entry per job id; inserts and updates are also queued for sync."""
+        from .models import JobChange
+
+        created = 0
+        with transaction.atomic():
+            # Taken before any seq is allocated and held until the outermost commit
+            cls._lock_appends()
+            now = timezone.now()
+            for chunk in _chunks(job_ids, cls.CHUNK_SIZE):
+                JobChange.objects.bulk_create(
+                    [JobChange(job_id=job_id, op=op, changed_at=now) for job_id in chunk]
+                )
+                if op != JobChange.OP_DELETE:
+                    JobSyncOutboxService.enqueue(chunk, now)
+                created += len(chunk)
+        return created
+
+    @staticmethod
+    def _lock_matching(queryset, chunk) -> list:
+        """Ids in `chunk` that still match `queryset`, row-locked until the transaction ends."""
+        matching = queryset.filter(id__in=chunk).select_for_update(of=('self',)).order_by()
+        return list(matching.values_list('id', flat=True))
+
+    @classmethod
+    def update(cls, queryset, **values) -> int:
+        """Bulk UPDATE `queryset` in chunks, logging the touched ids.
+
+        Bumps `updated_at` unless `values` sets it. Jobs that stopped matching
+        `queryset` (or were deleted) since it was read are neither updated
+        nor logged.
+        """
+        from .models import JobChange, JobPosting
+
+        values.setdefault('updated_at', timezone.now())
+        ids = list(queryset.order_by().values_list('id', flat=True))
+        updated = 0
+        for chunk in _chunks(ids, cls.WRITE_CHUNK_SIZE):
+            with transaction.atomic():
+                touched = cls._lock_matching(queryset, chunk)
+                if touched:
+                    updated += JobPosting.objects.filter(id__in=touched).update(**values)
+                    cls.record(touched, JobChange.OP_UPDATE)
+        return updated
+
+    @classmethod
+    def delete(cls, queryset) -> int:
+        """Delete `queryset` in chunks, writing a tombstone per deleted job; returns the jobs deleted.
+
+        The jobs' delivery ledger and outbox entries are dropped with them.
+        """
+        from .models import JobChange, JobPosting
+
+        ids = list(queryset.order_by().values_list('id', flat=True))
+        deleted = 0
+        for chunk in _chunks(ids, cls.WRITE_CHUNK_SIZE):
+            with transaction.atomic():
+                touched = cls._lock_matching(queryset, chunk)
+                if not touched:
+                    continue
+                deleted += JobPosting.objects.filter(id__in=touched).delete()[1].get(JobPosting._meta.label, 0)
+                cls.record(touched, JobChange.OP_DELETE)
+                JobDeliveryLedgerService.forget(touched)
+                JobSyncOutboxService.forget(touched)
+        return deleted
+
+    @classmethod
+    def retention_cutoff(cls, now=None) -> datetime:
+        from django.conf import settings
+
+        days = getattr(settings, 'JOB_CHANGES_RETENTION_DAYS', cls.DEFAULT_RETENTION_DAYS)
+        return (now or timezone.now()) - timedelta(days=days)
+
+    @classmethod
+    def cursor_is_valid(cls, after_seq: int) -> bool:
+        """False when `after_seq` predates the retention window (tombstones may be gone)."""
+        from .models import JobChange
+
+        if after_seq <= 0:
+            return True
+        recent = JobChange.objects.filter(changed_at__gte=cls.retention_cutoff()).order_by('changed_at', 'seq')
+        first_recent = recent.values_list('seq', flat=True).first()
+        if first_recent is None:
+            first_recent = (JobChange.objects.order_by('-seq').values_list('seq', flat=True).first() or 0) + 1
+        return after_seq >= first_recent - 1
+
+    @classmethod
+    def changes(cls, after_seq: int, limit: int):
+        """Return (entries, has_more) for entries after `after_seq`, in seq order.
+
+        Appends commit in seq order (see the class docstring), so every
+        committed entry is served and no lower seq can appear later.
+        """
+        from .models import JobChange
+
+        entries = list(
+            JobChange.objects.filter(seq__gt=after_seq).order_by('seq')
+            .values('seq', 'job_id', 'op', 'changed_at')[:limit + 1]
+        )
+        return entries[:limit], len(entries) > limit
+
+    @classmethod
+    def compact(cls, now=None) -> Tuple[int, int]:
+        """Compact entries older than the retention. Returns (superseded, tombstones) deleted."""
+        from .models import JobChange
+
+        old = JobChange.objects.filter(changed_at__lt=cls.retention_cutoff(now)).order_by('seq')
+        newer = JobChange.objects.filter(job_id=OuterRef('job_id'), seq__gt=OuterRef('seq'))
+        superseded = tombstones = 0
+        last_seq = 0
+        while True:
+            seqs = list(old.filter(seq__gt=last_seq).values_list('seq', flat=True)[:cls.CHUNK_SIZE])
+            if not seqs:
+                break
+            last_seq = seqs[-1]
+            superseded += JobChange.objects.filter(seq__in=seqs).filter(Exists(newer)).delete()[0]
+            tombstones += JobChange.objects.filter(seq__in=seqs, op=JobChange.OP_DELETE).delete()[0]
+        return superseded, tombstones
+
+
+class JobDeliveryLedgerService:
+    """Per-portal delivery ledger (JobDelivery) and sync high-water marks (JobSyncPortalState).
+
+    The sync engine looks up the hashes of a whole chunk at once with
+    `delivered_hashes()`, skips jobs whose payload hash is unchanged, and
+    `record()`s the successful pushes. A portal's high-water mark only moves
+    forward once every job updated before it was delivered, so incremental
+    runs fetch from there instead of a fixed time window.
+    """
+
+    CHUNK_SIZE = 1000
+
+    @classmethod
+    def delivered_hashes(cls, portal_name: str, job_ids) -> dict:
+        """Return {job_id: payload_hash} of the last successful deliveries to the portal."""
+        from .models import JobDelivery
+
+        hashes = {}
+        for chunk in _chunks((str(job_id) for job_id in job_ids), cls.CHUNK_SIZE):
+            hashes.update(
+                JobDelivery.objects.filter(portal_name=portal_name, job_id__in=chunk)
+                .values_list('job_id', 'payload_hash')
+            )
+        return hashes
+
+    @classmethod
+    def record(cls, portal_name: str, hashes: dict, delivered_at=None) -> int:
+        """Upsert one delivery per {job_id: payload_hash} entry."""
+        from .models import JobDelivery
+
+        delivered_at = delivered_at or timezone.now()
+        recorded = 0
+        for chunk in _chunks(hashes.items(), cls.CHUNK_SIZE):
+            JobDelivery.objects.bulk_create(
+                [
+                    JobDelivery(portal_name=portal_name, job_id=str(job_id), payload_hash=payload_hash,
+                                delivered_at=delivered_at)
+                    for job_id, payload_hash in chunk
+                ],
+                update_conflicts=True,
+                unique_fields=['portal_name', 'job_id'],
+                update_fields=['payload_hash', 'delivered_at'],
+            )
+            recorded += len(chunk)
+        return recorded
+
+    @classmethod
+    def forget(cls, job_ids) -> int:
+        """Drop ledger entries of deleted jobs for every portal."""
+        from .models import JobDelivery
+
+        deleted = 0
+        for chunk in _chunks((str(job_id) for job_id in job_ids), cls.CHUNK_SIZE):
+            deleted += JobDelivery.objects.filter(job_id__in=chunk).delete()[0]
+        return deleted
+
+    @classmethod
+    def high_water_marks(cls, portal_names) -> dict:
+        """Return {portal_name: high_water_mark or None} for the given portals."""
+        from .models import JobSyncPortalState
+
+        marks = dict.fromkeys(portal_names)
+        marks.update(
+            JobSyncPortalState.objects.filter(portal_name__in=list(marks))
+            .values_list('portal_name', 'high_water_mark')
+        )
+        return marks
+
+    @classmethod
+    def advance(cls, portal_name: str, mark: datetime) -> None:
+        """Move the portal's high-water mark forward to `mark` (never backwards)."""
+        from .models import JobSyncPortalState
+
+        with transaction.atomic():
+            state, _ = JobSyncPortalState.objects.select_for_update().get_or_create(portal_name=portal_name)
+            if state.high_water_mark is None or mark > state.high_water_mark:
+                state.high_water_mark = mark
+                state.save(update_fields=['high_water_mark', 'updated_at'])
+
+
+class JobSyncOutboxService:
+    """Transactional outbox (JobSyncOutbox) feeding continuous portal sync.
+
+    `JobChangeLogService.record()` enqueues every inserted or updated job
+    right after the change is logged, in the transaction that made the
+    change. Workers `claim()` due rows with SELECT ... FOR UPDATE SKIP
+    LOCKED (where supported), which also leases them for `LEASE_SECONDS`
+    so a crashed worker's rows come back. They then
+    push outside the transaction and settle each claim with `complete()` or
+    `fail()`. A claim is only settled while the row is unchanged since it was
+    claimed; a job edited meanwhile stays queued for its new version.
+    """
+
+    CHUNK_SIZE = 1000
+    DEFAULT_MAX_ATTEMPTS = 8
+    BACKOFF_BASE_SECONDS = 30
+    BACKOFF_MAX_SECONDS = 6 * 60 * 60
+    LEASE_SECONDS = 10 * 60
+
+    @classmethod
+    def max_attempts(cls) -> int:
+        from django.conf import settings
+
+        return getattr(settings, 'JOB_SYNC_OUTBOX_MAX_ATTEMPTS', cls.DEFAULT_MAX_ATTEMPTS)
+
+    @classmethod
+    def backoff_seconds(cls, attempts: int) -> float:
+        """Delay before attempt `attempts + 1`: doubling from the base, capped, with jitter."""
+        delay = min(cls.BACKOFF_MAX_SECONDS, cls.BACKOFF_BASE_SECONDS * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    @classmethod
+    def enqueue(cls, job_ids, now=None) -> int:
+        """Queue the jobs for delivery now, re-arming existing (including dead) rows."""
+        from .models import JobSyncOutbox
+
+        now = now or timezone.now()
+        queued = 0
+        for chunk in _chunks(job_ids, cls.CHUNK_SIZE):
+            JobSyncOutbox.objects.bulk_create(
+                [
+                    JobSyncOutbox(job_id=job_id, status=JobSyncOutbox.STATUS_PENDING, attempts=0,
+                                  next_attempt_at=now, last_error='', enqueued_at=now)
+                    for job_id in chunk
+                ],
+                update_conflicts=True,
+                unique_fields=['job_id'],
+                update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'enqueued_at'],
+            )
+            queued += len(chunk)
+        return queued
+
+    @classmethod
+    def claim(cls, limit: int) -> list:
+        """Lease up to `limit` due rows. Returns [{'id', 'job_id', 'attempts', 'enqueued_at'}]."""
+        from .models import JobSyncOutbox
+
+        now = timezone.now()
+        with transaction.atomic():
+            due = (
+                JobSyncOutbox.objects
+                .select_for_update(skip_locked=connection.features.has_select_for_update_skip_locked)
+                .filter(status=JobSyncOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+                .order_by('next_attempt_at')
+            )
+            claims = list(due.values('id', 'job_id', 'attempts', 'enqueued_at')[:limit])
+            if claims:
+                JobSyncOutbox.objects.filter(id__in=[claim['id'] for claim in claims]).update(
+                    attempts=F('attempts') + 1,
+                    next_attempt_at=now + timedelta(seconds=cls.LEASE_SECONDS),
+                )
+        for claim in claims:
+            claim['attempts'] += 1
+        return claims
+
+    @classmethod
+    def complete(cls, claims) -> int:
+        """Delete delivered rows that were not re-enqueued since they were claimed."""
+        from .models import JobSyncOutbox
+
+        done = 0
+        for claim in claims:
+            done += JobSyncOutbox.objects.filter(id=claim['id'], enqueued_at=claim['enqueued_at']).delete()[0]
+        return done
+
+    @classmethod
+    def defer(cls, claims, seconds: Optional[float] = None) -> int:
+        """Hand claims back for a later drain without counting the attempt (e.g. a portal was busy)."""
+        from .models import JobSyncOutbox
+
+        due = timezone.now() + timedelta(seconds=cls.BACKOFF_BASE_SECONDS if seconds is None else seconds)
+        deferred = 0
+        for claim in claims:
+            deferred += JobSyncOutbox.objects.filter(id=claim['id'], enqueued_at=claim['enqueued_at']).update(
+                attempts=F('attempts') - 1, next_attempt_at=due,
+            )
+        return deferred
+
+    @classmethod
+    def fail(cls, claim: dict, error: str) -> bool:
+        """Schedule a retry with backoff, or park the row as dead. Returns True when dead."""
+        from .models import JobSyncOutbox
+
+        dead = claim['attempts'] >= cls.max_attempts()
+        values = {'last_error': str(error)[:2000]}
+        if dead:
+            values['status'] = JobSyncOutbox.STATUS_DEAD
+        else:
+            values['next_attempt_at'] = timezone.now() + timedelta(seconds=cls.backoff_seconds(claim['attempts']))
+        JobSyncOutbox.objects.filter(id=claim['id'], enqueued_at=claim['enqueued_at']).update(**values)
+        return dead
+
+    @classmethod
+    def retry_dead(cls, job_ids=None) -> int:
+        """Put dead rows (optionally only these jobs) back in the queue."""
+        from .models import JobSyncOutbox
+
+        dead = JobSyncOutbox.objects.filter(status=JobSyncOutbox.STATUS_DEAD)
+        if job_ids is not None:
+            dead = dead.filter(job_id__in=list(job_ids))
+        return dead.update(status=JobSyncOutbox.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now())
+
+    @classmethod
+    def forget(cls, job_ids) -> int:
+        """Drop outbox rows of deleted jobs."""
+        from .models import JobSyncOutbox
+
+        deleted = 0
+        for chunk in _chunks(job_ids, cls.CHUNK_SIZE):
+            deleted += JobSyncOutbox.objects.filter(job_id__in=chunk).delete()[0]
+        return deleted
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Counts of pending, due and dead rows."""
+        from .models import JobSyncOutbox
+
+        now = timezone.now()
+        return JobSyncOutbox.objects.aggregate(
+            pending=Count('id', filter=Q(status=JobSyncOutbox.STATUS_PENDING)),
+            due=Count('id', filter=Q(status=JobSyncOutbox.STATUS_PENDING, next_attempt_at__lte=now)),
+            dead=Count('id', filter=Q(status=JobSyncOutbox.STATUS_DEAD)),
+        )
+
+
+class JobSyncProgressService:
+    """Progress of chunked sync runs fanned out as Celery tasks (apps.jobs.tasks.sync_jobs).
+
+    Chunk tasks add their counts to the portal's JobSyncPortalResult with F()
+    updates, so workers finishing at the same time never overwrite each other.
+    Each portal's chord callback then finishes its row, and whichever portal
+    finishes last closes the JobSyncRun (under a row lock on the run).
+    """
+
+    FINISHED = ('success', 'error', 'locked')
+
+    @classmethod
+    def record_chunk(cls, portal_result_id: int, success: int, failed: int, skipped: int) -> None:
+        from .models import JobSyncPortalResult, JobSyncRun
+
+        JobSyncPortalResult.objects.filter(id=portal_result_id).update(
+            success_count=F('success_count') + success,
+            failure_count=F('failure_count') + failed,
+            skipped_count=F('skipped_count') + skipped,
+            chunks_done=F('chunks_done') + 1,
+        )
+        if success:
+            JobSyncRun.objects.filter(portal_results__id=portal_result_id).update(
+                total_synced=F('total_synced') + success
+            )
+
+    @classmethod
+    def finish_portal(cls, portal_result_id: int, status: str, error: str = '') -> bool:
+        """Settle the portal row; returns True when this closed the whole run.
+
+        Skipped jobs are already on the portal, so they count as delivered in
+        `success_rate`.
+        """
+        from .models import JobSyncPortalResult, JobSyncRun
+
+        now = timezone.now()
+        row = JobSyncPortalResult.objects.get(id=portal_result_id)
+        row.status = status
+        row.error_message = str(error)[:1000]
+        row.finished_at = now
+        if row.jobs_fetched:
+            row.success_rate = (row.success_count + row.skipped_count) / row.jobs_fetched
+        row.save(update_fields=['status', 'error_message', 'finished_at', 'success_rate'])
+
+        with transaction.atomic():
+            run = JobSyncRun.objects.select_for_update().get(id=row.run_id)
+            portals = JobSyncPortalResult.objects.filter(run_id=run.id)
+            if run.status != 'running' or portals.exclude(status__in=cls.FINISHED).exists():
+                return False
+            totals = portals.aggregate(jobs=Max('jobs_fetched'), synced=Sum('success_count'))
+            errors = list(portals.filter(status='error').values_list('portal_name', 'error_message'))
+            run.jobs_fetched = totals['jobs'] or 0
+            run.total_synced = totals['synced'] or 0
+            run.status = 'error' if errors else 'success'
+            run.error_message = '; '.join(f"{name}: {message}" for name, message in errors)[:1000]
+            run.finished_at = now
+            run.save(update_fields=['jobs_fetched', 'total_synced', 'status', 'error_message', 'finished_at'])
+        return True
+
+
+class JobSyncLogService:
+    """Retention for the sync audit tables (JobSyncRun, JobSyncPortalResult, JobSyncJobResult)."""
+
+    CHUNK_SIZE = 5000
+    DEFAULT_RESULT_RETENTION_DAYS = 14
+    DEFAULT_RUN_RETENTION_DAYS = 90
+
+    @classmethod
+    def prune(cls, now=None, result_days: Optional[int] = None, run_days: Optional[int] = None) -> Tuple[int, int]:
+        """Delete old per-job results, then old runs. Returns (job results, runs) deleted.
+
+        Job results go first in bounded chunks; a run's portal results are
+        deleted with it.
+        """
+        from django.conf import settings
+        from .models import JobSyncJobResult, JobSyncPortalResult, JobSyncRun
+
+        now = now or timezone.now()
+        if result_days is None:
+            result_days = getattr(settings, 'JOB_SYNC_RESULT_RETENTION_DAYS', cls.DEFAULT_RESULT_RETENTION_DAYS)
+        if run_days is None:
+            run_days = getattr(settings, 'JOB_SYNC_RUN_RETENTION_DAYS', cls.DEFAULT_RUN_RETENTION_DAYS)
+        run_cutoff = now - timedelta(days=run_days)
+
+        old_results = JobSyncJobResult.objects.filter(
+            Q(created_at__lt=now - timedelta(days=result_days)) | Q(run__started_at__lt=run_cutoff)
+        ).order_by()
+        results_deleted = 0
+        while True:
+            ids = list(old_results.values_list('id', flat=True)[:cls.CHUNK_SIZE])
+            if not ids:
+                break
+            results_deleted += JobSyncJobResult.objects.filter(id__in=ids).delete()[0]
+
+        old_runs = list(JobSyncRun.objects.filter(started_at__lt=run_cutoff).values_list('id', flat=True))
+        runs_deleted = 0
+        for start in range(0, len(old_runs), cls.CHUNK_SIZE):
+            chunk = old_runs[start:start + cls.CHUNK_SIZE]
+            with transaction.atomic():
+                JobSyncPortalResult.objects.filter(run_id__in=chunk).delete()
+                runs_deleted += JobSyncRun.objects.filter(id__in=chunk).delete()[0]
+        return results_deleted, runs_deleted
@@ -3,7 +3,12 @@ from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django_celery_beat.models import CrontabSchedule, PeriodicTask
 
-from .models import JobScheduler
+from apps.companies.models import Company
+from apps.core.caching import bump_generation_on_commit
+from apps.core.models import Location
+
+from .models import JobChange, JobPosting, JobScheduler
+from .services import JobChangeLogService
 
 
 def _ensure_crontab(schedule: JobScheduler) -> CrontabSchedule:
@@ -53,3 +58,26 @@ def delete_periodic_task(sender, instance: JobScheduler, **kwargs):
         PeriodicTask.objects.filter(id=instance.periodic_task_id).delete()
 
 
+@receiver(post_save, sender=JobPosting)
+def log_job_change(sender, instance: JobPosting, created, raw=False, **kwargs):
+    # Runs inside JobPosting.save()'s atomic block, so the row and its log/outbox entries commit together.
+    # Bulk UPDATE/DELETE paths log through JobChangeLogService.update()/delete()
+    if not raw:
+        JobChangeLogService.record([instance.pk], JobChange.OP_INSERT if created else JobChange.OP_UPDATE)
+
+
+@receiver(post_save, sender=JobPosting)
+def invalidate_job_responses(sender, instance: JobPosting, **kwargs):
+    # No post_delete receiver: it would disable fast bulk deletes; expire_jobs bumps after its run.
+    # Scraper runs batch these bumps (jobs.execute_script)
+    bump_generation_on_commit('jobs')
+
+
+@receiver([post_save, post_delete], sender=Company)
+def invalidate_company_responses(sender, instance: Company, **kwargs):
+    bump_generation_on_commit('companies')
+
+
+@receiver([post_save, post_delete], sender=Location)
+def invalidate_location_responses(sender, instance: Location, **kwargs):
+    bump_generation_on_commit('locations')
@@ -1,11 +1,15 @@
 import importlib
 import logging
+from datetime import datetime
 from typing import Callable
 
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
 from django.utils import timezone
 from asgiref.sync import async_to_sync, sync_to_async
 
+from apps.core.caching import batched_generation_bumps
+from apps.core.locks import DistributedLock
 from .models import JobScheduler
 
 logger = logging.getLogger(__name__)
@@ -60,7 +64,9 @@ def execute_script(self, scheduler_id: int) -> dict:
     try:
         func = _import_callable(target_path)
         logger.info("Executing scraper: %s", target_path)
-        result = func()  # Expect the callable to do its work and return dict/summary
+        # Saves bump the jobs cache generation; coalesce those for the whole run
+        with batched_generation_bumps():
+            result = func()  # Expect the callable to do its work and return dict/summary
         async_to_sync(sync_to_async(_update_last_run_timestamp, thread_sensitive=True))(scheduler_id)
         return {'ok': True, 'result': result}
     except Exception as exc:
@@ -68,3 +74,166 @@ def execute_script(self, scheduler_id: int) -> dict:
         return {'ok': False, 'error': str(exc)}
 
 
+
+
+@shared_task(bind=True, name='jobs.drain_sync_outbox')
+def drain_sync_outbox(self) -> dict:
+    """Deliver due job sync outbox entries to the portals.
+
+    upsert_job_sync_schedules runs it every minute by default, on the
+    worker's shared synchronizer. It takes the portal sync locks, so it never
+    pushes to a portal a sync run (or another drain) is pushing to; those
+    portals wait for a later tick.
+    """
+    try:
+        return _synchronizer().drain_outbox()
+    except Exception as exc:
+        logger.exception("Error draining the job sync outbox")
+        return {'status': 'error', 'error': str(exc)}
+
+
+_synchronizers = {}
+
+
+def _synchronizer():
+    """Per-process JobDataSynchronizer for the sync tasks.
+
+    Building one loads the config and the portal adapters (HTTP sessions,
+    envelope negotiation), so a worker reuses it across chunk tasks.
+    """
+    from script.job_data_sync import JobDataSynchronizer
+    from script.run_job_sync import default_config_file
+
+    config_file = default_config_file()
+    sync = _synchronizers.get(config_file)
+    if sync is None:
+        sync = _synchronizers[config_file] = JobDataSynchronizer(config_file=config_file)
+    if not sync.db_connector.connection and not sync.db_connector.connect():
+        raise ConnectionError("Failed to connect to database")
+    return sync
+
+
+def portal_sync_lock(portal_name: str) -> DistributedLock:
+    return DistributedLock(f"jobsync:portal:{portal_name}", settings.JOB_SYNC_LOCK_TIMEOUT_SECONDS)
+
+
+@shared_task(bind=True, name='jobs.sync_jobs')
+def sync_jobs(self, incremental: bool = True, force: bool = False) -> dict:
+    """Start a sync run and fan it out: one `jobs.sync_portal_chunk` task per portal per chunk of jobs.
+
+    Scheduled by django-celery-beat (see `upsert_job_sync_schedules`). Each
+    portal is locked from here until its chord callback
+    (`jobs.finish_portal_sync`) has run, so a slow full sync and an
+    incremental run never push to the same portal at once; a portal still
+    held by an earlier run is recorded as `locked` and left to that run.
+    Progress is kept on the run's JobSyncRun / JobSyncPortalResult rows.
+    """
+    from .models import JobSyncPortalResult, JobSyncRun
+    from .services import JobSyncProgressService
+
+    start_time = datetime.now()
+    try:
+        sync = _synchronizer()
+        blocked = sync._verification_block(start_time)
+        if blocked:
+            return blocked
+    except Exception as exc:
+        logger.exception("Could not start job sync")
+        return {'status': 'error', 'error': str(exc)}
+
+    run = JobSyncRun.objects.create(incremental=incremental, status='running')
+    fetch_started = timezone.now().isoformat()
+    portals = {}
+    for portal_name, portal_adapter in sync.portals.items():
+        row = JobSyncPortalResult.objects.create(
+            run=run,
+            portal_name=portal_name,
+            target_url=str(sync._portal_target_url(portal_adapter) or ''),
+            batch_size=int(sync.config['sync']['batch_size']),
+        )
+        lock = portal_sync_lock(portal_name)
+        token = lock.acquire()
+        if not token:
+            logger.info("Portal %s is still being synced by an earlier run; skipping", portal_name)
+            JobSyncProgressService.finish_portal(row.id, 'locked', 'An earlier sync run still holds this portal')
+            portals[portal_name] = {'status': 'locked'}
+            continue
+        try:
+            chunks = sync.plan_portal_chunks(portal_name, incremental)
+        except Exception as exc:
+            logger.exception("Could not plan the sync of portal %s", portal_name)
+            lock.release(token)
+            JobSyncProgressService.finish_portal(row.id, 'error', str(exc))
+            portals[portal_name] = {'status': 'error', 'error': str(exc)}
+            continue
+
+        jobs = sum(len(job_ids) for job_ids in chunks)
+        JobSyncPortalResult.objects.filter(id=row.id).update(jobs_fetched=jobs, chunks_total=len(chunks))
+        callback = finish_portal_sync.s(portal_name, row.id, token, fetch_started)
+        if chunks:
+            chord(
+                sync_portal_chunk.s(portal_name, job_ids, run.id, row.id, token, force) for job_ids in chunks
+            )(callback)
+        else:
+            callback.delay([])
+        portals[portal_name] = {'status': 'dispatched', 'jobs': jobs, 'chunks': len(chunks)}
+
+    if not sync.portals:
+        JobSyncRun.objects.filter(id=run.id).update(status='success', finished_at=timezone.now())
+    logger.info("Sync run %s dispatched: %s", run.id, portals)
+    return {'status': 'dispatched', 'run_id': run.id, 'incremental': incremental, 'portals': portals}
+
+
+@shared_task(bind=True, name='jobs.sync_portal_chunk')
+def sync_portal_chunk(self, portal_name: str, job_ids: list, run_id: int, portal_result_id: int,
+                      lock_token: str, force: bool = False) -> dict:
+    """Push one chunk of a sync run to one portal; returns its PortalSyncStats as a dict.
+
+    Never raises, so the chord callback always runs and releases the portal
+    lock: a chunk that errors (or finds the lock taken over) counts as failed
+    and holds the portal's high-water mark back for the next run.
+    """
+    from script.job_data_sync import PortalSyncStats
+    from .services import JobSyncProgressService
+
+    try:
+        lock = portal_sync_lock(portal_name)
+        # Chunks may start long after the run was dispatched: a lock that lapsed
+        # meanwhile is re-taken unless another run holds it now
+        if not lock.extend(lock_token):
+            raise RuntimeError(f"Sync lock for {portal_name} was taken over by another run")
+        with lock.keep_alive(lock_token) as lost:
+            stats = _synchronizer().sync_chunk(portal_name, job_ids, run_id, portal_result_id, force)
+        if lost.is_set():
+            stats.hold = True
+        return stats.to_dict()
+    except Exception as exc:
+        logger.exception("Sync chunk for portal %s failed", portal_name)
+        JobSyncProgressService.record_chunk(portal_result_id, 0, len(job_ids), 0)
+        return dict(PortalSyncStats(failed=len(job_ids), hold=True).to_dict(), error=str(exc)[:300])
+
+
+@shared_task(bind=True, name='jobs.finish_portal_sync')
+def finish_portal_sync(self, results: list, portal_name: str, portal_result_id: int, lock_token: str,
+                       fetch_started: str) -> dict:
+    """Chord callback: advance the portal's high-water mark, release its lock and settle its progress row."""
+    from script.job_data_sync import PortalSyncStats
+    from .services import JobSyncProgressService
+
+    stats = PortalSyncStats()
+    errors = []
+    for result in results or []:
+        stats.merge(PortalSyncStats.from_dict(result))
+        if result.get('error'):
+            errors.append(result['error'])
+    try:
+        _synchronizer().finish_portal_sync(portal_name, stats, datetime.fromisoformat(fetch_started))
+    except Exception as exc:
+        logger.exception("Could not finish the sync of portal %s", portal_name)
+        errors.append(str(exc))
+    finally:
+        portal_sync_lock(portal_name).release(lock_token)
+
+    status = 'error' if errors else 'success'
+    JobSyncProgressService.finish_portal(portal_result_id, status, '; '.join(dict.fromkeys(errors)))
+    return dict(stats.to_dict(), portal=portal_name, status=status)
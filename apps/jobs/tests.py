@@ -0,0 +1,595 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.companies.models import Company
+from apps.core.caching import batched_generation_bumps, bump_generation, get_generations
+from apps.core.locks import DistributedLock
+from apps.core.models import Location
+from apps.jobs import liveness
+from apps.jobs.api_views import _decode_feed_cursor, _encode_feed_cursor
+from apps.jobs.models import (
+    JobChange, JobFacetCount, JobPosting, JobSyncOutbox, JobSyncPortalResult, JobSyncRun,
+)
+from apps.jobs.services import (
+    JobChangeLogService, JobDeliveryLedgerService, JobFacetService, JobSearchService, JobSyncOutboxService,
+    SalaryNormalizationService, SourceTTLService,
+)
+from apps.jobs.tasks import portal_sync_lock, sync_portal_chunk
+from script import expire_jobs
+from script.job_data_sync import JobDataSynchronizer, JobPortalAdapter, PortalSyncStats, TokenBucket
+
+
+class JobFixtureMixin:
+    """A poster, company and location for creating JobPostings."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username='poster')
+        cls.company = Company.objects.create(name='Acme', slug='acme')
+        cls.location = Location.objects.create(name='Sydney NSW', city='Sydney', state='NSW')
+
+    def make_job(self, index=1, **fields):
+        values = {
+            'title': f'Job {index}',
+            'description': 'Python developer',
+            'company': self.company,
+            'posted_by': self.user,
+            'location': self.location,
+            'external_url': f'https://example.com/jobs/{index}',
+            'external_source': 'seek.com.au',
+        }
+        values.update(fields)
+        return JobPosting.objects.create(**values)
+
+
+class ClosingDateTests(JobFixtureMixin, TestCase):
+    def test_closing_at_follows_closing_date(self):
+        job = self.make_job(job_closing_date='31/12/2030')
+        self.assertEqual(job.closing_at.date().isoformat(), '2030-12-31')
+
+    def test_clearing_closing_date_clears_closing_at(self):
+        job = self.make_job(job_closing_date='31/12/2030')
+        job.job_closing_date = ''
+        job.save(update_fields=['job_closing_date'])
+        job.refresh_from_db()
+        self.assertIsNone(job.closing_at)
+
+    def test_unparseable_closing_date_clears_closing_at(self):
+        job = self.make_job(job_closing_date='31/12/2030')
+        job.job_closing_date = 'until filled'
+        job.save()
+        job.refresh_from_db()
+        self.assertIsNone(job.closing_at)
+
+
+class SearchVectorSaveTests(JobFixtureMixin, TestCase):
+    def test_vector_skipped_when_update_fields_have_no_search_source(self):
+        job = self.make_job()
+        with mock.patch.object(JobSearchService, 'is_supported', return_value=True), \
+                mock.patch.object(JobSearchService, 'vector_for') as vector_for:
+            job.status = 'expired'
+            job.save(update_fields=['status'])
+        vector_for.assert_not_called()
+
+    def test_vector_computed_when_a_search_source_is_saved(self):
+        job = self.make_job()
+        with mock.patch.object(JobSearchService, 'is_supported', return_value=True), \
+                mock.patch.object(JobSearchService, 'vector_for', return_value=None) as vector_for, \
+                mock.patch('django.db.models.Model.save') as model_save:
+            job.title = 'Senior Python Developer'
+            job.save(update_fields=['title'])
+        vector_for.assert_called_once_with(job)
+        self.assertIn('search_vector', model_save.call_args.kwargs['update_fields'])
+
+
+class LivenessBatchTests(JobFixtureMixin, TestCase):
+    def test_fail_count_counts_consecutive_gone_results_only(self):
+        job = self.make_job()
+        now = timezone.now()
+        for outcome, expected in ((liveness.GONE, 1), (liveness.ERROR, 1), (liveness.GONE, 2), (liveness.LIVE, 0)):
+            liveness.record_results([(job.id, outcome)], now)
+            job.refresh_from_db()
+            self.assertEqual(job.check_fail_count, expected, outcome)
+            self.assertEqual(job.last_checked_at, now)
+
+    def test_job_goes_inactive_after_the_configured_gone_checks(self):
+        job = self.make_job()
+        checker = mock.Mock()
+        checker.check_batch.side_effect = lambda batch: [(job_id, liveness.GONE) for job_id, _ in batch]
+        with mock.patch.object(liveness, 'LivenessChecker', return_value=checker):
+            for hours, expected_status in ((0, 'active'), (24 * 30, 'inactive')):
+                now = timezone.now() + timedelta(hours=hours)
+                result = expire_jobs._check_urls(now, 10, 1, 1, None, {}, gone_checks_to_deactivate=2)
+                job.refresh_from_db()
+                self.assertEqual(result['checked'], 1)
+                self.assertEqual(job.status, expected_status)
+
+    def test_batches_advance_without_recorded_results(self):
+        now = timezone.now()
+        checked = [self.make_job(i, last_checked_at=now - timedelta(days=30)) for i in range(3)]
+        unchecked = [self.make_job(i) for i in range(3, 6)]
+        batches = list(liveness.iter_due_batches(now, {}, batch_size=2))
+        seen = [job_id for batch in batches for job_id, _, _ in batch]
+        self.assertEqual(seen, [job.id for job in unchecked + checked])
+
+
+class ChangeLogTests(JobFixtureMixin, TestCase):
+    def test_save_rolls_back_when_logging_the_change_fails(self):
+        with mock.patch('apps.jobs.services.JobSyncOutboxService.enqueue', side_effect=DatabaseError('down')):
+            with self.assertRaises(DatabaseError):
+                self.make_job()
+        self.assertFalse(JobPosting.objects.exists())
+        self.assertFalse(JobChange.objects.exists())
+
+    def _race_after_first_chunk(self, change_others):
+        """Log the first chunk, then let `change_others(jobs not in it)` act like a concurrent writer."""
+        record = JobChangeLogService.record
+        raced = []
+
+        def record_then_race(job_ids, op):
+            if not raced:
+                raced.append(True)
+                change_others(JobPosting.objects.exclude(id__in=job_ids))
+            return record(job_ids, op)
+
+        return mock.patch.multiple(JobChangeLogService, WRITE_CHUNK_SIZE=1,
+                                   record=mock.Mock(side_effect=record_then_race))
+
+    def test_update_skips_jobs_that_stopped_matching(self):
+        for index in range(3):
+            self.make_job(index)
+        JobChange.objects.all().delete()
+        with self._race_after_first_chunk(lambda others: others.update(status='expired')):
+            updated = JobChangeLogService.update(JobPosting.objects.filter(status='active'), status='inactive')
+        self.assertEqual(updated, 1)
+        self.assertEqual(JobChange.objects.count(), 1)
+        self.assertEqual(JobPosting.objects.filter(status='expired').count(), 2)
+
+    def test_delete_returns_the_jobs_it_deleted(self):
+        for index in range(3):
+            self.make_job(index)
+        JobChange.objects.all().delete()
+        with self._race_after_first_chunk(lambda others: others.delete()):
+            deleted = JobChangeLogService.delete(JobPosting.objects.all())
+        self.assertEqual(deleted, 1)
+        self.assertEqual(list(JobChange.objects.values_list('op', flat=True)), [JobChange.OP_DELETE])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'advisory-lock serialization is PostgreSQL-specific')
+class ChangeLogCommitOrderTests(TransactionTestCase):
+    def test_lower_seq_committing_last_is_not_skipped(self):
+        appended, release = threading.Event(), threading.Event()
+        errors = []
+
+        def in_thread(target):
+            def run():
+                try:
+                    target()
+                except Exception as exc:  # surfaced by the assertions below
+                    errors.append(exc)
+                finally:
+                    connections.close_all()
+            return threading.Thread(target=run)
+
+        def slow_writer():
+            with transaction.atomic():
+                JobChangeLogService.record([1], JobChange.OP_DELETE)
+                appended.set()
+                release.wait(10)
+
+        def fast_writer():
+            JobChangeLogService.record([2], JobChange.OP_DELETE)
+
+        slow, fast = in_thread(slow_writer), in_thread(fast_writer)
+        slow.start()
+        self.assertTrue(appended.wait(10))
+        fast.start()
+        fast.join(1)
+        # The later append waits for the earlier one, so nothing is served past its seq
+        self.assertEqual(JobChangeLogService.changes(0, 10), ([], False))
+        release.set()
+        slow.join(10)
+        fast.join(10)
+        self.assertEqual(errors, [])
+        entries, _ = JobChangeLogService.changes(0, 10)
+        self.assertEqual([entry['job_id'] for entry in entries], [1, 2])
+
+
+@override_settings(LOCK_REDIS_URL='', JOB_SYNC_LOCK_TIMEOUT_SECONDS=60)
+class PortalSyncLockTests(TestCase):
+    def setUp(self):
+        self.lock = portal_sync_lock('lock-test')
+        self.token = self.lock.acquire()
+        self.addCleanup(cache.delete, self.lock.key)
+        run = JobSyncRun.objects.create(incremental=True, status='running')
+        self.row = JobSyncPortalResult.objects.create(run=run, portal_name='lock-test', target_url='', batch_size=50)
+
+    def lapse(self):
+        cache.delete(self.lock.key)
+
+    def test_lapsed_lock_is_retaken_by_its_holder(self):
+        self.lapse()
+        self.assertTrue(self.lock.extend(self.token))
+        self.assertEqual(self.lock.holder(), self.token)
+
+    def test_lock_taken_over_after_lapse_stays_with_new_holder(self):
+        self.lapse()
+        other = self.lock.acquire()
+        self.assertFalse(self.lock.extend(self.token))
+        self.assertEqual(self.lock.holder(), other)
+
+    def test_keep_alive_renews_past_the_timeout(self):
+        lock = DistributedLock('lock-test-short', timeout=1)
+        token = lock.acquire()
+        self.addCleanup(cache.delete, lock.key)
+        with lock.keep_alive(token) as lost:
+            time.sleep(1.5)
+        self.assertFalse(lost.is_set())
+        self.assertEqual(lock.holder(), token)
+
+    def test_chunk_starting_after_lock_lapsed_still_syncs(self):
+        self.lapse()
+        sync = mock.Mock()
+        sync.sync_chunk.return_value = PortalSyncStats(success=2)
+        with mock.patch('apps.jobs.tasks._synchronizer', return_value=sync):
+            result = sync_portal_chunk('lock-test', [1, 2], self.row.run_id, self.row.id, self.token)
+        sync.sync_chunk.assert_called_once()
+        self.assertEqual((result['success'], result['failed'], result['hold']), (2, 0, False))
+        self.assertEqual(self.lock.holder(), self.token)
+
+    def test_chunk_after_lock_taken_over_fails_without_pushing(self):
+        self.lapse()
+        self.lock.acquire()
+        sync = mock.Mock()
+        with mock.patch('apps.jobs.tasks._synchronizer', return_value=sync), \
+                self.assertLogs('apps.jobs.tasks', level='ERROR'):
+            result = sync_portal_chunk('lock-test', [1, 2], self.row.run_id, self.row.id, self.token)
+        sync.sync_chunk.assert_not_called()
+        self.assertEqual((result['failed'], result['hold']), (2, True))
+        self.assertIn('taken over', result['error'])
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_burst_below_one_still_grants_requests(self):
+        bucket = TokenBucket.from_config({'rate_limit': 100, 'rate_limit_burst': 0.2})
+        self.assertEqual(bucket.capacity, 1.0)
+        bucket.acquire()
+        self.assertLess(bucket.acquire(), 1.0)
+
+    def test_shared_bucket_takes_tokens_from_redis(self):
+        client = mock.Mock()
+        client.eval.side_effect = [250, 0]
+        with mock.patch('apps.core.locks._redis_client', return_value=client), \
+                mock.patch('script.job_data_sync.time.sleep') as sleep:
+            bucket = TokenBucket.from_config({'rate_limit': 4}, shared_name='jobsync:portal:test')
+            self.assertEqual(bucket.acquire(), 0.25)
+        sleep.assert_called_once_with(0.25)
+        self.assertEqual(client.eval.call_args[0][2], 'ratelimit:jobsync:portal:test')
+
+    @override_settings(LOCK_REDIS_URL='')
+    def test_shared_bucket_without_redis_limits_per_process(self):
+        bucket = TokenBucket.from_config({'rate_limit': 4}, shared_name='jobsync:portal:test')
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertIsNone(bucket._shared)
+
+
+class BatchPushTests(SimpleTestCase):
+    def setUp(self):
+        self.adapter = JobPortalAdapter('test', {'base_url': 'http://portal.test', 'batch_endpoint_path': '/batch'})
+        self.adapter.push_job = mock.Mock(return_value=(True, {}))
+
+    def _response(self, status_code, body=None, headers=None):
+        response = mock.Mock(status_code=status_code, headers=headers or {}, text='')
+        response.content = b'x' if body is not None else b''
+        response.json.return_value = body
+        return response
+
+    def test_whole_batch_failure_is_retried_once_then_failed_as_a_unit(self):
+        self.adapter.session.post = mock.Mock(return_value=self._response(503, headers={'Retry-After': '2'}))
+        with mock.patch('script.job_data_sync.time.sleep') as sleep:
+            outcomes = self.adapter._push_batch_outcomes([{'id': 1}, {'id': 2}])
+        self.assertEqual(self.adapter.session.post.call_count, 2)
+        sleep.assert_called_once_with(2.0)
+        self.assertFalse(any(outcome.success for outcome in outcomes))
+        self.adapter.push_job.assert_not_called()
+
+    def test_client_error_is_not_retried(self):
+        self.adapter.session.post = mock.Mock(return_value=self._response(400))
+        with mock.patch('script.job_data_sync.time.sleep') as sleep:
+            outcomes = self.adapter._push_batch_outcomes([{'id': 1}])
+        self.assertEqual(self.adapter.session.post.call_count, 1)
+        sleep.assert_not_called()
+        self.assertFalse(outcomes[0].success)
+        self.adapter.push_job.assert_not_called()
+
+    def test_rejected_items_in_an_accepted_batch_are_retried_individually(self):
+        body = {'results': [{'success': True}, {'success': False}]}
+        self.adapter.session.post = mock.Mock(return_value=self._response(200, body))
+        outcomes = self.adapter._push_batch_outcomes([{'id': 1}, {'id': 2}])
+        self.adapter.push_job.assert_called_once_with({'id': 2})
+        self.assertTrue(all(outcome.success for outcome in outcomes))
+
+
+class GenerationBumpTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def generation(self):
+        return get_generations(['jobs'])['jobs']
+
+    def test_save_bumps_after_commit(self):
+        before = self.generation()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.make_job()
+        self.assertEqual(self.generation(), before)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.generation(), before + 1)
+
+    def test_batched_bumps_are_sent_once(self):
+        before = self.generation()
+        with batched_generation_bumps():
+            for index in range(3):
+                bump_generation('jobs')
+            self.assertEqual(self.generation(), before)
+        self.assertEqual(self.generation(), before + 1)
+
+    def test_responses_are_not_cached_without_a_shared_cache(self):
+        job = self.make_job()
+        self.client.force_login(self.user)
+        with override_settings(API_RESPONSE_CACHE_ENABLED=False):
+            self.client.get(f'/api/jobs/{job.id}/')
+            JobPosting.objects.filter(id=job.id).update(title='Renamed')
+            self.assertEqual(self.client.get(f'/api/jobs/{job.id}/').json()['title'], 'Renamed')
+
+
+class FacetTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_saves_leave_counts_to_refresh(self):
+        self.make_job(1, external_source='seek')
+        self.assertEqual(JobFacetService.facets()['external_source'][0]['job_count'], 1)
+        with mock.patch.object(cache, 'delete') as delete:
+            self.make_job(2, external_source='seek')
+        delete.assert_not_called()
+        self.assertEqual(JobFacetCount.objects.get(dimension='external_source', value='seek').total_count, 1)
+        JobFacetService.refresh()
+        self.assertEqual(JobFacetService.facets()['external_source'][0]['job_count'], 2)
+
+
+class DeliveryLedgerTests(TestCase):
+    def setUp(self):
+        self.adapter = JobPortalAdapter('test', {'base_url': 'http://portal.test'})
+        self.adapter.push_job = mock.Mock(return_value=(True, {}))
+        self.synchronizer = JobDataSynchronizer.__new__(JobDataSynchronizer)
+        self.synchronizer.logger = mock.Mock()
+
+    def push(self, job):
+        delivered = JobDeliveryLedgerService.delivered_hashes('test', [job['id']])
+        [outcome] = self.adapter.push_many([job], delivered=delivered)
+        if outcome.success and not outcome.skipped:
+            JobDeliveryLedgerService.record('test', {job['id']: outcome.fingerprint})
+        return outcome
+
+    def test_unchanged_payload_is_skipped_and_an_edit_is_pushed(self):
+        job = {'id': 7, 'title': 'Nurse'}
+        self.assertFalse(self.push(job).skipped)
+        self.assertTrue(self.push(job).skipped)
+        self.assertEqual(self.adapter.push_job.call_count, 1)
+        self.assertFalse(self.push(dict(job, title='Senior Nurse')).skipped)
+        self.assertEqual(self.adapter.push_job.call_count, 2)
+
+    def test_mark_stops_at_the_oldest_failed_job(self):
+        fetch_started = timezone.now()
+        failed_at = fetch_started - timedelta(hours=2)
+        stats = PortalSyncStats()
+        stats.add_failure({'id': 1, 'updated_at': (failed_at + timedelta(hours=1)).isoformat()})
+        stats.add_failure({'id': 2, 'updated_at': failed_at.isoformat()})
+        self.synchronizer._advance_high_water_marks(JobDeliveryLedgerService, {'test': stats}, fetch_started)
+        self.assertEqual(JobDeliveryLedgerService.high_water_marks(['test']), {'test': failed_at})
+
+    def test_mark_stays_put_when_held(self):
+        JobDeliveryLedgerService.advance('test', timezone.now() - timedelta(days=1))
+        before = JobDeliveryLedgerService.high_water_marks(['test'])
+        stats = PortalSyncStats()
+        stats.add_failure({'id': 1})  # no usable updated_at
+        self.assertTrue(stats.hold)
+        self.synchronizer._advance_high_water_marks(JobDeliveryLedgerService, {'test': stats}, timezone.now())
+        self.assertEqual(JobDeliveryLedgerService.high_water_marks(['test']), before)
+
+    def test_advance_never_moves_backwards(self):
+        mark = timezone.now()
+        JobDeliveryLedgerService.advance('test', mark)
+        JobDeliveryLedgerService.advance('test', mark - timedelta(hours=1))
+        self.assertEqual(JobDeliveryLedgerService.high_water_marks(['test', 'other']), {'test': mark, 'other': None})
+
+
+class SyncOutboxTests(TestCase):
+    def setUp(self):
+        self.start = timezone.now() - timedelta(seconds=1)
+        JobSyncOutboxService.enqueue([1], self.start)
+
+    def row(self):
+        return JobSyncOutbox.objects.get(job_id=1)
+
+    def test_claim_leases_the_row(self):
+        [claim] = JobSyncOutboxService.claim(10)
+        self.assertEqual(claim['attempts'], 1)
+        self.assertGreater(self.row().next_attempt_at, timezone.now() + timedelta(minutes=9))
+        self.assertEqual(JobSyncOutboxService.claim(10), [])
+
+    def test_complete_removes_the_row(self):
+        self.assertEqual(JobSyncOutboxService.complete(JobSyncOutboxService.claim(10)), 1)
+        self.assertFalse(JobSyncOutbox.objects.exists())
+
+    def test_reenqueue_while_in_flight_keeps_the_new_version_queued(self):
+        claims = JobSyncOutboxService.claim(10)
+        JobSyncOutboxService.enqueue([1])
+        self.assertEqual(JobSyncOutboxService.complete(claims), 0)
+        self.assertFalse(JobSyncOutboxService.fail(claims[0], 'timeout'))
+        row = self.row()
+        self.assertEqual((row.attempts, row.last_error), (0, ''))
+        self.assertEqual(len(JobSyncOutboxService.claim(10)), 1)
+
+    def test_failure_backs_off(self):
+        [claim] = JobSyncOutboxService.claim(10)
+        with mock.patch('apps.jobs.services.random.uniform', return_value=1.0):
+            self.assertFalse(JobSyncOutboxService.fail(claim, 'HTTP 503'))
+        row = self.row()
+        self.assertEqual((row.status, row.attempts, row.last_error), (JobSyncOutbox.STATUS_PENDING, 1, 'HTTP 503'))
+        delay = (row.next_attempt_at - timezone.now()).total_seconds()
+        self.assertAlmostEqual(delay, JobSyncOutboxService.BACKOFF_BASE_SECONDS, delta=2)
+        with mock.patch('apps.jobs.services.random.uniform', return_value=1.0):
+            self.assertEqual(JobSyncOutboxService.backoff_seconds(3), JobSyncOutboxService.BACKOFF_BASE_SECONDS * 4)
+            self.assertEqual(JobSyncOutboxService.backoff_seconds(30), JobSyncOutboxService.BACKOFF_MAX_SECONDS)
+
+    @override_settings(JOB_SYNC_OUTBOX_MAX_ATTEMPTS=2)
+    def test_dead_letter_after_max_attempts_and_retry(self):
+        for expected_dead in (False, True):
+            JobSyncOutbox.objects.update(next_attempt_at=timezone.now())
+            [claim] = JobSyncOutboxService.claim(10)
+            self.assertEqual(JobSyncOutboxService.fail(claim, 'HTTP 500'), expected_dead)
+        self.assertEqual(self.row().status, JobSyncOutbox.STATUS_DEAD)
+        JobSyncOutbox.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(JobSyncOutboxService.claim(10), [])
+        self.assertEqual(JobSyncOutboxService.retry_dead([1]), 1)
+        self.assertEqual(len(JobSyncOutboxService.claim(10)), 1)
+
+    def test_defer_does_not_spend_an_attempt(self):
+        claims = JobSyncOutboxService.claim(10)
+        self.assertEqual(JobSyncOutboxService.defer(claims, 60), 1)
+        row = self.row()
+        self.assertEqual(row.attempts, 0)
+        self.assertGreater(row.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+
+class ExportFormatTests(JobFixtureMixin, TestCase):
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/jobs/export/', {'format': 'parqet'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unknown export format', response.json()['detail'])
+
+    def test_default_format_is_ndjson(self):
+        self.make_job()
+        response = self.client.get('/api/jobs/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 1)
+
+
+class FeedCursorTests(JobFixtureMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cursor_round_trip(self):
+        updated_at = timezone.now()
+        self.assertEqual(_decode_feed_cursor(_encode_feed_cursor(updated_at, 42)), (updated_at, 42))
+
+    def test_naive_cursor_is_read_as_utc(self):
+        token = _encode_feed_cursor(datetime(2030, 1, 2, 3, 4, 5), 7)
+        self.assertEqual(_decode_feed_cursor(token), (datetime(2030, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc), 7))
+
+    def test_malformed_cursor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            _decode_feed_cursor('not-a-cursor')
+        self.assertEqual(self.client.get('/api/jobs/feed/', {'cursor': 'not-a-cursor'}).status_code, 400)
+
+    def test_pages_follow_updated_at_then_id(self):
+        base = timezone.now() - timedelta(hours=1)
+        jobs = [self.make_job(i) for i in range(5)]
+        # Two jobs share a timestamp, so the id tie-break decides their order
+        stamps = [base + timedelta(minutes=m) for m in (3, 1, 2, 2, 0)]
+        for job, stamp in zip(jobs, stamps):
+            JobPosting.objects.filter(id=job.id).update(updated_at=stamp)
+        expected = [str(job.id) for _, job in sorted(zip(stamps, jobs), key=lambda pair: (pair[0], pair[1].id))]
+
+        seen, cursor = [], ''
+        while True:
+            body = self.client.get('/api/jobs/feed/', {'cursor': cursor, 'limit': 2}).json()
+            seen += [item['job_id'] for item in body['results']]
+            cursor = body['next_cursor']
+            if not body['has_more']:
+                break
+        self.assertEqual(seen, expected)
+        # Polling from the last cursor returns nothing new and keeps the position
+        body = self.client.get('/api/jobs/feed/', {'cursor': cursor}).json()
+        self.assertEqual((body['results'], body['next_cursor']), ([], cursor))
+
+    def test_recent_changes_are_held_back(self):
+        job = self.make_job()
+        body = self.client.get('/api/jobs/feed/', {'cursor': ''}).json()
+        self.assertEqual(body['results'], [])
+        JobPosting.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(minutes=1))
+        cache.clear()
+        body = self.client.get('/api/jobs/feed/', {'cursor': ''}).json()
+        self.assertEqual([item['job_id'] for item in body['results']], [str(job.id)])
+
+
+class SourceTTLTests(TestCase):
+    @override_settings(JOB_TTL_BY_SOURCE={'jora': 'soon', 'Example.com': 10, 'other': 0, 'last': '20'})
+    def test_bad_setting_entries_are_logged_and_skipped(self):
+        with self.assertLogs('apps.jobs.services', level='WARNING') as logs:
+            table = SourceTTLService.ttl_table()
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(table['jora'], SourceTTLService.DEFAULT_TTL_BY_SOURCE['jora'])
+        self.assertEqual((table['example.com'], table['last']), (10, 20))
+        self.assertNotIn('other', table)
+
+
+class SalaryNormalizationTests(JobFixtureMixin, TestCase):
+    def parsed(self, text):
+        result = SalaryNormalizationService.parse(text)
+        return result['salary_min'], result['salary_max'], result['salary_currency'], result['salary_type']
+
+    def test_ranges_and_periods(self):
+        self.assertEqual(self.parsed('$80k - $95k + super'), (Decimal(80000), Decimal(95000), 'AUD', 'yearly'))
+        self.assertEqual(self.parsed('80-100k'), (Decimal(80000), Decimal(100000), 'AUD', 'yearly'))
+        self.assertEqual(self.parsed('$45/hr'), (Decimal(45), Decimal(45), 'AUD', 'hourly'))
+        self.assertEqual(self.parsed('$300 per day'), (Decimal(300), Decimal(300), 'AUD', 'daily'))
+        self.assertEqual(self.parsed('£50,000 per annum'), (Decimal(50000), Decimal(50000), 'GBP', 'yearly'))
+
+    def test_super_percentage_is_not_an_amount(self):
+        self.assertEqual(self.parsed('$120,000 + 11.5% super')[:2], (Decimal(120000), Decimal(120000)))
+
+    def test_bare_small_figures_are_hourly(self):
+        self.assertEqual(self.parsed('$45 - $50'), (Decimal(45), Decimal(50), 'AUD', 'hourly'))
+
+    def test_figures_without_salary_context_are_ignored(self):
+        for text in ('2 x $50 vouchers', '$5 coffee voucher', '$1,500 sign-on bonus', 'Competitive'):
+            with self.subTest(text=text):
+                self.assertEqual(self.parsed(text)[:2], (None, None))
+
+    def test_annual_range(self):
+        self.assertEqual(
+            SalaryNormalizationService.annual_range(raw_text='$45/hr'), (Decimal('88920.00'), Decimal('88920.00'))
+        )
+        self.assertEqual(
+            SalaryNormalizationService.annual_range(salary_min=100, salary_type='yearly'), (None, None)
+        )
+
+    @override_settings(SALARY_RATES_TO_AUD={'usd': '1.6', 'NZD': 'abc', 'JPY': 'NaN', 'CAD': -1, 'SGD': 1.1})
+    def test_bad_rate_overrides_are_logged_and_skipped(self):
+        with self.assertLogs('apps.jobs.services', level='WARNING') as logs:
+            rates = SalaryNormalizationService.rates_to_aud()
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual((rates['USD'], rates['SGD']), (Decimal('1.6'), Decimal('1.1')))
+        self.assertFalse({'NZD', 'JPY', 'CAD'} & set(rates))
+
+    def test_non_finite_salary_filters_are_ignored(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.make_job(salary_min=Decimal(90000), salary_max=Decimal(100000), salary_type='yearly')
+        for value in ('NaN', 'Infinity', '-inf', 'sNaN'):
+            with self.subTest(value=value):
+                response = self.client.get('/api/jobs/', {'salary_min_annual': value})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()), 1)
@@ -3,6 +3,7 @@ Django settings for australia_job_scraper project.
 """
 
 from pathlib import Path
+import json
 import os
 from datetime import timedelta
 
@@ -50,6 +51,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     'rest_framework',
     'django_celery_beat',
@@ -117,6 +119,37 @@ else:
         }
     }
 
+
+def replica_database(primary):
+    """Settings for an optional PostgreSQL read replica of `primary` (DB_REPLICA_* env).
+
+    Only code that opts in reads from it; see apps.core.db_routing.
+    """
+    host = os.getenv("DB_REPLICA_HOST")
+    if not host or "postgresql" not in primary["ENGINE"]:
+        return None
+    replica = dict(primary)
+    replica.update({
+        "NAME": os.getenv("DB_REPLICA_NAME", primary["NAME"]),
+        "USER": os.getenv("DB_REPLICA_USER", primary["USER"]),
+        "PASSWORD": os.getenv("DB_REPLICA_PASSWORD", primary["PASSWORD"]),
+        "HOST": host,
+        "PORT": os.getenv("DB_REPLICA_PORT", primary["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    })
+    return replica
+
+
+_replica_db = replica_database(DATABASES["default"])
+if _replica_db:
+    DATABASES["replica"] = _replica_db
+
+DATABASE_ROUTERS = ["apps.core.db_routing.ReplicaRouter"]
+# Seconds a client reads from the primary after writing through the API
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS", "10"))
+# Incremental sync fetches from the replica look back this much further
+DATABASE_REPLICA_MAX_LAG_SECONDS = int(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "60"))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -185,6 +218,57 @@ if not CORS_ALLOW_ALL_ORIGINS:
     ]
 
 
+# Per-source job lifetimes (days) for expiring jobs without a closing date.
+# JSON object keyed by external_source (or substring), e.g. {"seek.com.au": 30, "default": 45}.
+# Rows in the JobSourceTTL admin table take precedence over these values.
+try:
+    JOB_TTL_BY_SOURCE = json.loads(os.getenv("JOB_TTL_BY_SOURCE", "") or "{}")
+except ValueError:
+    JOB_TTL_BY_SOURCE = {}
+
+# Job change log (/api/jobs/changes/). Entries older than the retention are
+# compacted to the latest entry per job and tombstones are dropped, so
+# consumers whose cursor is older than this must re-sync from after_seq=0.
+JOB_CHANGES_RETENTION_DAYS = int(os.getenv("JOB_CHANGES_RETENTION_DAYS", "7"))
+
+# Job sync outbox: every created/changed job is queued for the portals and
+# retried with exponential backoff; after this many attempts it is parked as
+# dead until the job changes again, `run_job_sync.py --retry-dead` runs or it
+# is retried from the admin.
+JOB_SYNC_OUTBOX_MAX_ATTEMPTS = int(os.getenv("JOB_SYNC_OUTBOX_MAX_ATTEMPTS", "8"))
+
+# Sync result log retention (prune_job_sync_results, expire_jobs): per-job
+# result rows are kept this many days, run and portal summaries longer.
+JOB_SYNC_RESULT_RETENTION_DAYS = int(os.getenv("JOB_SYNC_RESULT_RETENTION_DAYS", "14"))
+JOB_SYNC_RUN_RETENTION_DAYS = int(os.getenv("JOB_SYNC_RUN_RETENTION_DAYS", "90"))
+
+
+# Cache (API response cache, facet counts). Point CACHE_URL at Redis, e.g.
+# redis://redis:6379/1 in docker-compose, so web and Celery workers share
+# invalidations; without it a per-process local-memory cache is used.
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "ajs",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "TIMEOUT": 300,
+        }
+    }
+
+# API response caching (apps.core.caching) relies on every process seeing
+# the same generation bumps, so it is only on with a shared CACHE_URL.
+API_RESPONSE_CACHE_ENABLED = bool(CACHE_URL)
+
+
 # Celery configuration
 # Broker/result backend can be overridden via environment variables
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
@@ -201,3 +285,13 @@ Celery connection resilience
 """
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BROKER_CONNECTION_MAX_RETRIES = -1
+
+# Named locks (apps.core.locks): Redis at LOCK_REDIS_URL, by default the
+# Celery broker; set it empty to use the Django cache instead. Portal sync
+# locks (taken by the Celery sync tasks and by in-process syncs alike) expire
+# after JOB_SYNC_LOCK_TIMEOUT_SECONDS unless their holder keeps renewing them,
+# so a crashed worker cannot block a portal for longer than that. Portal
+# `rate_limit` buckets are kept in the same Redis, so the limit holds across
+# all workers; without Redis each process gets the full rate.
+LOCK_REDIS_URL = os.getenv("LOCK_REDIS_URL", CELERY_BROKER_URL)
+JOB_SYNC_LOCK_TIMEOUT_SECONDS = int(os.getenv("JOB_SYNC_LOCK_TIMEOUT_SECONDS", "1800"))
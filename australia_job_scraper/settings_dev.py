@@ -28,6 +28,10 @@ else:
         }
     }
 
+_replica_db = replica_database(DATABASES['default'])
+if _replica_db:
+    DATABASES['replica'] = _replica_db
+
 DEBUG = True
 # Allow all hosts in development to avoid DisallowedHost when accessing via LAN IP
 ALLOWED_HOSTS = ['*']
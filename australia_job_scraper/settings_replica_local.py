@@ -0,0 +1,22 @@
+# settings_replica_local.py
+# Local primary/replica setup on two SQLite files for exercising the read-replica
+# router without PostgreSQL. Replication is simulated with `sync_local_replica`:
+#
+#   DJANGO_SETTINGS_MODULE=australia_job_scraper.settings_replica_local python manage.py migrate
+#   DJANGO_SETTINGS_MODULE=australia_job_scraper.settings_replica_local python manage.py sync_local_replica
+from .settings import *  # keep base defaults, then override below
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DEBUG = True
+ALLOWED_HOSTS = ['*']
@@ -56,7 +56,7 @@ from playwright.sync_api import sync_playwright
 from apps.companies.models import Company
 from apps.core.models import Location
 from apps.jobs.models import JobPosting
-from apps.jobs.services import JobCategorizationService
+from apps.jobs.services import JobCategorizationService, JobChangeLogService
 
 User = get_user_model()
 
@@ -2217,7 +2217,7 @@ def reset_database():
     """Reset/clear all APS Jobs data from database."""
     try:
         deleted_count = JobPosting.objects.filter(external_source='apsjobs.gov.au').count()
-        JobPosting.objects.filter(external_source='apsjobs.gov.au').delete()
+        JobChangeLogService.delete(JobPosting.objects.filter(external_source='apsjobs.gov.au'))
         logger.info(f"[RESET] Cleared {deleted_count} APS Jobs from database")
         return True
     except Exception as e:
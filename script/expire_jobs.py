@@ -1,187 +1,258 @@
-import concurrent.futures
 import logging
-from datetime import datetime, time, timedelta
+import time
+from datetime import datetime, timedelta
 
-import requests
-from dateutil import parser as date_parser
-from django.db.models import Q
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from apps.core.caching import bump_generation
+from apps.jobs import liveness
 from apps.jobs.models import JobPosting
+from apps.jobs.services import ClosingDateParser, JobChangeLogService, JobFacetService, JobSyncLogService, SourceTTLService
 
 
 logger = logging.getLogger(__name__)
 
 
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/124.0 Safari/537.36"
-)
+# Per-source TTL fallback (in days). The effective table also honours
+# settings.JOB_TTL_BY_SOURCE and JobSourceTTL rows; see SourceTTLService.
+TTL_BY_SOURCE = SourceTTLService.DEFAULT_TTL_BY_SOURCE
 
 
-# Per-source TTL fallback (in days)
-TTL_BY_SOURCE = {
-    "seek.com.au": 30,
-    "jora": 30,
-    "jooble": 30,
-    "workday": 60,
-    "greenhouse": 60,
-    "default": 45,
-}
-
-
-def _requests_session(timeout_seconds: int = 5) -> requests.Session:
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
-    session.timeout = timeout_seconds
-    return session
-
-
-def _url_is_404(session: requests.Session, url: str) -> bool:
-    """Return True only when the URL clearly returns HTTP 404/410 (missing/gone).
+def _parse_closing_date(raw_value: str) -> datetime | None:
+    """Parse the `job_closing_date` string into a timezone-aware datetime.
 
-    We do not parse page content; only status codes matter for this rule.
+    Kept for callers of this module; the parsing rules live in
+    `apps.jobs.services.ClosingDateParser` and are applied at ingest time to
+    populate `JobPosting.closing_at`.
     """
-    try:
-        resp = session.head(url, allow_redirects=True, timeout=5)
-        if resp.status_code in (404, 410):
-            return True
-        # Fallback to GET for sites not supporting HEAD correctly
-        resp = session.get(url, allow_redirects=True, timeout=5)
-        if resp.status_code in (404, 410):
-            return True
-    except requests.RequestException:
-        # Network or TLS error: treat as inconclusive
-        return False
-    return False
+    return ClosingDateParser.parse(raw_value)
 
 
-def _parse_closing_date(raw_value: str) -> datetime | None:
-    """Parse the `job_closing_date` string into a timezone-aware datetime.
+def _apply_status_transitions(job_ids: list[int], new_status: str, now: datetime) -> int:
+    """Move the given jobs to `new_status` with grouped UPDATEs (logged as changes).
 
-    - Accepts many formats via dateutil.parser
-    - If time is missing, assume end-of-day (23:59:59)
-    - Returns None when parsing fails
+    Only rows that are still active/inactive and not already in the target
+    status are touched, so concurrent 'expired'/'filled' changes are kept.
     """
-    if not raw_value:
-        return None
-    try:
-        dt = date_parser.parse(raw_value, dayfirst=True, fuzzy=True)
-    except (ValueError, TypeError):
-        return None
+    if not job_ids:
+        return 0
+    return JobChangeLogService.update(
+        JobPosting.objects
+        .filter(id__in=job_ids, status__in=["active", "inactive"])
+        .exclude(status=new_status),
+        status=new_status, updated_at=now,
+    )
 
-    # If parsed value has no time (midnight), interpret as end-of-day
-    if dt.time() == time(0, 0):
-        dt = datetime.combine(dt.date(), time(23, 59, 59))
 
-    # Make timezone-aware if naive
-    if timezone.is_naive(dt):
-        dt = timezone.make_aware(dt, timezone.get_current_timezone())
-    return dt
+def _expire_by_closing_date(now: datetime) -> tuple[int, int]:
+    """Expire closed jobs and revive future-dated inactive jobs via `closing_at`."""
+    # Do not override 'expired'/'filled' jobs
+    expired = JobChangeLogService.update(
+        JobPosting.objects.filter(status__in=["active", "inactive"], closing_at__lte=now),
+        status="expired", expired_at=Coalesce("expired_at", Value(now)), updated_at=now,
+    )
+    # Not past closing date -> keep active unless it is already expired/filled
+    revived = JobChangeLogService.update(
+        JobPosting.objects.filter(status="inactive", closing_at__gt=now),
+        status="active", updated_at=now,
+    )
+    return expired, revived
 
 
-def _set_job_status(job: JobPosting, new_status: str) -> None:
-    now = timezone.now()
-    job.status = new_status
-    if new_status == "expired" and not getattr(job, "expired_at", None):
-        job.expired_at = now
-        job.updated_at = now
-        job.save(update_fields=["status", "expired_at", "updated_at"])
-    else:
-        job.updated_at = now
-        job.save(update_fields=["status", "updated_at"])
+def _expire_by_ttl(now: datetime, ttl_table: dict[str, int]) -> dict[str, int]:
+    """Expire undated jobs older than their source TTL, source by source.
 
+    Age is measured from `date_posted`, falling back to `scraped_at`. Only
+    the (external_source, status) prefix is indexed: the age test ORs two
+    columns, so it is checked row by row within that range, and a
+    (external_source, status, scraped_at) index would not narrow it.
+    Returns {external_source: expired_count} for sources with expirations.
+    """
+    per_source: dict[str, int] = {}
+    sources = (
+        JobPosting.objects
+        .filter(status__in=["active", "inactive"], closing_at__isnull=True)
+        .order_by()
+        .values_list("external_source", flat=True)
+        .distinct()
+    )
+    for source in sources:
+        cutoff = now - timedelta(days=SourceTTLService.ttl_days_for(source, ttl_table))
+        expired = JobChangeLogService.update(
+            JobPosting.objects
+            .filter(external_source=source, status__in=["active", "inactive"], closing_at__isnull=True)
+            .filter(Q(date_posted__lt=cutoff) | Q(date_posted__isnull=True, scraped_at__lt=cutoff)),
+            status="expired", expired_at=Coalesce("expired_at", Value(now)), updated_at=now,
+        )
+        if expired:
+            per_source[source] = expired
+    return per_source
+
+
+def _check_urls(
+    now: datetime,
+    page_size: int,
+    parallelism: int,
+    per_host_limit: int,
+    time_budget_seconds: float | None,
+    ttl_table: dict[str, int],
+    gone_checks_to_deactivate: int = 1,
+) -> dict:
+    """Recheck due undated jobs' URLs and apply 404-based transitions.
+
+    Jobs are streamed in bounded batches, never-checked and stalest first, with
+    the recheck interval per source derived from the source TTL. Each batch is
+    checked concurrently (capped per host) and written back with grouped UPDATEs.
+    A job goes inactive once `gone_checks_to_deactivate` consecutive checks
+    returned 404/410 (its `check_fail_count`).
+    """
+    checker = liveness.LivenessChecker(total_limit=parallelism, per_host_limit=per_host_limit)
+    started = time.perf_counter()
+    result = {"checked": 0, "errors": 0, "inactive_by_404": 0, "set_active_by_url": 0, "truncated": False}
 
-def run(batch_size: int = 1000, retention_days: int = 90, parallelism: int = 16):
+    batches = liveness.iter_due_batches(
+        now, ttl_table, page_size, base_filter=Q(closing_at__isnull=True)
+    )
+    for batch in batches:
+        statuses = {job_id: status for job_id, _, status in batch}
+        outcomes = checker.check_batch([(job_id, url) for job_id, url, _ in batch])
+
+        gone: list[int] = []
+        to_active: list[int] = []
+        for job_id, outcome in outcomes:
+            # Network errors are inconclusive and never change status
+            if outcome == liveness.GONE and statuses[job_id] != "inactive":
+                gone.append(job_id)
+            elif outcome == liveness.LIVE and statuses[job_id] != "active":
+                to_active.append(job_id)
+
+        counts = liveness.record_results(outcomes, now)
+        to_inactive = gone
+        if gone and gone_checks_to_deactivate > 1:
+            to_inactive = list(
+                JobPosting.objects.filter(id__in=gone, check_fail_count__gte=gone_checks_to_deactivate)
+                .values_list("id", flat=True)
+            )
+        result["checked"] += len(batch)
+        result["errors"] += counts.get(liveness.ERROR, 0)
+        result["inactive_by_404"] += _apply_status_transitions(to_inactive, "inactive", now)
+        result["set_active_by_url"] += _apply_status_transitions(to_active, "active", now)
+
+        if time_budget_seconds is not None and time.perf_counter() - started >= time_budget_seconds:
+            result["truncated"] = True
+            break
+    return result
+
+
+def _delete_old_expired(cutoff: datetime, chunk_size: int) -> int:
+    """Delete expired rows older than `cutoff` in bounded chunks to keep locks short.
+
+    Each chunk writes its tombstones to the change log in the same transaction.
+    """
+    deleted = 0
+    old_expired = JobPosting.objects.filter(status="expired", updated_at__lt=cutoff).order_by("id")
+    while True:
+        ids = list(old_expired.values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            break
+        deleted += JobChangeLogService.delete(JobPosting.objects.filter(id__in=ids))
+    return deleted
+
+
+def run(
+    batch_size: int = 1000,
+    retention_days: int = 90,
+    parallelism: int = 16,
+    per_host_limit: int = 4,
+    url_check_budget_seconds: float | None = 40 * 60,
+    enforce_ttl: bool = True,
+    gone_checks_to_deactivate: int = 1,
+):
     """
     Update job statuses based on closing date and external URL 404 checks.
 
     Rules:
-    - If `job_closing_date` is present and in the past -> status "expired"
-    - If no `job_closing_date` and external URL returns 404/410 -> status "inactive"
+    - If `closing_at` (parsed `job_closing_date`) is in the past -> status "expired"
+    - If no `closing_at` and older than its source TTL -> status "expired"
+    - If no `closing_at` and external URL returns 404/410 on
+      `gone_checks_to_deactivate` consecutive checks -> status "inactive"
     - Otherwise -> status "active" (does not revive already expired/filled jobs)
 
-    Returns a summary dict.
+    `batch_size` is the page size for URL checks and retention deletes. URL
+    checks cover every job whose per-source recheck interval has elapsed, with
+    at most `parallelism` requests in flight and `per_host_limit` per board.
+    They stop once `url_check_budget_seconds` elapses (None disables the
+    budget) so the hourly run finishes within its slot; the remaining jobs
+    stay due and are picked up first next time.
+
+    Returns a summary dict including per-phase timings in seconds.
     """
     now = timezone.now()
-    session = _requests_session()
+    timings: dict[str, float] = {}
+    run_started = time.perf_counter()
 
     # 1) Closing-date based updates
-    expired_by_closing_date = 0
-    set_active_by_closing_date = 0
-    closing_qs = (
-        JobPosting.objects
-        .filter(job_closing_date__isnull=False)
-        .exclude(job_closing_date__exact="")
-        .only("id", "job_closing_date", "status", "expired_at", "updated_at")
-        [:batch_size]
-    )
-    for job in closing_qs:
-        closing_dt = _parse_closing_date(job.job_closing_date)
-        if closing_dt and closing_dt <= now:
-            # Do not override 'filled' jobs
-            if job.status not in ("expired", "filled"):
-                _set_job_status(job, "expired")
-                expired_by_closing_date += 1
-        else:
-            # Not past closing date -> keep active unless it is already expired/filled
-            if job.status not in ("active", "expired", "filled"):
-                _set_job_status(job, "active")
-                set_active_by_closing_date += 1
-
-    # 2) For jobs without a closing date: URL 404/410 -> inactive, else active
-    inactive_by_404 = 0
-    set_active_by_url = 0
-
-    no_date_q = Q(job_closing_date__isnull=True) | Q(job_closing_date__exact="")
-    status_q = Q(status__in=["active", "inactive"])  # do not touch expired/filled
-    url_qs = (
-        JobPosting.objects
-        .filter(no_date_q & status_q)
-        .only("id", "external_url", "status", "updated_at")
-        [:batch_size]
+    phase_started = time.perf_counter()
+    expired_by_closing_date, set_active_by_closing_date = _expire_by_closing_date(now)
+    timings["closing_date"] = round(time.perf_counter() - phase_started, 3)
+
+    # 2) Jobs without a closing date: expire once older than their source TTL
+    ttl_table = SourceTTLService.ttl_table()
+    expired_by_ttl: dict[str, int] = {}
+    if enforce_ttl:
+        phase_started = time.perf_counter()
+        expired_by_ttl = _expire_by_ttl(now, ttl_table)
+        timings["ttl"] = round(time.perf_counter() - phase_started, 3)
+
+    # 3) For jobs without a closing date: URL 404/410 -> inactive, else active
+    phase_started = time.perf_counter()
+    url_result = _check_urls(
+        now, batch_size, parallelism, per_host_limit, url_check_budget_seconds, ttl_table, gone_checks_to_deactivate
     )
+    timings["url_checks"] = round(time.perf_counter() - phase_started, 3)
 
-    id_to_url = {j.id: j.external_url for j in url_qs}
-    if id_to_url:
-        def check(job_id: int) -> tuple[int, bool]:
-            return job_id, _url_is_404(session, id_to_url[job_id])
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=parallelism) as pool:
-            for job_id, is_404 in pool.map(check, list(id_to_url.keys())):
-                try:
-                    job = JobPosting.objects.get(id=job_id)
-                except JobPosting.DoesNotExist:
-                    continue
-
-                if is_404:
-                    if job.status != "inactive":
-                        _set_job_status(job, "inactive")
-                        inactive_by_404 += 1
-                else:
-                    if job.status != "active":
-                        _set_job_status(job, "active")
-                        set_active_by_url += 1
-
-    # 3) Optional cleanup: delete very old expired rows
+    # 4) Optional cleanup: delete very old expired rows
     # Keep this behavior to prevent DB bloat; can be disabled by setting a large retention
-    deleted = 0
-    expired_cutoff = now - timedelta(days=retention_days)
-    old_expired = JobPosting.objects.filter(status="expired", updated_at__lt=expired_cutoff)
-    deleted = old_expired.count()
-    if deleted:
-        old_expired.delete()
+    phase_started = time.perf_counter()
+    deleted = _delete_old_expired(now - timedelta(days=retention_days), batch_size)
+    timings["retention"] = round(time.perf_counter() - phase_started, 3)
+
+    # 5) Reconcile facet counts with the status changes and deletes above
+    phase_started = time.perf_counter()
+    JobFacetService.refresh()
+    timings["facets"] = round(time.perf_counter() - phase_started, 3)
+
+    # 6) Compact change-log entries older than JOB_CHANGES_RETENTION_DAYS
+    phase_started = time.perf_counter()
+    superseded_changes, dropped_tombstones = JobChangeLogService.compact(now)
+    timings["change_log"] = round(time.perf_counter() - phase_started, 3)
+
+    # 7) Prune sync result rows and runs past their retention
+    phase_started = time.perf_counter()
+    pruned_sync_results, pruned_sync_runs = JobSyncLogService.prune(now)
+    timings["sync_log"] = round(time.perf_counter() - phase_started, 3)
+    # Status changes above were bulk UPDATEs, which fire no signals
+    bump_generation("jobs")
+    timings["total"] = round(time.perf_counter() - run_started, 3)
 
     summary = {
         "expired_by_closing_date": expired_by_closing_date,
         "set_active_by_closing_date": set_active_by_closing_date,
-        "inactive_by_404": inactive_by_404,
-        "set_active_by_url": set_active_by_url,
+        "expired_by_ttl": sum(expired_by_ttl.values()),
+        "expired_by_ttl_per_source": expired_by_ttl,
+        "urls_checked": url_result["checked"],
+        "url_check_errors": url_result["errors"],
+        "url_checks_truncated": url_result["truncated"],
+        "inactive_by_404": url_result["inactive_by_404"],
+        "set_active_by_url": url_result["set_active_by_url"],
         "deleted": deleted,
+        "compacted_changes": superseded_changes + dropped_tombstones,
+        "pruned_sync_results": pruned_sync_results,
+        "pruned_sync_runs": pruned_sync_runs,
+        "timings": timings,
         "at": now.isoformat(),
     }
     logger.info("expire_jobs summary: %s", summary)
     return summary
-
-
@@ -12,32 +12,55 @@ Features:
 - Database connection to scrapper
 - Multi-portal data pushing
 - Data transformation for each portal
-- Batch processing with rate limiting
+- Concurrent pushes per portal (bounded worker pools), portals in parallel
+- Batch endpoints: one request per `batch_size` jobs (optionally gzipped)
+- Token-bucket rate limiting per portal (`rate_limit` requests/second), shared
+  across processes through Redis when Django locks use it (LOCK_REDIS_URL)
 - Comprehensive error handling and logging
-- Duplicate detection and incremental sync
+- Delivery ledger: jobs whose payload is unchanged since the last successful
+  push to a portal are skipped (`--force` re-pushes them)
+- Incremental sync from a per-portal high-water mark
+- Continuous delivery from the job sync outbox (`drain_outbox`), with
+  per-job exponential backoff and a dead-letter state
+- Bulk-inserted, sampled and size-capped per-job result logging
+- Encrypted batch envelopes (`encryption_mode: envelope`): a whole batch is
+  compressed (zstd/gzip) and encrypted once, sent as binary or single base64
 """
 
+import base64
+import gzip
 import json
 import os
 import sys
 import time
 import logging
 import hashlib
+import random
 import socket
 import subprocess
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime, timedelta
+import threading
+from contextlib import ExitStack
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+from email.utils import parsedate_to_datetime
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import sqlite3
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 try:
     from cryptography.fernet import Fernet
     ENCRYPTION_AVAILABLE = True
 except ImportError:
     ENCRYPTION_AVAILABLE = False
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 # Load environment variables
 load_dotenv()
@@ -136,6 +159,108 @@ class DataEncryption:
         """Check if encryption is enabled and functional."""
         return self.encryption_enabled
 
+class EnvelopeCodec:
+    """Batch envelope: a JSON array of jobs, compressed, then Fernet-encrypted once.
+
+    Transports:
+    - 'binary': the raw ciphertext (the Fernet token without its base64
+      layer) as `application/vnd.jobsync.envelope`
+    - 'base64': JSON {"encrypted": true, "envelope": 1, "compression",
+      "count", "data", "timestamp"} where `data` is the Fernet token, the
+      only base64 layer
+
+    Both carry X-Envelope-Version/-Compression/-Count headers. Receivers
+    decode with `decode_envelope`.
+    """
+
+    VERSION = 1
+    COMPRESSIONS = ('zstd', 'gzip', 'none')
+    TRANSPORTS = ('binary', 'base64')
+    CONTENT_TYPE = 'application/vnd.jobsync.envelope'
+
+    def __init__(self, encryptor: DataEncryption, compression: str = 'gzip', transport: str = 'base64'):
+        if not encryptor.is_enabled():
+            raise ValueError("Envelope encryption needs a working encryption key")
+        if compression not in self.available_compressions():
+            raise ValueError(f"Unsupported envelope compression '{compression}'")
+        if transport not in self.TRANSPORTS:
+            raise ValueError(f"Unsupported envelope transport '{transport}'")
+        self.fernet = Fernet(encryptor.key)
+        self.compression = compression
+        self.transport = transport
+
+    @classmethod
+    def available_compressions(cls) -> Tuple[str, ...]:
+        return tuple(c for c in cls.COMPRESSIONS if c != 'zstd' or ZSTD_AVAILABLE)
+
+    @staticmethod
+    def compress(data: bytes, compression: str) -> bytes:
+        if compression == 'zstd':
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        if compression == 'gzip':
+            return gzip.compress(data, compresslevel=5)
+        return data
+
+    @staticmethod
+    def decompress(data: bytes, compression: str) -> bytes:
+        if compression == 'zstd':
+            return zstandard.ZstdDecompressor().decompress(data)
+        if compression == 'gzip':
+            return gzip.decompress(data)
+        if compression == 'none':
+            return data
+        raise ValueError(f"Unsupported envelope compression '{compression}'")
+
+    def encode(self, jobs: List[Dict]) -> Tuple[bytes, Dict[str, str]]:
+        """Return (body, headers) carrying `jobs` in one envelope."""
+        raw = json.dumps(jobs, separators=(',', ':'), default=str).encode('utf-8')
+        token = self.fernet.encrypt(self.compress(raw, self.compression))
+        headers = {
+            'X-Envelope-Version': str(self.VERSION),
+            'X-Envelope-Compression': self.compression,
+            'X-Envelope-Count': str(len(jobs)),
+        }
+        if self.transport == 'binary':
+            headers['Content-Type'] = self.CONTENT_TYPE
+            return base64.urlsafe_b64decode(token), headers
+        headers['Content-Type'] = 'application/json'
+        body = {
+            'encrypted': True,
+            'envelope': self.VERSION,
+            'compression': self.compression,
+            'count': len(jobs),
+            'data': token.decode('ascii'),
+            'timestamp': datetime.now().isoformat(),
+        }
+        return json.dumps(body, separators=(',', ':')).encode('utf-8'), headers
+
+
+def decode_envelope(body: bytes, headers: Any, encryption_key: str) -> List[Dict]:
+    """Decode a batch envelope sent by EnvelopeCodec back into the list of jobs (receiver side).
+
+    `headers` is any mapping with case-insensitive `get` (requests, http.server,
+    Django's request.headers); `encryption_key` is the shared sync key.
+    """
+    encryptor = DataEncryption(encryption_key)
+    if not encryptor.is_enabled():
+        raise ValueError("Invalid or unusable encryption key")
+    fernet = Fernet(encryptor.key)
+    content_type = (headers.get('Content-Type') or '').split(';')[0].strip()
+    if content_type == EnvelopeCodec.CONTENT_TYPE:
+        compression = headers.get('X-Envelope-Compression') or 'none'
+        token = base64.urlsafe_b64encode(body)
+    else:
+        wrapper = json.loads(body)
+        if not isinstance(wrapper, dict) or not wrapper.get('envelope'):
+            raise ValueError("Not a job sync envelope")
+        compression = wrapper.get('compression') or 'none'
+        token = wrapper['data'].encode('ascii')
+    jobs = json.loads(EnvelopeCodec.decompress(fernet.decrypt(token), compression))
+    if not isinstance(jobs, list):
+        raise ValueError("Envelope does not contain a job list")
+    return jobs
+
+
 @dataclass
 class JobData:
     """Job data structure for consistent handling across portals."""
@@ -275,123 +400,195 @@ class DatabaseConnector:
             logging.error(f"Failed to connect to database: {e}")
             return False
     
-    def fetch_jobs(self, limit: Optional[int] = None, since: Optional[datetime] = None) -> List[Dict]:
-        """Fetch job data from database."""
-        if not self.connection:
-            raise ConnectionError("Database not connected")
-        
-        # Django ORM branch
-        if self.db_type == 'django':
-            try:
-                from apps.jobs.models import JobPosting  # type: ignore
-                from django.db.models import Q  # type: ignore
-                # Build queryset
-                qs = JobPosting.objects.select_related('company', 'location', 'posted_by')
-                if since:
-                    qs = qs.filter(
-                        Q(updated_at__gte=since) |
-                        Q(scraped_at__gte=since) |
-                        Q(date_posted__gte=since)
-                    )
-                qs = qs.order_by('-scraped_at')
-                if limit:
-                    qs = qs[:int(limit)]
+    FETCH_CHUNK_SIZE = 1000
+
+    # JobPosting columns read for sync payloads (never search_vector, liveness or annualized salary columns)
+    DJANGO_FETCH_FIELDS = (
+        'id', 'slug', 'title', 'company_id', 'company__name', 'location_id', 'location__name',
+        'description', 'additional_info', 'job_category', 'job_type', 'experience_level', 'work_mode',
+        'job_closing_date', 'salary_min', 'salary_max', 'salary_currency', 'salary_type', 'salary_raw_text',
+        'external_source', 'external_url', 'external_id', 'status', 'posted_ago', 'date_posted',
+        'expired_at', 'scraped_at', 'updated_at', 'tags', 'skills', 'preferred_skills',
+        'posted_by_id', 'posted_by__username',
+    )
 
-                jobs: List[Dict[str, Any]] = []
-                for obj in qs:
-                    # Salary text preference
-                    try:
-                        salary_text = obj.salary_raw_text or obj.salary_display
-                    except Exception:
-                        salary_text = obj.salary_raw_text or ''
+    @staticmethod
+    def _iso(dt) -> Optional[str]:
+        """ISO-serialize a datetime (None-safe)."""
+        try:
+            return dt.isoformat() if dt else None
+        except Exception:
+            return None
 
-                    # Remote flag derived from work_mode
-                    try:
-                        remote_allowed = 'remote' in (obj.work_mode or '').lower()
-                    except Exception:
-                        remote_allowed = False
+    def _django_job_payload(self, row: Dict[str, Any], format_salary: Callable[..., str]) -> Dict[str, Any]:
+        """Build the sync payload for one JobPosting `values()` row."""
+        iso = self._iso
+        try:
+            salary_display = format_salary(
+                row['salary_min'], row['salary_max'], row['salary_currency'], row['salary_type'], row['salary_raw_text']
+            )
+        except Exception:
+            salary_display = None
+        additional_info = row['additional_info']
+        pk = row['id']
+        return {
+            # Identifiers
+            'job_id': str(pk),
+            'id': str(pk),
+            'slug': row['slug'],
+
+            # Basic fields
+            'title': row['title'],
+            'company': row['company__name'] or '',
+            'company_id': row['company_id'],
+            'location': (row['location__name'] or '') if row['location_id'] else '',
+            'location_id': row['location_id'],
+            'description': row['description'] or '',
+            # Prefer explicit HTML description when available via additional_info
+            'description_html': self._safe_get_from_additional_info(additional_info, 'description_html'),
+
+            # Job details
+            'category': row['job_category'] or 'other',
+            'job_type': row['job_type'] or 'full_time',
+            'experience_level': row['experience_level'] or '',
+            'work_mode': row['work_mode'] or '',
+            'job_closing_date': row['job_closing_date'] or '',
+
+            # Salary details
+            'salary': row['salary_raw_text'] or salary_display or '',
+            'salary_min': float(row['salary_min']) if row['salary_min'] is not None else None,
+            'salary_max': float(row['salary_max']) if row['salary_max'] is not None else None,
+            'salary_currency': row['salary_currency'],
+            'salary_type': row['salary_type'],
+            'salary_raw_text': row['salary_raw_text'],
+            'salary_display': salary_display,
+
+            # External source
+            'source_site': row['external_source'] or 'scraper',
+            'application_url': row['external_url'] or '',
+            'external_id': row['external_id'] or '',
+
+            # Meta/status
+            'status': row['status'],
+            'posted_ago': row['posted_ago'] or '',
+            'posted_date': iso(row['date_posted'] or row['scraped_at']),
+            'expired_at': iso(row['expired_at']),
+            'scraped_at': iso(row['scraped_at']),
+            'updated_at': iso(row['updated_at']),
+            'created_at': iso(row['scraped_at']),
+
+            # Tags/skills
+            'tags': row['tags'] or '',
+            # Also include raw skills fields from model if present
+            'skills': row['skills'] or '',
+            'preferred_skills': row['preferred_skills'] or '',
+
+            # Associations
+            'posted_by_id': row['posted_by_id'],
+            'posted_by': (row['posted_by__username'] or '') if row['posted_by_id'] else '',
+
+            # Additional
+            'additional_info': self._safe_normalize_additional_info(additional_info),
+
+            # Derived: remote flag from work_mode
+            'remote_allowed': 'remote' in (row['work_mode'] or '').lower(),
+        }
 
-                    # Helper to ISO-serialize datetimes
-                    def iso(dt):
-                        try:
-                            return dt.isoformat() if dt else None
-                        except Exception:
-                            return None
-
-                    job_payload: Dict[str, Any] = {
-                        # Identifiers
-                        'job_id': str(obj.pk),
-                        'id': str(obj.pk),
-                        'slug': obj.slug,
-
-                        # Basic fields
-                        'title': obj.title,
-                        'company': getattr(obj.company, 'name', ''),
-                        'company_id': obj.company_id,
-                        'location': getattr(obj.location, 'name', '') if obj.location_id else '',
-                        'location_id': obj.location_id,
-                        'description': obj.description or '',
-                        # Prefer explicit HTML description when available via additional_info
-                        'description_html': self._safe_get_from_additional_info(obj.additional_info, 'description_html'),
-
-                        # Job details
-                        'category': obj.job_category or 'other',
-                        'job_type': obj.job_type or 'full_time',
-                        'experience_level': obj.experience_level or '',
-                        'work_mode': obj.work_mode or '',
-                        'job_closing_date': getattr(obj, 'job_closing_date', '') or '',
-
-                        # Salary details
-                        'salary': salary_text,
-                        'salary_min': float(obj.salary_min) if obj.salary_min is not None else None,
-                        'salary_max': float(obj.salary_max) if obj.salary_max is not None else None,
-                        'salary_currency': obj.salary_currency,
-                        'salary_type': obj.salary_type,
-                        'salary_raw_text': obj.salary_raw_text,
-                        'salary_display': None,  # include for completeness; may be None if property fails
-
-                        # External source
-                        'source_site': obj.external_source or 'scraper',
-                        'application_url': obj.external_url or '',
-                        'external_id': obj.external_id or '',
-
-                        # Meta/status
-                        'status': obj.status,
-                        'posted_ago': obj.posted_ago or '',
-                        'posted_date': iso(obj.date_posted or obj.scraped_at),
-                        'expired_at': iso(obj.expired_at),
-                        'scraped_at': iso(obj.scraped_at),
-                        'updated_at': iso(obj.updated_at),
-                        'created_at': iso(obj.scraped_at),
-
-                        # Tags/skills
-                        'tags': obj.tags or '',
-                        #'skills': [t.strip() for t in (obj.tags or '').split(',') if t.strip()],
-                        # Also include raw skills fields from model if present
-                        'skills': getattr(obj, 'skills', '') or '',
-                        'preferred_skills': getattr(obj, 'preferred_skills', '') or '',
-
-                        # Associations
-                        'posted_by_id': obj.posted_by_id,
-                        'posted_by': getattr(obj.posted_by, 'username', '') if getattr(obj, 'posted_by_id', None) else '',
-
-                        # Additional
-                        'additional_info': self._safe_normalize_additional_info(obj.additional_info),
-
-                        # Derived
-                        'remote_allowed': remote_allowed,
-                    }
+    def fetch_jobs_by_ids(self, job_ids: Iterable[Any]) -> Iterator[Dict]:
+        """Yield payloads for the given jobs from the primary database (Django mode only).
 
-                    # Try to include a user-friendly salary_display if available
-                    try:
-                        job_payload['salary_display'] = obj.salary_display
-                    except Exception:
-                        pass
+        Ids of jobs that no longer exist are skipped.
+        """
+        if self.db_type != 'django':
+            raise ValueError("Fetching jobs by id requires the django database type")
+        from apps.jobs.models import JobPosting  # type: ignore
+        from apps.core.db_routing import PRIMARY_ALIAS  # type: ignore
+        # Outbox entries are fresher than any replica, so always read the primary
+        rows = (
+            JobPosting.objects.using(PRIMARY_ALIAS)
+            .filter(id__in=list(job_ids))
+            .order_by('id')
+            .values(*self.DJANGO_FETCH_FIELDS)
+        )
+        for row in rows:
+            yield self._django_job_payload(row, JobPosting.format_salary)
+
+    def _django_jobs_queryset(self, since: Optional[datetime] = None):
+        """JobPosting rows changed since `since` (all rows without it), from the replica when configured."""
+        from apps.jobs.models import JobPosting  # type: ignore
+        from django.db.models import Q  # type: ignore
+        from apps.core.db_routing import PRIMARY_ALIAS, reads_alias  # type: ignore
+        alias = reads_alias()
+        qs = JobPosting.objects.using(alias)
+        if since and alias != PRIMARY_ALIAS:
+            # Widen the window so rows still replicating on the last run are not skipped
+            from django.conf import settings as dj_settings  # type: ignore
+            since = since - timedelta(seconds=getattr(dj_settings, 'DATABASE_REPLICA_MAX_LAG_SECONDS', 60))
+        if since:
+            qs = qs.filter(
+                Q(updated_at__gte=since) |
+                Q(scraped_at__gte=since) |
+                Q(date_posted__gte=since)
+            )
+        return qs
+
+    def fetch_job_ids(self, since: Optional[datetime] = None, chunk_size: Optional[int] = None) -> Iterator[List[int]]:
+        """Yield lists of up to `chunk_size` job ids, newest first (Django mode only).
+
+        Same selection as `fetch_jobs()`, for callers that hand chunks to other
+        workers, which load the payloads with `fetch_jobs_by_ids()`.
+        """
+        if self.db_type != 'django':
+            raise ValueError("Fetching job ids requires the django database type")
+        chunk_size = max(1, int(chunk_size or self.FETCH_CHUNK_SIZE))
+        ids = self._django_jobs_queryset(since).order_by('-id').values_list('id', flat=True)
+        last_id = None
+        while True:
+            page = ids if last_id is None else ids.filter(id__lt=last_id)
+            chunk = list(page[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1]
+            yield chunk
+
+    def fetch_jobs(self, limit: Optional[int] = None, since: Optional[datetime] = None,
+                   chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Yield job payload dicts from the database, newest first.
 
-                    jobs.append(job_payload)
+        Rows are read `chunk_size` at a time (keyset pages in Django mode, a
+        server-side cursor for direct PostgreSQL), so memory stays flat
+        regardless of table size.
+        """
+        if not self.connection:
+            raise ConnectionError("Database not connected")
+        chunk_size = max(1, int(chunk_size or self.FETCH_CHUNK_SIZE))
 
-                logging.info(f"Fetched {len(jobs)} jobs from Django ORM")
-                return jobs
+        # Django ORM branch
+        if self.db_type == 'django':
+            try:
+                from apps.jobs.models import JobPosting  # type: ignore
+                qs = self._django_jobs_queryset(since)
+                # Newest first by primary key (scraped_at is set on insert, so the order
+                # matches), one short keyset query per chunk: no cursor or snapshot is
+                # held open while the portals are being pushed to
+                rows = qs.order_by('-id').values(*self.DJANGO_FETCH_FIELDS)
+                remaining = int(limit) if limit else None
+                fetched = 0
+                last_id = None
+                while remaining is None or remaining > 0:
+                    page = rows if last_id is None else rows.filter(id__lt=last_id)
+                    size = chunk_size if remaining is None else min(chunk_size, remaining)
+                    batch = list(page[:size])
+                    if not batch:
+                        break
+                    last_id = batch[-1]['id']
+                    fetched += len(batch)
+                    if remaining is not None:
+                        remaining -= len(batch)
+                    for row in batch:
+                        yield self._django_job_payload(row, JobPosting.format_salary)
+                logging.info(f"Fetched {fetched} jobs from Django ORM")
+                return
             except Exception as exc:
                 logging.error(f"Failed to fetch via Django ORM: {exc}")
                 raise
@@ -467,35 +664,48 @@ class DatabaseConnector:
             query += f" LIMIT {placeholder}"
             params.append(limit)
         
-        cursor = self.connection.cursor()
+        if self.db_type == 'postgresql':
+            # Named cursor: rows stay on the server until fetched
+            cursor = self.connection.cursor(name='job_sync_fetch')
+            cursor.itersize = chunk_size
+        else:
+            cursor = self.connection.cursor()
         cursor.execute(query, params)
-        
-        jobs = []
-        for row in cursor.fetchall():
-            # Convert row to dict (handling different DB types)
-            if isinstance(row, sqlite3.Row):  # sqlite Row
-                job_dict = dict(row)
-            else:  # mysql/postgresql
-                job_dict = dict(zip([desc[0] for desc in cursor.description], row))
-            
-            # Normalize skills from tags text or JSON string
-            if isinstance(job_dict.get('skills'), str):
-                raw = job_dict['skills']
-                try:
-                    parsed = json.loads(raw)
-                    job_dict['skills'] = parsed if isinstance(parsed, list) else [str(parsed)]
-                except Exception:
-                    job_dict['skills'] = [t.strip() for t in raw.split(',') if t.strip()] if raw else []
 
-            # Ensure posted_date is ISO string for JSON serialization
-            if isinstance(job_dict.get('posted_date'), datetime):
-                job_dict['posted_date'] = job_dict['posted_date'].isoformat()
-            
-            jobs.append(job_dict)
-        
-        cursor.close()
-        logging.info(f"Fetched {len(jobs)} jobs from database")
-        return jobs
+        fetched = 0
+        columns: Optional[List[str]] = None
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    # Convert row to dict (handling different DB types)
+                    if isinstance(row, sqlite3.Row):  # sqlite Row
+                        job_dict = dict(row)
+                    else:  # mysql/postgresql
+                        if columns is None:
+                            columns = [desc[0] for desc in cursor.description]
+                        job_dict = dict(zip(columns, row))
+
+                    # Normalize skills from tags text or JSON string
+                    if isinstance(job_dict.get('skills'), str):
+                        raw = job_dict['skills']
+                        try:
+                            parsed = json.loads(raw)
+                            job_dict['skills'] = parsed if isinstance(parsed, list) else [str(parsed)]
+                        except Exception:
+                            job_dict['skills'] = [t.strip() for t in raw.split(',') if t.strip()] if raw else []
+
+                    # Ensure posted_date is ISO string for JSON serialization
+                    if isinstance(job_dict.get('posted_date'), datetime):
+                        job_dict['posted_date'] = job_dict['posted_date'].isoformat()
+
+                    fetched += 1
+                    yield job_dict
+        finally:
+            cursor.close()
+        logging.info(f"Fetched {fetched} jobs from database")
     
     def close(self):
         """Close database connection."""
@@ -509,12 +719,144 @@ class DatabaseConnector:
             except Exception:
                 pass
 
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursting up to `capacity`.
+
+    `capacity` is at least 1, or a single request could never be afforded.
+    With a `shared_name`, and Django configured with Redis locks
+    (LOCK_REDIS_URL), the tokens live in Redis and the rate holds across all
+    processes, e.g. every Celery worker pushing chunks of the same portal;
+    otherwise the bucket is per process.
+    """
+
+    _UNRESOLVED = object()
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, shared_name: Optional[str] = None):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity or self.rate))
+        self.shared_name = shared_name
+        self._shared: Any = self._UNRESOLVED if shared_name else None
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, shared_name: Optional[str] = None) -> Optional['TokenBucket']:
+        """Build from a portal's `rate_limit` (requests/second) and optional `rate_limit_burst`."""
+        try:
+            rate = float(config.get('rate_limit') or 0)
+        except (TypeError, ValueError):
+            rate = 0
+        if rate <= 0:
+            return None
+        try:
+            burst = float(config.get('rate_limit_burst') or 0)
+        except (TypeError, ValueError):
+            burst = 0
+        return cls(rate, burst or None, shared_name)
+
+    def _shared_bucket(self) -> Any:
+        """The Redis-backed bucket, resolved on first use (Django may be set up after the adapters)."""
+        if self._shared is self._UNRESOLVED:
+            self._shared = None
+            try:
+                from django.conf import settings as dj_settings  # type: ignore
+                if dj_settings.configured:
+                    from apps.core.locks import SharedTokenBucket  # type: ignore
+                    bucket = SharedTokenBucket(self.shared_name, self.rate, self.capacity)
+                    self._shared = bucket if bucket.available() else None
+            except Exception as exc:
+                logging.warning(f"Shared rate limit {self.shared_name} unavailable ({exc}); limiting per process")
+        return self._shared
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available; return the seconds spent waiting."""
+        waited = 0.0
+        shared = self._shared_bucket() if self.shared_name else None
+        while shared is not None:
+            try:
+                delay = shared.reserve(tokens)
+            except Exception as exc:
+                logging.warning(f"Shared rate limit {self.shared_name} failed ({exc}); limiting per process")
+                break
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def job_key(job: Dict[str, Any]) -> str:
+    """Stable id of a sync payload, as used in logs and the delivery ledger."""
+    return str(job.get('id') or job.get('job_id') or '')
+
+
+@dataclass
+class PushOutcome:
+    """Result of pushing one job to one portal.
+
+    `skipped` outcomes were not sent: the payload's `fingerprint` matched the
+    portal's last successful delivery.
+    """
+    job: Dict[str, Any]
+    payload: Optional[Dict[str, Any]]
+    success: bool
+    info: Optional[Dict]
+    transform_error: bool = False
+    skipped: bool = False
+    fingerprint: Optional[str] = None
+
+
 class JobPortalAdapter:
-    """Base class for job portal adapters."""
-    
+    """Base class for job portal adapters.
+
+    Pushes run on up to `concurrency` threads (config, default 4) sharing one
+    pooled session, and every HTTP request takes a token from the portal's
+    `rate_limit` bucket.
+
+    Portals that declare `batch_endpoint_path` receive `batch_size` jobs per
+    request as a JSON array (gzip-compressed when `batch_gzip` is set). The
+    response is a list, or {"results": [...]}, with one entry per job, in
+    order or carrying an `index`; an entry fails when it has `success: false`,
+    a non-2xx `status`/`status_code`, or an `error`. Failed items are retried
+    one by one through `push_job`.
+
+    Given the `delivered` {job_id: fingerprint} map of a portal's ledger,
+    `push_many` skips jobs whose transformed payload fingerprint is unchanged.
+
+    With `encryption_mode: envelope`, batches go out as one encrypted
+    EnvelopeCodec envelope (to `envelope.endpoint_path`, else the batch
+    endpoint) instead of per-job encrypted payloads; see `negotiate_envelope`.
+    """
+
+    DEFAULT_CONCURRENCY = 4
+    REQUEST_TIMEOUT = 30
+    # A batch request that fails as a whole is resent once, after Retry-After (capped)
+    BATCH_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    BATCH_RETRY_DEFAULT_DELAY = 1.0
+    BATCH_RETRY_MAX_DELAY = 60.0
+    # Payload keys that change between runs without the job changing
+    FINGERPRINT_EXCLUDED_KEYS = frozenset({'system_info'})
+
     def __init__(self, name: str, config: Dict):
         self.name = name
         self.config = config
+        try:
+            self.concurrency = max(1, int(config.get('concurrency') or self.DEFAULT_CONCURRENCY))
+        except (TypeError, ValueError):
+            self.concurrency = self.DEFAULT_CONCURRENCY
+        self.rate_limiter = TokenBucket.from_config(config, shared_name=f"jobsync:portal:{name}")
+        self.envelope: Optional[EnvelopeCodec] = None
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
@@ -527,7 +869,12 @@ class JobPortalAdapter:
             status_forcelist=[429, 500, 502, 503, 504]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # One pooled connection per worker thread
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.concurrency,
+            pool_maxsize=self.concurrency,
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -564,17 +911,277 @@ class JobPortalAdapter:
     def push_job(self, job_data: Dict) -> Tuple[bool, Optional[Dict]]:
         """Push single job to portal. Override in subclasses."""
         raise NotImplementedError
-    
-    def push_jobs_batch(self, jobs: List[Dict]) -> List[Tuple[bool, Optional[Dict]]]:
-        """Push multiple jobs to portal."""
-        results = []
-        for job in jobs:
-            transformed_job = self.transform_job_data(job)
-            result = self.push_job(transformed_job)
-            results.append(result)
-            time.sleep(0.1)  # Small delay between requests
+
+    def fingerprint(self, payload: Dict) -> str:
+        """SHA-256 of a transformed (not yet encrypted) payload, for the delivery ledger."""
+        data = {key: value for key, value in payload.items() if key not in self.FINGERPRINT_EXCLUDED_KEYS}
+        encoded = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _post(self, url: str, payload: Any, compress: bool = False) -> requests.Response:
+        """POST JSON through the pooled session once the rate limiter allows it."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if not compress:
+            return self.session.post(url, json=payload, timeout=self.REQUEST_TIMEOUT)
+        body = gzip.compress(json.dumps(payload).encode('utf-8'), compresslevel=5)
+        return self.session.post(
+            url, data=body, headers={'Content-Encoding': 'gzip'}, timeout=self.REQUEST_TIMEOUT
+        )
+
+    def _url(self, path_key: str = 'endpoint_path') -> str:
+        return self._url_for(self.config.get(path_key))
+
+    def _url_for(self, path: Optional[str]) -> str:
+        base = f"{self.config['base_url']}".rstrip('/')
+        return f"{base}{path}" if path else base
+
+    def supports_batch(self) -> bool:
+        """Whether this portal declares a batch (or envelope) endpoint."""
+        return bool(self.config.get('batch_endpoint_path')) or self.envelope is not None
+
+    def uses_envelope(self) -> bool:
+        """Whether batches are sent as encrypted envelopes (jobs are then not encrypted one by one)."""
+        return self.envelope is not None and self.supports_batch()
+
+    @staticmethod
+    def _preference(value: Any, default: Tuple[str, ...]) -> List[str]:
+        if isinstance(value, str):
+            return [value]
+        return [str(v) for v in value] if isinstance(value, (list, tuple)) else list(default)
+
+    def negotiate_envelope(self, encryptor: DataEncryption) -> Optional[EnvelopeCodec]:
+        """Pick the envelope compression and transport for this portal.
+
+        Preferences come from the portal's `envelope` config (`compression`,
+        `transport`: a name or an ordered list; defaults zstd > gzip > none
+        and binary > base64). With `envelope.capabilities_path`, the receiver
+        is asked first (GET, answering {"envelope": {"compression": [...],
+        "transport": [...]}}) and the first mutually supported option wins.
+        Without a usable result the portal keeps per-job encryption.
+        """
+        options = self.config.get('envelope') if isinstance(self.config.get('envelope'), dict) else {}
+        if not (options.get('endpoint_path') or self.config.get('batch_endpoint_path')):
+            logging.warning(f"{self.name}: envelope mode needs a batch or envelope endpoint; using per-job encryption")
+            return None
+        compressions = [c for c in self._preference(options.get('compression'), EnvelopeCodec.COMPRESSIONS)
+                        if c in EnvelopeCodec.available_compressions()]
+        transports = [t for t in self._preference(options.get('transport'), EnvelopeCodec.TRANSPORTS)
+                      if t in EnvelopeCodec.TRANSPORTS]
+        if options.get('capabilities_path'):
+            try:
+                response = self.session.get(self._url_for(options['capabilities_path']), timeout=self.REQUEST_TIMEOUT)
+                response.raise_for_status()
+                offered = (response.json() or {}).get('envelope') or {}
+                compressions = [c for c in compressions if c in (offered.get('compression') or [])]
+                transports = [t for t in transports if t in (offered.get('transport') or [])]
+            except Exception as exc:
+                logging.warning(f"{self.name}: envelope negotiation failed ({exc}); using per-job encryption")
+                return None
+        if not (compressions and transports):
+            logging.warning(f"{self.name}: no common envelope format; using per-job encryption")
+            return None
+        try:
+            self.envelope = EnvelopeCodec(encryptor, compressions[0], transports[0])
+        except Exception as exc:
+            logging.warning(f"{self.name}: envelope unavailable ({exc}); using per-job encryption")
+            return None
+        logging.info(f"{self.name}: sending {compressions[0]} envelopes as {transports[0]}")
+        return self.envelope
+
+    def batch_size(self, default: int = 25) -> int:
+        try:
+            return max(1, int(self.config.get('batch_size') or default))
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def _item_succeeded(item: Any) -> bool:
+        if not isinstance(item, dict):
+            return bool(item)
+        if 'success' in item:
+            return bool(item['success'])
+        for key in ('status_code', 'status'):
+            code = item.get(key)
+            if isinstance(code, int):
+                return 200 <= code < 300
+        return not item.get('error')
+
+    def _parse_batch_response(self, response: requests.Response, count: int) -> List[Tuple[bool, Optional[Dict]]]:
+        """Map a batch response to one (success, info) per submitted item."""
+        status_code = response.status_code
+        if not 200 <= status_code < 300:
+            info = {'status_code': status_code, 'text': response.text[:500]}
+            return [(False, info)] * count
+        try:
+            data = response.json() if response.content else None
+        except ValueError:
+            data = None
+        items = data.get('results') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            # 2xx without per-item results: the whole batch was accepted
+            return [(True, {'status_code': status_code})] * count
+
+        results: List[Tuple[bool, Optional[Dict]]] = [
+            (False, {'status_code': status_code, 'error': 'missing from batch response'})
+        ] * count
+        for position, item in enumerate(items):
+            index = item.get('index', position) if isinstance(item, dict) else position
+            if isinstance(index, int) and 0 <= index < count:
+                results[index] = (self._item_succeeded(item), {'status_code': status_code, 'response': item})
         return results
 
+    def _post_envelope(self, jobs_data: List[Dict]) -> requests.Response:
+        """POST one encrypted envelope through the pooled session once the rate limiter allows it."""
+        options = self.config.get('envelope') if isinstance(self.config.get('envelope'), dict) else {}
+        url = self._url_for(options.get('endpoint_path') or self.config.get('batch_endpoint_path'))
+        body, headers = self.envelope.encode(jobs_data)  # type: ignore[union-attr]
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        return self.session.post(url, data=body, headers=headers, timeout=self.REQUEST_TIMEOUT)
+
+    def _retry_after(self, response: Optional[requests.Response]) -> float:
+        """Seconds to wait before resending a failed batch: Retry-After (seconds or HTTP date), capped."""
+        value = response.headers.get('Retry-After') if response is not None else None
+        delay = self.BATCH_RETRY_DEFAULT_DELAY
+        if value:
+            try:
+                delay = float(value)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(value) - datetime.now(dt_timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        return min(max(0.0, delay), self.BATCH_RETRY_MAX_DELAY)
+
+    def push_batch(self, jobs_data: List[Dict]) -> List[Tuple[bool, Optional[Dict]]]:
+        """Push already transformed jobs in one request to the batch endpoint.
+
+        A request that fails as a whole (connection error, timeout, 429 or
+        5xx) is sent once more after the response's Retry-After. If it still
+        fails, every item gets the same info flagged `batch_failed`, so callers
+        do not retry the items one by one against a portal that is down.
+        """
+        for attempt in range(2):
+            response = None
+            try:
+                if self.uses_envelope():
+                    response = self._post_envelope(jobs_data)
+                else:
+                    response = self._post(
+                        self._url('batch_endpoint_path'), jobs_data, compress=bool(self.config.get('batch_gzip'))
+                    )
+                if 200 <= response.status_code < 300:
+                    return self._parse_batch_response(response, len(jobs_data))
+                info = {'status_code': response.status_code, 'text': response.text[:500]}
+                retryable = response.status_code in self.BATCH_RETRY_STATUSES
+            except Exception as e:
+                info, retryable = {'error': str(e)}, True
+            if not retryable or attempt:
+                break
+            delay = self._retry_after(response)
+            logging.warning(f"Batch push to {self.name} failed ({info}); retrying once in {delay:.1f}s")
+            time.sleep(delay)
+        logging.error(f"Batch push to {self.name} failed: {info}")
+        return [(False, {**info, 'batch_failed': True})] * len(jobs_data)
+
+    def _prepare_one(self, job: Dict, prepare: Optional[Callable[[Dict], Dict]] = None,
+                     delivered: Optional[Dict[str, str]] = None) -> Any:
+        """Transform and `prepare` one job: (payload, fingerprint), or a final PushOutcome.
+
+        Fingerprints are only computed when a `delivered` map is given; a job
+        whose fingerprint it already holds comes back as a skipped outcome.
+        """
+        try:
+            payload = self.transform_job_data(job)
+            fingerprint = self.fingerprint(payload) if delivered is not None else None
+            if fingerprint is not None and delivered.get(job_key(job)) == fingerprint:
+                return PushOutcome(job, None, True, None, skipped=True, fingerprint=fingerprint)
+            if prepare:
+                payload = prepare(payload)
+        except Exception as exc:
+            return PushOutcome(job, None, False, {'error': str(exc)}, transform_error=True)
+        return payload, fingerprint
+
+    def _push_one(self, job: Dict, prepare: Optional[Callable[[Dict], Dict]] = None,
+                  delivered: Optional[Dict[str, str]] = None) -> PushOutcome:
+        prepared = self._prepare_one(job, prepare, delivered)
+        if isinstance(prepared, PushOutcome):
+            return prepared
+        payload, fingerprint = prepared
+        success, info = self.push_job(payload)
+        return PushOutcome(job, payload, success, info, fingerprint=fingerprint)
+
+    def _push_batch_outcomes(self, jobs: List[Dict], prepare: Optional[Callable[[Dict], Dict]] = None,
+                             delivered: Optional[Dict[str, str]] = None) -> List[PushOutcome]:
+        """Push one batch; outcomes are in input order."""
+        outcomes: List[Optional[PushOutcome]] = [None] * len(jobs)
+        pending: List[Tuple[int, Dict, Optional[str]]] = []
+        for position, job in enumerate(jobs):
+            prepared = self._prepare_one(job, prepare, delivered)
+            if isinstance(prepared, PushOutcome):
+                outcomes[position] = prepared
+            else:
+                pending.append((position, *prepared))
+
+        if pending:
+            results = self.push_batch([payload for _, payload, _ in pending])
+            for (position, payload, fingerprint), (success, info) in zip(pending, results):
+                if not success and not (info or {}).get('batch_failed'):
+                    # Retry items the portal rejected individually (still enveloped in envelope mode)
+                    success, info = self.push_batch([payload])[0] if self.uses_envelope() else self.push_job(payload)
+                outcomes[position] = PushOutcome(jobs[position], payload, success, info, fingerprint=fingerprint)
+        return outcomes  # type: ignore[return-value]
+
+    def _iter_batches(self, jobs: Iterable[Dict]) -> Iterator[List[Dict]]:
+        size = self.batch_size()
+        batch: List[Dict] = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def push_many(self, jobs: Iterable[Dict], prepare: Optional[Callable[[Dict], Dict]] = None,
+                  delivered: Optional[Dict[str, str]] = None) -> Iterator[PushOutcome]:
+        """Transform, `prepare` and push jobs concurrently, yielding outcomes as they complete.
+
+        At most `concurrency` requests are in flight and about twice that many
+        jobs (or batches) are held, so `jobs` may be a lazy iterable of any length.
+        Jobs already `delivered` with the same fingerprint are skipped, not sent.
+        """
+        if self.supports_batch():
+            units: Iterable[Any] = self._iter_batches(jobs)
+            work: Callable[..., Any] = self._push_batch_outcomes
+        else:
+            units, work = jobs, self._push_one
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"push-{self.name}") as pool:
+            pending = set()
+            for unit in units:
+                pending.add(pool.submit(work, unit, prepare, delivered))
+                if len(pending) >= self.concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from self._as_outcomes(future.result())
+            for future in as_completed(pending):
+                yield from self._as_outcomes(future.result())
+
+    @staticmethod
+    def _as_outcomes(result) -> List[PushOutcome]:
+        return result if isinstance(result, list) else [result]
+
+    def push_jobs_batch(self, jobs: List[Dict]) -> List[Tuple[bool, Optional[Dict]]]:
+        """Push multiple jobs to portal concurrently; results are in input order."""
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"push-{self.name}") as pool:
+            if self.supports_batch():
+                batches = pool.map(self._push_batch_outcomes, self._iter_batches(jobs))
+                outcomes = [outcome for batch in batches for outcome in batch]
+            else:
+                outcomes = list(pool.map(self._push_one, jobs))
+        return [(outcome.success, outcome.info) for outcome in outcomes]
+
 class EvolJobsAdapter(JobPortalAdapter):
     """Adapter for evoljobs.com portal."""
     
@@ -601,7 +1208,7 @@ class EvolJobsAdapter(JobPortalAdapter):
         """Push job to EvolJobs."""
         try:
             url = f"{self.config['base_url']}"
-            response = self.session.post(url, json=job_data, timeout=30)
+            response = self._post(url, job_data)
             response.raise_for_status()
             
             return True, response.json() if response.content else None
@@ -637,7 +1244,7 @@ class FlyoverseasAdapter(JobPortalAdapter):
             base = f"{self.config['base_url']}".rstrip('/')
             endpoint_path = self.config.get('endpoint_path')
             url = f"{base}{endpoint_path}" if endpoint_path else base
-            response = self.session.post(url, json=job_data, timeout=30)
+            response = self._post(url, job_data)
             # Accept any 2xx as success
             if 200 <= response.status_code < 300:
                 try:
@@ -652,7 +1259,16 @@ class FlyoverseasAdapter(JobPortalAdapter):
 
 class LocalPortalAdapter(JobPortalAdapter):
     """Adapter for local LAN job portal."""
-    
+
+    # Serializes appends in `write_to` mode across push threads
+    _write_lock = threading.Lock()
+
+    def supports_batch(self) -> bool:
+        # File-output and dry-run modes never hit the batch endpoint
+        if self.config.get('write_to') or self.config.get('dry_run'):
+            return False
+        return super().supports_batch()
+
     def transform_job_data(self, job_data: Dict) -> Dict:
         """Transform data for local portal format."""
         transformed: Dict[str, Any] = dict(job_data)
@@ -750,9 +1366,9 @@ class LocalPortalAdapter(JobPortalAdapter):
                     directory = os.path.dirname(write_to)
                     if directory:
                         os.makedirs(directory, exist_ok=True)
-                    with open(write_to, 'a', encoding='utf-8') as f:
-                        json.dump(job_data, f, ensure_ascii=False)
-                        f.write('\n')
+                    line = json.dumps(job_data, ensure_ascii=False) + '\n'
+                    with self._write_lock, open(write_to, 'a', encoding='utf-8') as f:
+                        f.write(line)
                     return True, {'written_to': write_to}
                 except Exception as exc:
                     logging.error(f"File write failed: {exc}")
@@ -770,7 +1386,7 @@ class LocalPortalAdapter(JobPortalAdapter):
             base = f"{self.config['base_url']}".rstrip('/')
             endpoint_path = self.config.get('endpoint_path')
             url = f"{base}{endpoint_path}" if endpoint_path else base
-            response = self.session.post(url, json=job_data, timeout=30)
+            response = self._post(url, job_data)
             # Treat any 2xx as success regardless of response body format
             if 200 <= response.status_code < 300:
                 resp_payload: Optional[Dict] = None
@@ -796,11 +1412,186 @@ class LocalPortalAdapter(JobPortalAdapter):
             logging.error(f"Failed to push job to Local Portal: {e}")
             return False, {'error': str(e)}
 
+@dataclass
+class PortalSyncStats:
+    """Per-portal push counts across the chunks of one sync run.
+
+    `oldest_failed` is the earliest `updated_at` among jobs whose push failed;
+    the portal's high-water mark cannot move past it. `hold` is set when a
+    failed job had no usable `updated_at`, which keeps the mark where it is.
+    `failed_jobs` maps failed job ids to a short error.
+    """
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+    oldest_failed: Optional[datetime] = None
+    hold: bool = False
+    failed_jobs: Dict[str, str] = field(default_factory=dict)
+
+    def add_failure(self, job: Dict[str, Any], error: Any = None, hold_mark: bool = True):
+        self.failed += 1
+        self.failed_jobs[job_key(job)] = str(error or 'push failed')[:300]
+        if not hold_mark:
+            return
+        try:
+            updated_at = datetime.fromisoformat(str(job.get('updated_at')))
+        except (TypeError, ValueError):
+            self.hold = True
+            return
+        if self.oldest_failed is None or updated_at < self.oldest_failed:
+            self.oldest_failed = updated_at
+
+    def merge(self, other: 'PortalSyncStats'):
+        self.success += other.success
+        self.failed += other.failed
+        self.skipped += other.skipped
+        self.hold = self.hold or other.hold
+        self.failed_jobs.update(other.failed_jobs)
+        if other.oldest_failed is not None and (self.oldest_failed is None or other.oldest_failed < self.oldest_failed):
+            self.oldest_failed = other.oldest_failed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form for Celery results (without `failed_jobs`)."""
+        return {
+            'success': self.success,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'oldest_failed': self.oldest_failed.isoformat() if self.oldest_failed else None,
+            'hold': self.hold,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PortalSyncStats':
+        oldest_failed = data.get('oldest_failed')
+        return cls(
+            success=int(data.get('success') or 0),
+            failed=int(data.get('failed') or 0),
+            skipped=int(data.get('skipped') or 0),
+            oldest_failed=datetime.fromisoformat(oldest_failed) if oldest_failed else None,
+            hold=bool(data.get('hold')),
+        )
+
+
+class SyncResultLog:
+    """Buffered, sampled writer of JobSyncJobResult rows for one portal.
+
+    Configured by `sync.result_logging`:
+    - `success_sample_rate` (default 0.1): share of successful pushes logged;
+      failures are always logged
+    - `payload_mode`: 'truncated' (default; strings cut to `max_field_chars`,
+      default 1000), 'full', 'hash' (sha256 and size only) or 'none'
+    - `flush_size` (default 500): rows per bulk insert
+
+    Request headers are only kept in 'full' and 'truncated' modes.
+    """
+
+    PAYLOAD_MODES = ('full', 'truncated', 'hash', 'none')
+    MAX_RESPONSE_CHARS = 2000
+    MAX_ERROR_CHARS = 1000
+
+    def __init__(self, model, run_row, portal_result_row, config: Optional[Dict],
+                 request_url: str = '', request_headers: Optional[Dict] = None):
+        config = config or {}
+        self.model = model
+        self.run_row = run_row
+        self.portal_result_row = portal_result_row
+        self.request_url = request_url
+        self.success_sample_rate = float(config.get('success_sample_rate', 0.1))
+        self.payload_mode = config.get('payload_mode') or 'truncated'
+        if self.payload_mode not in self.PAYLOAD_MODES:
+            raise ValueError(f"Unknown result_logging.payload_mode '{self.payload_mode}'")
+        self.max_field_chars = max(1, int(config.get('max_field_chars') or 1000))
+        self.flush_size = max(1, int(config.get('flush_size') or 500))
+        self.request_headers = (request_headers or {}) if self.payload_mode in ('full', 'truncated') else {}
+        self._rng = random.Random()
+        self._rows: List[Any] = []
+
+    def _truncate(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return value if len(value) <= self.max_field_chars else value[:self.max_field_chars] + '...'
+        if isinstance(value, dict):
+            return {key: self._truncate(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._truncate(item) for item in value]
+        return value
+
+    def _payload(self, payload: Any) -> Any:
+        if payload is None or self.payload_mode == 'none':
+            return {}
+        if self.payload_mode == 'full':
+            return payload
+        if self.payload_mode == 'truncated':
+            return self._truncate(payload)
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return {'sha256': hashlib.sha256(encoded).hexdigest(), 'bytes': len(encoded)}
+
+    def add(self, job_id: str, payload: Any, success: bool, info: Optional[Dict], transform_error: bool = False):
+        """Buffer a result row if it is sampled; flushes when the buffer is full."""
+        if not self.model:
+            return
+        if success and self._rng.random() >= self.success_sample_rate:
+            return
+        response_status = None
+        response_body = ''
+        request_url = self.request_url
+        request_headers = self.request_headers
+        if transform_error:
+            response_body = 'transform_error'
+        elif isinstance(info, dict):
+            response_status = info.get('status_code')
+            request_url = info.get('url') or request_url
+            # Prefer headers from info if provided
+            if request_headers and isinstance(info.get('headers'), dict):
+                request_headers = info['headers']
+            # Truncate/serialize response body
+            if 'response' in info:
+                try:
+                    response_body = json.dumps(info['response'])
+                except Exception:
+                    response_body = str(info['response'])
+            elif 'response_text' in info:
+                response_body = str(info['response_text'])
+            elif 'text' in info:
+                response_body = str(info['text'])
+        if transform_error:
+            error = str((info or {}).get('error', ''))
+        else:
+            error = '' if success else (str(info) if info else '')
+        self._rows.append(self.model(
+            run=self.run_row,
+            portal_result=self.portal_result_row,
+            job_id=job_id,
+            request_url=request_url,
+            request_headers=request_headers,
+            request_payload=self._payload(payload),
+            response_status=response_status,
+            response_body=response_body[:self.MAX_RESPONSE_CHARS],
+            was_success=bool(success),
+            error=error[:self.MAX_ERROR_CHARS],
+        ))
+        if len(self._rows) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows with one bulk insert; logging failures never fail the sync."""
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        try:
+            self.model.objects.bulk_create(rows, batch_size=self.flush_size)
+        except Exception as exc:
+            logging.warning(f"Could not write {len(rows)} sync result rows: {exc}")
+
+
 class JobDataSynchronizer:
     """Main class to orchestrate job data synchronization."""
+
+    # High-water marks trail the fetch start by this much, so jobs saved by
+    # transactions that had not committed when the fetch ran are fetched again
+    HIGH_WATER_MARK_MARGIN = timedelta(minutes=1)
     
-    def __init__(self, config_file: Optional[str] = None):
-        self.setup_logging()
+    def __init__(self, config_file: Optional[str] = None, log_file: Optional[str] = 'job_sync.log'):
+        self.setup_logging(log_file)
         self.load_config(config_file)
         self.db_connector = DatabaseConnector(self.config['database'])
         self.portals = self._initialize_portals()
@@ -812,6 +1603,9 @@ class JobDataSynchronizer:
         self.encryptor = DataEncryption(encryption_key)
         if self.encryptor.is_enabled():
             self.logger.info("Data encryption enabled")
+            for portal_adapter in self.portals.values():
+                if portal_adapter.config.get('encryption_mode') == 'envelope':
+                    portal_adapter.negotiate_envelope(self.encryptor)
         else:
             self.logger.info("Data encryption disabled (not configured or library missing)")
         
@@ -833,15 +1627,51 @@ class JobDataSynchronizer:
             # Fallback to now
             return datetime.utcnow().isoformat() + 'Z'
 
+    AVATAR_URLS = tuple(
+        f"https://cdn.jsdelivr.net/gh/faker-js/assets-person-portrait/male/512/{idx}.jpg" for idx in range(1, 21)
+    )
+    # First characters of a string json.loads() could parse; anything else is a plain comma list
+    JSON_START = frozenset('[{"-0123456789tfn')
+
     def _pick_avatar(self, seed: str) -> str:
         """Pick a deterministic placeholder avatar URL based on a seed string."""
         try:
             seed_text = seed or 'default'
             h = hashlib.md5(seed_text.encode('utf-8')).hexdigest()
-            idx = int(h, 16) % 20 + 1  # 1..20
-            return f"https://cdn.jsdelivr.net/gh/faker-js/assets-person-portrait/male/512/{idx}.jpg"
+            return self.AVATAR_URLS[int(h, 16) % len(self.AVATAR_URLS)]
         except Exception:
-            return "https://cdn.jsdelivr.net/gh/faker-js/assets-person-portrait/male/512/1.jpg"
+            return self.AVATAR_URLS[0]
+
+    @classmethod
+    def _skill_list(cls, value: Any) -> List[Any]:
+        """`skills` as a list: lists as-is, JSON strings parsed (scalars wrapped), else split on commas."""
+        if isinstance(value, list):
+            return value
+        if not isinstance(value, str):
+            return []
+        if value.lstrip()[:1] in cls.JSON_START:
+            try:
+                parsed = json.loads(value)
+                return parsed if isinstance(parsed, list) else [str(parsed)]
+            except Exception:
+                pass
+        return [t.strip() for t in value.split(',') if t.strip()]
+
+    @classmethod
+    def _preferred_skill_list(cls, value: Any) -> List[Any]:
+        """`preferred_skills` as a list, parsed the way LocalPortalAdapter does (non-list JSON is split)."""
+        if isinstance(value, list):
+            return value
+        if not isinstance(value, str):
+            return []
+        if value.lstrip()[:1] in cls.JSON_START:
+            try:
+                parsed = json.loads(value)
+                if isinstance(parsed, list):
+                    return parsed
+            except Exception:
+                pass
+        return [token.strip() for token in value.split(',') if token.strip()]
 
     def _aware_now(self) -> datetime:
         """Return timezone-aware now() when Django timezone is available, else UTC now()."""
@@ -851,7 +1681,20 @@ class JobDataSynchronizer:
         except Exception:
             return datetime.utcnow()
 
-    def _normalize_job_payload(self, job: Dict[str, Any]) -> Dict[str, Any]:
+    def normalize_jobs(self, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize a chunk of jobs once for all portals (see `_normalize_job_payload`).
+
+        The system info snapshot and the fallback timestamp are computed once
+        per chunk and shared by every job. The returned dicts are handed to
+        each portal's `transform_job_data` as-is, so transforms must copy
+        rather than mutate them.
+        """
+        system_info = dict(self.system_info)
+        now_iso = datetime.utcnow().isoformat() + 'Z'
+        return [self._normalize_job_payload(job, system_info, now_iso) for job in jobs]
+
+    def _normalize_job_payload(self, job: Dict[str, Any], system_info: Optional[Dict[str, str]] = None,
+                               now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Ensure required fields exist with sensible defaults for downstream portals."""
         normalized: Dict[str, Any] = dict(job)  # shallow copy
 
@@ -868,7 +1711,7 @@ class JobDataSynchronizer:
             or None
         )
         if created_src is None:
-            normalized['createdAt'] = datetime.utcnow().isoformat() + 'Z'
+            normalized['createdAt'] = now_iso or datetime.utcnow().isoformat() + 'Z'
         else:
             normalized['createdAt'] = self._ensure_iso_z(created_src)
 
@@ -903,18 +1746,10 @@ class JobDataSynchronizer:
         if normalized.get('experience_level') is None:
             normalized['experience_level'] = ''
 
-        # Skills normalization
-        skills_value = normalized.get('skills')
-        if isinstance(skills_value, list):
-            normalized['skills'] = skills_value
-        elif isinstance(skills_value, str):
-            try:
-                parsed = json.loads(skills_value)
-                normalized['skills'] = parsed if isinstance(parsed, list) else [str(parsed)]
-            except Exception:
-                normalized['skills'] = [t.strip() for t in skills_value.split(',') if t.strip()] if skills_value else []
-        else:
-            normalized['skills'] = []
+        # Skill lists, parsed here once instead of in every portal's transform
+        normalized['skills'] = self._skill_list(normalized.get('skills'))
+        if 'preferred_skills' in normalized:
+            normalized['preferred_skills'] = self._preferred_skill_list(normalized['preferred_skills'])
 
         # URL defaults
         if not normalized.get('application_url'):
@@ -929,8 +1764,8 @@ class JobDataSynchronizer:
         # Remote flag default
         normalized['remote_allowed'] = bool(normalized.get('remote_allowed', False))
         
-        # Add system identification info
-        normalized['system_info'] = self.system_info.copy()
+        # Add system identification info (one shared snapshot per normalized chunk)
+        normalized['system_info'] = system_info if system_info is not None else self.system_info.copy()
 
         return normalized
 
@@ -941,7 +1776,6 @@ class JobDataSynchronizer:
             encrypted_data = self.encryptor.encrypt_data(job_payload)
             if encrypted_data:
                 # Ensure proper Base64 encoding for transmission
-                import base64
                 if isinstance(encrypted_data, bytes):
                     # Double-encode: Fernet already returns Base64, but we need to ensure clean transmission
                     base64_data = base64.b64encode(encrypted_data).decode('utf-8')
@@ -1035,16 +1869,16 @@ class JobDataSynchronizer:
         except Exception as e:
             return {'verified': False, 'reason': f'verification_error: {str(e)}'}
 
-    def setup_logging(self):
-        """Setup logging configuration."""
+    def setup_logging(self, log_file: Optional[str] = 'job_sync.log'):
+        """Setup logging configuration; `log_file=None` logs to stdout only."""
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        handlers = [logging.StreamHandler(sys.stdout)]
+        if log_file:
+            handlers.insert(0, logging.FileHandler(log_file))
         logging.basicConfig(
             level=logging.INFO,
             format=log_format,
-            handlers=[
-                logging.FileHandler('job_sync.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=handlers
         )
         self.logger = logging.getLogger(__name__)
     
@@ -1116,38 +1950,262 @@ class JobDataSynchronizer:
         self.logger.info(f"Initialized {len(portals)} portal adapters: {list(portals.keys())}")
         return portals
     
-    def sync_jobs(self, limit: Optional[int] = None, incremental: bool = True) -> Dict:
-        """Synchronize jobs from database to all portals."""
-        start_time = datetime.now()
-        
+    def _portal_target_url(self, portal_adapter: JobPortalAdapter) -> Optional[str]:
+        """Compute the portal's target URL for logging, if possible."""
+        try:
+            base = f"{portal_adapter.config.get('base_url','')}".rstrip('/')
+            endpoint_path = portal_adapter.config.get('endpoint_path')
+            return f"{base}{endpoint_path}" if endpoint_path else (base or None)
+        except Exception:
+            return None
+
+    def _close_thread_db(self):
+        """Release the Django DB connection opened by a worker thread."""
+        if getattr(self.db_connector, 'db_type', '').lower() != 'django':
+            return
+        try:
+            from django.db import connection  # type: ignore
+            connection.close()
+        except Exception:
+            pass
+
+    def _create_portal_result(self, portal_name: str, portal_adapter: JobPortalAdapter, run_row, JobSyncPortalResult):
+        """Create the portal result aggregate row if models are available."""
+        if not (JobSyncPortalResult and run_row):
+            return None
+        try:
+            return JobSyncPortalResult.objects.create(  # type: ignore
+                run=run_row,
+                portal_name=str(portal_name),
+                target_url=str(self._portal_target_url(portal_adapter) or ''),
+                batch_size=int(self.config['sync']['batch_size'])
+            )
+        except Exception:
+            return None
+
+    def _lock_portals(self, portal_sync_lock, run_row,
+                      JobSyncPortalResult) -> Tuple[Dict[str, JobPortalAdapter], Dict[str, Tuple[Any, str]]]:
+        """Take each portal's sync lock (shared with the Celery sync tasks).
+
+        Returns (portals to sync, {portal_name: (lock, token)}). Portals another
+        run still holds are left out and get a `locked` result row.
+        """
+        portals: Dict[str, JobPortalAdapter] = {}
+        held: Dict[str, Tuple[Any, str]] = {}
+        for portal_name, portal_adapter in self.portals.items():
+            lock = portal_sync_lock(portal_name)
+            token = lock.acquire()
+            if token:
+                portals[portal_name] = portal_adapter
+                held[portal_name] = (lock, token)
+                continue
+            self.logger.info(f"Portal {portal_name} is still being synced by another run; skipping")
+            row = self._create_portal_result(portal_name, portal_adapter, run_row, JobSyncPortalResult)
+            if row:
+                try:
+                    row.status = 'locked'  # type: ignore
+                    row.error_message = 'An earlier sync run still holds this portal'  # type: ignore
+                    row.finished_at = self._aware_now()  # type: ignore
+                    row.save()  # type: ignore
+                except Exception:
+                    pass
+        return portals, held
+
+    def _sync_portal(self, portal_name: str, portal_adapter: JobPortalAdapter, jobs: List[Dict],
+                     run_row, portal_result_row, JobSyncJobResult, ledger=None,
+                     force: bool = False) -> PortalSyncStats:
+        """Push one chunk of `jobs` (from `normalize_jobs()`) to one portal and log the results.
+
+        Runs on its own thread; pushes are concurrent up to the adapter's
+        `concurrency` and paced by its `rate_limit` token bucket. With a
+        delivery `ledger`, jobs whose payload matches the portal's last
+        successful delivery are skipped (unless `force`), and successful
+        pushes are recorded once the chunk is done. Result rows are written
+        in bulk according to `sync.result_logging` (see SyncResultLog).
+        """
         try:
-            # Machine verification before proceeding
-            machine_check = self.verify_machine_authorization()
-            if not machine_check['authorized']:
+            self.logger.info(f"Syncing {len(jobs)} jobs to {portal_name}")
+            stats = PortalSyncStats()
+            target_url = self._portal_target_url(portal_adapter)
+
+            delivered: Optional[Dict[str, str]] = None
+            if ledger:
+                delivered = {} if force else ledger.delivered_hashes(portal_name, [job_key(job) for job in jobs])
+            delivered_now: Dict[str, str] = {}
+
+            # Apply encryption if enabled (optional, graceful fallback) after the
+            # portal transform. Envelope portals encrypt whole batches instead.
+            prepare = None if portal_adapter.uses_envelope() else self._prepare_payload_for_transmission
+            outcomes = portal_adapter.push_many(jobs, prepare=prepare, delivered=delivered)
+            result_log = SyncResultLog(
+                JobSyncJobResult if run_row and portal_result_row else None, run_row, portal_result_row,
+                self.config['sync'].get('result_logging'), str(target_url or ''),
+                dict(getattr(portal_adapter.session, 'headers', {})),
+            )
+            for outcome in outcomes:
+                job_payload, success, info = outcome.job, outcome.success, outcome.info
+                if outcome.skipped:
+                    stats.skipped += 1
+                    continue
+                if outcome.transform_error:
+                    # Deterministic for an unchanged job, so it does not hold back
+                    # the high-water mark; editing the job bumps its updated_at
+                    stats.add_failure(job_payload, (info or {}).get('error'), hold_mark=False)
+                    result_log.add(job_key(job_payload), job_payload, False, info, transform_error=True)
+                    continue
+                if success:
+                    stats.success += 1
+                    if outcome.fingerprint:
+                        delivered_now[job_key(job_payload)] = outcome.fingerprint
+                else:
+                    stats.add_failure(job_payload, info)
+                result_log.add(job_key(job_payload), outcome.payload, success, info)
+            result_log.flush()
+
+            if ledger and delivered_now:
+                try:
+                    ledger.record(portal_name, delivered_now)
+                except Exception as e:
+                    self.logger.warning(f"Could not record deliveries to {portal_name}: {e}")
+            return stats
+        finally:
+            self._close_thread_db()
+
+    def _advance_high_water_marks(self, ledger, portal_stats: Dict[str, PortalSyncStats], fetch_started: datetime):
+        """Move each portal's high-water mark up to the fetch start, or to its oldest failed job."""
+        mark = fetch_started - self.HIGH_WATER_MARK_MARGIN
+        for portal_name, stats in portal_stats.items():
+            if stats.hold:
+                self.logger.info(f"{portal_name}: high-water mark held back by failed pushes")
+                continue
+            portal_mark = min(mark, stats.oldest_failed) if stats.oldest_failed else mark
+            try:
+                ledger.advance(portal_name, portal_mark)
+            except Exception as e:
+                self.logger.warning(f"Could not advance high-water mark for {portal_name}: {e}")
+
+    def _incremental_since(self, ledger, portal_names: Optional[Iterable[str]] = None) -> datetime:
+        """Fetch start for an incremental run: the lowest high-water mark of `portal_names` (default all portals).
+
+        Portals without a mark yet (and runs without the ledger) fall back to
+        `sync_interval_minutes` before now.
+        """
+        sync_interval = timedelta(minutes=self.config['sync']['sync_interval_minutes'])
+        try:
+            if getattr(self.db_connector, 'db_type', '').lower() == 'django':
+                from django.utils import timezone as _tz
+                now_dt = _tz.now()
+            else:
+                now_dt = datetime.utcnow()
+        except Exception:
+            now_dt = datetime.utcnow()
+        window_since = now_dt - sync_interval
+        if not ledger:
+            return window_since
+        try:
+            marks = ledger.high_water_marks(list(portal_names or self.portals))
+        except Exception as e:
+            self.logger.warning(f"Could not read high-water marks, using the sync interval: {e}")
+            return window_since
+        known = [mark for mark in marks.values() if mark is not None]
+        if not known:
+            return window_since
+        return min(known) if len(known) == len(marks) else min(known + [window_since])
+
+    def _fetch_chunk_size(self) -> int:
+        return int(self.config['sync'].get('fetch_chunk_size') or DatabaseConnector.FETCH_CHUNK_SIZE)
+
+    def plan_portal_chunks(self, portal_name: str, incremental: bool = True) -> List[List[int]]:
+        """Job ids to push to one portal, split into `sync.fetch_chunk_size` chunks (Django mode only).
+
+        Incremental plans start at this portal's own high-water mark, so a
+        portal that fell behind does not widen the others' runs.
+        """
+        from apps.jobs.services import JobDeliveryLedgerService  # type: ignore
+
+        since = None
+        if incremental:
+            since = self._incremental_since(JobDeliveryLedgerService, [portal_name])
+            self.logger.info(f"{portal_name}: planning incremental sync since {since}")
+        return list(self.db_connector.fetch_job_ids(since=since, chunk_size=self._fetch_chunk_size()))
+
+    def sync_chunk(self, portal_name: str, job_ids: List[int], run_id: int, portal_result_id: int,
+                   force: bool = False) -> PortalSyncStats:
+        """Push one planned chunk to one portal and add its counts to the run's progress.
+
+        Loads the payloads from the primary, so jobs deleted since planning
+        are dropped and edits made since are sent in their latest form.
+        """
+        from apps.jobs.models import JobSyncRun, JobSyncPortalResult, JobSyncJobResult  # type: ignore
+        from apps.jobs.services import JobDeliveryLedgerService, JobSyncProgressService  # type: ignore
+
+        portal_adapter = self.portals[portal_name]
+        run_row = JobSyncRun.objects.get(id=run_id)
+        portal_result_row = JobSyncPortalResult.objects.get(id=portal_result_id)
+        jobs = self.normalize_jobs(self.db_connector.fetch_jobs_by_ids(job_ids))
+        stats = self._sync_portal(
+            portal_name, portal_adapter, jobs, run_row, portal_result_row, JobSyncJobResult,
+            JobDeliveryLedgerService, force,
+        )
+        JobSyncProgressService.record_chunk(portal_result_id, stats.success, stats.failed, stats.skipped)
+        return stats
+
+    def finish_portal_sync(self, portal_name: str, stats: PortalSyncStats, fetch_started: datetime) -> None:
+        """Advance the portal's high-water mark after all its chunks ran."""
+        from apps.jobs.services import JobDeliveryLedgerService  # type: ignore
+
+        self._advance_high_water_marks(JobDeliveryLedgerService, {portal_name: stats}, fetch_started)
+        self.logger.info(f"{portal_name}: {stats.success} success, {stats.failed} failed, {stats.skipped} unchanged")
+
+    def _verification_block(self, start_time: datetime) -> Optional[Dict]:
+        """Run machine and target verification; returns a 'blocked' result, or None to proceed."""
+        # Machine verification before proceeding
+        machine_check = self.verify_machine_authorization()
+        if not machine_check['authorized']:
+            return {
+                'status': 'blocked',
+                'error': 'Machine not authorized for data sync',
+                'machine_info': machine_check.get('machine', {}),
+                'reason': machine_check.get('reason'),
+                'message': 'Add this machine to authorized_machines in configuration',
+                'start_time': start_time.isoformat(),
+                'end_time': datetime.now().isoformat()
+            }
+
+        # Target machine verification for all portals
+        for portal_name in self.portals.keys():
+            target_check = self.verify_target_machine(portal_name)
+            if not target_check['verified']:
                 return {
                     'status': 'blocked',
-                    'error': 'Machine not authorized for data sync',
-                    'machine_info': machine_check.get('machine', {}),
-                    'reason': machine_check.get('reason'),
-                    'message': 'Add this machine to authorized_machines in configuration',
+                    'error': f'Target machine verification failed for {portal_name}',
+                    'target_info': target_check,
+                    'message': 'Target machine not authorized or configuration mismatch',
                     'start_time': start_time.isoformat(),
                     'end_time': datetime.now().isoformat()
                 }
-            
-            # Target machine verification for all portals
-            for portal_name in self.portals.keys():
-                target_check = self.verify_target_machine(portal_name)
-                if not target_check['verified']:
-                    return {
-                        'status': 'blocked', 
-                        'error': f'Target machine verification failed for {portal_name}',
-                        'target_info': target_check,
-                        'message': 'Target machine not authorized or configuration mismatch',
-                        'start_time': start_time.isoformat(),
-                        'end_time': datetime.now().isoformat()
-                    }
-            
-            self.logger.info("Machine verification passed - proceeding with data sync")
+
+        self.logger.info("Machine verification passed - proceeding with data sync")
+        return None
+
+    def sync_jobs(self, limit: Optional[int] = None, incremental: bool = True, force: bool = False) -> Dict:
+        """Synchronize jobs from database to all portals.
+
+        Jobs already delivered to a portal with an identical payload are
+        skipped unless `force` is set. Incremental runs fetch jobs changed
+        since the lowest portal high-water mark; every unlimited run then
+        advances the marks. Each portal is locked for the whole run with the
+        same lock as the Celery sync tasks, so the two never push to a portal
+        at once; a portal held by another run is recorded as `locked`.
+        """
+        start_time = datetime.now()
+        held_locks: Dict[str, Tuple[Any, str]] = {}
+        lock_keepers = ExitStack()
+
+        try:
+            blocked = self._verification_block(start_time)
+            if blocked:
+                return blocked
             
             # Connect to database
             if not self.db_connector.connect():
@@ -1157,11 +2215,16 @@ class JobDataSynchronizer:
             JobSyncRun = None  # type: ignore
             JobSyncPortalResult = None  # type: ignore
             JobSyncJobResult = None  # type: ignore
+            ledger = None
+            portal_sync_lock = None
             try:
                 from apps.jobs.models import JobSyncRun as _JobSyncRun, JobSyncPortalResult as _JobSyncPortalResult, JobSyncJobResult as _JobSyncJobResult  # type: ignore
                 JobSyncRun = _JobSyncRun
                 JobSyncPortalResult = _JobSyncPortalResult
                 JobSyncJobResult = _JobSyncJobResult
+                from apps.jobs.services import JobDeliveryLedgerService  # type: ignore
+                ledger = JobDeliveryLedgerService
+                from apps.jobs.tasks import portal_sync_lock  # type: ignore
             except Exception:
                 pass
             
@@ -1173,25 +2236,69 @@ class JobDataSynchronizer:
                 except Exception:
                     run_row = None
             
+            portals = self.portals
+            locks_lost: Dict[str, threading.Event] = {}
+            if portal_sync_lock:
+                portals, held_locks = self._lock_portals(portal_sync_lock, run_row, JobSyncPortalResult)
+                locks_lost = {
+                    portal_name: lock_keepers.enter_context(lock.keep_alive(token))
+                    for portal_name, (lock, token) in held_locks.items()
+                }
+            locked_results = {
+                portal_name: {'status': 'locked', 'success': 0, 'failed': 0, 'skipped': 0, 'success_rate': 0.0}
+                for portal_name in self.portals if portal_name not in portals
+            }
+            if self.portals and not portals:
+                self.logger.info("Every portal is held by another sync run; nothing to do")
+
             # Determine sync period for incremental sync
             since = None
             if incremental:
-                sync_interval = timedelta(minutes=self.config['sync']['sync_interval_minutes'])
-                try:
-                    if getattr(self.db_connector, 'db_type', '').lower() == 'django':
-                        from django.utils import timezone as _tz
-                        now_dt = _tz.now()
-                    else:
-                        now_dt = datetime.utcnow()
-                except Exception:
-                    now_dt = datetime.utcnow()
-                since = now_dt - sync_interval
+                since = self._incremental_since(ledger, list(portals))
                 self.logger.info(f"Performing incremental sync since {since}")
             
-            # Fetch jobs from database
-            jobs = self.db_connector.fetch_jobs(limit=limit, since=since)
-            
-            if not jobs:
+            # Stream jobs from the database in bounded chunks; each chunk is pushed to
+            # all portals in parallel before the next one is read
+            chunk_size = self._fetch_chunk_size()
+            fetch_started = self._aware_now()
+            jobs_iter = self.db_connector.fetch_jobs(limit=limit, since=since, chunk_size=chunk_size)
+            jobs_fetched = 0
+            portal_stats = {portal_name: PortalSyncStats() for portal_name in portals}
+            portal_rows: Dict[str, Any] = {}
+            with ThreadPoolExecutor(max_workers=max(1, len(portals)), thread_name_prefix='sync-portal') as pool:
+                while portals:
+                    # Normalized once here and shared by every portal's thread
+                    chunk = self.normalize_jobs(islice(jobs_iter, chunk_size))
+                    if not chunk:
+                        break
+                    if not jobs_fetched:
+                        portal_rows = {
+                            portal_name: self._create_portal_result(portal_name, portal_adapter, run_row, JobSyncPortalResult)
+                            for portal_name, portal_adapter in portals.items()
+                        }
+                    jobs_fetched += len(chunk)
+                    futures = {
+                        pool.submit(
+                            self._sync_portal, portal_name, portal_adapter, chunk,
+                            run_row, portal_rows.get(portal_name), JobSyncJobResult, ledger, force,
+                        ): portal_name
+                        for portal_name, portal_adapter in portals.items()
+                    }
+                    for future in as_completed(futures):
+                        portal_stats[futures[future]].merge(future.result())
+
+            # Pushes made after a portal's lock was taken over were not guarded,
+            # so its mark stays put
+            for portal_name, lost in locks_lost.items():
+                if lost.is_set():
+                    portal_stats[portal_name].hold = True
+
+            # A limited run may have left older changes behind, so only complete
+            # runs move the marks
+            if ledger and limit is None:
+                self._advance_high_water_marks(ledger, portal_stats, fetch_started)
+
+            if not jobs_fetched:
                 self.logger.info("No new jobs to sync")
                 # Update run row if exists
                 if run_row:
@@ -1212,155 +2319,53 @@ class JobDataSynchronizer:
                     'duration_seconds': (end_time - start_time).total_seconds(),
                     'jobs_fetched': 0,
                     'total_synced': 0,
-                    'portals': {}
+                    'portals': locked_results
                 }
-            
-            # Sync to each portal
-            portal_results = {}
+
+            portal_results = dict(locked_results)
             total_synced = 0
-            
-            for portal_name, portal_adapter in self.portals.items():
-                self.logger.info(f"Syncing {len(jobs)} jobs to {portal_name}")
-                
-                # Process in batches
-                batch_size = self.config['sync']['batch_size']
-                portal_success = 0
-                portal_failed = 0
-                portal_result_row = None
-                # Compute target URL for this portal if possible
-                target_url = None
-                try:
-                    base = f"{portal_adapter.config.get('base_url','')}".rstrip('/')
-                    endpoint_path = portal_adapter.config.get('endpoint_path')
-                    target_url = f"{base}{endpoint_path}" if endpoint_path else (base or None)
-                except Exception:
-                    target_url = None
-                # Create portal result aggregate if models available
-                if JobSyncPortalResult and run_row:
-                    try:
-                        portal_result_row = JobSyncPortalResult.objects.create(  # type: ignore
-                            run=run_row,
-                            portal_name=str(portal_name),
-                            target_url=str(target_url or ''),
-                            batch_size=int(batch_size)
-                        )
-                    except Exception:
-                        portal_result_row = None
-                
-                for i in range(0, len(jobs), batch_size):
-                    batch = jobs[i:i + batch_size]
-                    # Normalize each job to guarantee required fields
-                    normalized_batch = [self._normalize_job_payload(j) for j in batch]
-                    
-                    # Push one-by-one so we can log individual results
-                    for job_payload in normalized_batch:
-                        try:
-                            transformed = portal_adapter.transform_job_data(job_payload)
-                            # Apply encryption if enabled (optional, graceful fallback)
-                            final_payload = self._prepare_payload_for_transmission(transformed)
-                        except Exception as _exc:
-                            portal_failed += 1
-                            # Record failed transform
-                            if JobSyncJobResult and run_row and portal_result_row:
-                                try:
-                                    JobSyncJobResult.objects.create(  # type: ignore
-                                        run=run_row,
-                                        portal_result=portal_result_row,
-                                        job_id=str(job_payload.get('id') or job_payload.get('job_id') or ''),
-                                        request_url=str(target_url or ''),
-                                        request_headers=dict(getattr(portal_adapter.session, 'headers', {})),
-                                        request_payload=job_payload,
-                                        response_status=None,
-                                        response_body='transform_error',
-                                        was_success=False,
-                                        error=str(_exc)
-                                    )
-                                except Exception:
-                                    pass
-                            continue
-                        success, info = portal_adapter.push_job(final_payload)
-                        if success:
-                            portal_success += 1
-                        else:
-                            portal_failed += 1
-                        # Persist per-job log if models available
-                        if JobSyncJobResult and run_row and portal_result_row:
-                            try:
-                                response_status = None
-                                response_body = ''
-                                request_url = str(target_url or '')
-                                request_headers = dict(getattr(portal_adapter.session, 'headers', {}))
-                                if isinstance(info, dict):
-                                    response_status = info.get('status_code')
-                                    request_url = info.get('url') or request_url
-                                    # Prefer headers from info if provided
-                                    try:
-                                        if isinstance(info.get('headers'), dict):
-                                            request_headers = info.get('headers')  # type: ignore
-                                    except Exception:
-                                        pass
-                                    # Truncate/serialize response body
-                                    if 'response' in info:
-                                        try:
-                                            response_body = json.dumps(info['response'])[:2000]
-                                        except Exception:
-                                            response_body = str(info['response'])[:2000]
-                                    elif 'response_text' in info:
-                                        response_body = str(info['response_text'])[:2000]
-                                    elif 'text' in info:
-                                        response_body = str(info['text'])[:2000]
-                                JobSyncJobResult.objects.create(  # type: ignore
-                                    run=run_row,
-                                    portal_result=portal_result_row,
-                                    job_id=str(job_payload.get('id') or job_payload.get('job_id') or ''),
-                                    request_url=request_url,
-                                    request_headers=request_headers,
-                                    request_payload=final_payload,
-                                    response_status=response_status,
-                                    response_body=response_body,
-                                    was_success=bool(success),
-                                    error='' if success else (str(info)[:1000] if info else '')
-                                )
-                            except Exception:
-                                pass
-                    
-                    # Small delay between batches
-                    time.sleep(1)
-                
+            for portal_name, stats in portal_stats.items():
+                # Skipped jobs are already on the portal and count as delivered
+                success_rate = (stats.success + stats.skipped) / jobs_fetched
                 portal_results[portal_name] = {
-                    'success': portal_success,
-                    'failed': portal_failed,
-                    'success_rate': portal_success / len(jobs) if jobs else 0
+                    'success': stats.success,
+                    'failed': stats.failed,
+                    'skipped': stats.skipped,
+                    'success_rate': success_rate
                 }
-                
-                total_synced += portal_success
-                self.logger.info(f"{portal_name}: {portal_success} success, {portal_failed} failed")
+                total_synced += stats.success
+                self.logger.info(f"{portal_name}: {stats.success} success, {stats.failed} failed, {stats.skipped} unchanged")
                 # Update aggregate portal result
+                portal_result_row = portal_rows.get(portal_name)
                 if portal_result_row:
                     try:
-                        portal_result_row.success_count = int(portal_success)  # type: ignore
-                        portal_result_row.failure_count = int(portal_failed)  # type: ignore
-                        portal_result_row.success_rate = float(portal_success / len(jobs) if jobs else 0.0)  # type: ignore
+                        portal_result_row.success_count = int(stats.success)  # type: ignore
+                        portal_result_row.failure_count = int(stats.failed)  # type: ignore
+                        portal_result_row.skipped_count = int(stats.skipped)  # type: ignore
+                        portal_result_row.success_rate = float(success_rate)  # type: ignore
+                        portal_result_row.jobs_fetched = jobs_fetched  # type: ignore
+                        portal_result_row.status = 'success'  # type: ignore
+                        portal_result_row.finished_at = self._aware_now()  # type: ignore
                         portal_result_row.save()  # type: ignore
                     except Exception:
                         pass
-            
+
             # Summary
             summary = {
                 'status': 'success',
                 'start_time': start_time.isoformat(),
                 'end_time': datetime.now().isoformat(),
                 'duration_seconds': (datetime.now() - start_time).total_seconds(),
-                'jobs_fetched': len(jobs),
+                'jobs_fetched': jobs_fetched,
                 'total_synced': total_synced,
                 'portals': portal_results
             }
             
-            self.logger.info(f"Sync completed - {len(jobs)} jobs fetched, {total_synced} total synced")
+            self.logger.info(f"Sync completed - {jobs_fetched} jobs fetched, {total_synced} total synced")
             # Update run row
             if run_row:
                 try:
-                    run_row.jobs_fetched = len(jobs)  # type: ignore
+                    run_row.jobs_fetched = jobs_fetched  # type: ignore
                     run_row.total_synced = int(total_synced)  # type: ignore
                     run_row.status = 'success'  # type: ignore
                     run_row.finished_at = self._aware_now()  # type: ignore
@@ -1378,6 +2383,7 @@ class JobDataSynchronizer:
                     run_row.error_message = str(e)[:1000]  # type: ignore
                     run_row.finished_at = self._aware_now()  # type: ignore
                     run_row.save()  # type: ignore
+                    run_row.portal_results.filter(status='running').update(status='error', finished_at=run_row.finished_at)  # type: ignore
             except Exception:
                 pass
             return {
@@ -1387,6 +2393,156 @@ class JobDataSynchronizer:
                 'end_time': datetime.now().isoformat()
             }
         finally:
+            lock_keepers.close()
+            for lock, token in held_locks.values():
+                lock.release(token)
+            self.db_connector.close()
+
+    def drain_outbox(self, batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> Dict:
+        """Deliver queued job changes from the sync outbox to every portal.
+
+        Claims due entries `batch_size` at a time (`sync.outbox_batch_size`,
+        default 100) until none are due or `max_batches` were processed.
+        Several workers can drain at once: claims skip rows locked by others.
+        An entry is done when every portal accepted the job or already had
+        this payload (delivery ledger); otherwise it is retried with
+        exponential backoff and parked as dead after too many attempts.
+        Portals are locked like in `sync_jobs()`; entries a busy portal still
+        needs are deferred without spending an attempt (the ledger keeps the
+        other portals from receiving them twice).
+        """
+        start_time = datetime.now()
+        run_row = None
+        held_locks: Dict[str, Tuple[Any, str]] = {}
+        lock_keepers = ExitStack()
+        try:
+            if getattr(self.db_connector, 'db_type', '').lower() != 'django':
+                raise ValueError("The sync outbox requires the django database type")
+            blocked = self._verification_block(start_time)
+            if blocked:
+                return blocked
+            if not self.db_connector.connect():
+                raise ConnectionError("Failed to connect to database")
+
+            from apps.jobs.models import JobSyncRun, JobSyncPortalResult, JobSyncJobResult  # type: ignore
+            from apps.jobs.services import JobDeliveryLedgerService, JobSyncOutboxService  # type: ignore
+            from apps.jobs.tasks import portal_sync_lock  # type: ignore
+
+            batch_size = max(1, int(batch_size or self.config['sync'].get('outbox_batch_size') or 100))
+            portals, held_locks = self._lock_portals(portal_sync_lock, None, JobSyncPortalResult)
+            for lock, token in held_locks.values():
+                lock_keepers.enter_context(lock.keep_alive(token))
+            busy = [portal_name for portal_name in self.portals if portal_name not in portals]
+            portal_stats = {portal_name: PortalSyncStats() for portal_name in portals}
+            portal_rows: Dict[str, Any] = {}
+            counts = {'claimed': 0, 'delivered': 0, 'deferred': 0, 'retrying': 0, 'dead': 0}
+            batches = 0
+            with ThreadPoolExecutor(max_workers=max(1, len(portals)), thread_name_prefix='outbox-portal') as pool:
+                while (portals or not self.portals) and (max_batches is None or batches < max_batches):
+                    claims = JobSyncOutboxService.claim(batch_size)
+                    if not claims:
+                        break
+                    if run_row is None:
+                        run_row = JobSyncRun.objects.create(incremental=True, status='running')
+                        portal_rows = {
+                            portal_name: self._create_portal_result(portal_name, portal_adapter, run_row, JobSyncPortalResult)
+                            for portal_name, portal_adapter in portals.items()
+                        }
+                    batches += 1
+                    counts['claimed'] += len(claims)
+                    jobs = self.normalize_jobs(self.db_connector.fetch_jobs_by_ids(claim['job_id'] for claim in claims))
+
+                    errors: Dict[str, List[str]] = {}
+                    futures = {
+                        pool.submit(
+                            self._sync_portal, portal_name, portal_adapter, jobs,
+                            run_row, portal_rows.get(portal_name), JobSyncJobResult, JobDeliveryLedgerService,
+                        ): portal_name
+                        for portal_name, portal_adapter in portals.items()
+                    }
+                    for future in as_completed(futures):
+                        stats = future.result()
+                        portal_stats[futures[future]].merge(stats)
+                        for key, error in stats.failed_jobs.items():
+                            errors.setdefault(key, []).append(f"{futures[future]}: {error}")
+
+                    # Jobs deleted since they were queued have nothing left to deliver
+                    done = [claim for claim in claims if str(claim['job_id']) not in errors]
+                    if busy:
+                        JobSyncOutboxService.defer(done)
+                        counts['deferred'] += len(done)
+                    else:
+                        JobSyncOutboxService.complete(done)
+                        counts['delivered'] += len(done)
+                    for claim in claims:
+                        job_errors = errors.get(str(claim['job_id']))
+                        if job_errors:
+                            dead = JobSyncOutboxService.fail(claim, '; '.join(job_errors))
+                            counts['dead' if dead else 'retrying'] += 1
+
+            portal_results = {}
+            for portal_name, stats in portal_stats.items():
+                portal_results[portal_name] = {'success': stats.success, 'failed': stats.failed, 'skipped': stats.skipped}
+                portal_result_row = portal_rows.get(portal_name)
+                if portal_result_row:
+                    try:
+                        handled = stats.success + stats.failed + stats.skipped
+                        portal_result_row.success_count = int(stats.success)  # type: ignore
+                        portal_result_row.failure_count = int(stats.failed)  # type: ignore
+                        portal_result_row.skipped_count = int(stats.skipped)  # type: ignore
+                        portal_result_row.success_rate = float((stats.success + stats.skipped) / handled) if handled else 1.0  # type: ignore
+                        portal_result_row.jobs_fetched = counts['claimed']  # type: ignore
+                        portal_result_row.status = 'success'  # type: ignore
+                        portal_result_row.finished_at = self._aware_now()  # type: ignore
+                        portal_result_row.save()  # type: ignore
+                    except Exception:
+                        pass
+            if run_row:
+                run_row.jobs_fetched = counts['claimed']  # type: ignore
+                run_row.total_synced = sum(stats.success for stats in portal_stats.values())  # type: ignore
+                run_row.status = 'success'  # type: ignore
+                run_row.finished_at = self._aware_now()  # type: ignore
+                run_row.save()  # type: ignore
+
+            end_time = datetime.now()
+            summary = {
+                'status': 'success',
+                'start_time': start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'duration_seconds': (end_time - start_time).total_seconds(),
+                'batches': batches,
+                **counts,
+                'outbox': JobSyncOutboxService.stats(),
+                'portals': portal_results,
+                'locked_portals': busy,
+            }
+            self.logger.info(
+                f"Outbox drained - {counts['claimed']} claimed, {counts['delivered']} delivered, "
+                f"{counts['deferred']} deferred, {counts['retrying']} retrying, {counts['dead']} dead"
+                + (f" (busy portals: {', '.join(busy)})" if busy else '')
+            )
+            return summary
+        except Exception as e:
+            self.logger.error(f"Outbox drain failed: {e}")
+            try:
+                if run_row:
+                    run_row.status = 'error'  # type: ignore
+                    run_row.error_message = str(e)[:1000]  # type: ignore
+                    run_row.finished_at = self._aware_now()  # type: ignore
+                    run_row.save()  # type: ignore
+                    run_row.portal_results.filter(status='running').update(status='error', finished_at=run_row.finished_at)  # type: ignore
+            except Exception:
+                pass
+            return {
+                'status': 'error',
+                'error': str(e),
+                'start_time': start_time.isoformat(),
+                'end_time': datetime.now().isoformat()
+            }
+        finally:
+            lock_keepers.close()
+            for lock, token in held_locks.values():
+                lock.release(token)
             self.db_connector.close()
 
 def main():
@@ -1397,6 +2553,7 @@ def main():
     parser.add_argument('--config', help='Path to configuration file')
     parser.add_argument('--limit', type=int, help='Limit number of jobs to sync')
     parser.add_argument('--full', action='store_true', help='Full sync (not incremental)')
+    parser.add_argument('--force', action='store_true', help='Re-push jobs already delivered unchanged')
     parser.add_argument('--output', help='Save results to JSON file')
     
     args = parser.parse_args()
@@ -1406,7 +2563,7 @@ def main():
     
     # Run synchronization
     incremental = not args.full
-    results = sync.sync_jobs(limit=args.limit, incremental=incremental)
+    results = sync.sync_jobs(limit=args.limit, incremental=incremental, force=args.force)
     
     # Save results if requested
     if args.output:
@@ -1427,10 +2584,14 @@ def main():
         print(f"Duration: {duration_seconds:.2f} seconds")
         print("\nPortal Results:")
         for portal, stats in (results.get('portals') or {}).items():
+            if stats.get('status') == 'locked':
+                print(f"  {portal}: skipped, held by another sync run")
+                continue
             success = stats.get('success', 0)
             failed = stats.get('failed', 0)
+            skipped = stats.get('skipped', 0)
             success_rate = float(stats.get('success_rate', 0))
-            print(f"  {portal}: {success} success, {failed} failed ({success_rate:.1%})")
+            print(f"  {portal}: {success} success, {failed} failed, {skipped} unchanged ({success_rate:.1%})")
     else:
         print(f"Sync failed: {results['error']}")
 
@@ -4,11 +4,17 @@ Simple Job Sync Runner
 ======================
 
 Easy-to-use script for running job data synchronization between your scrapper and job portals.
+
+Outbox worker mode (non-interactive):
+    python script/run_job_sync.py --drain            # deliver due outbox entries, then exit
+    python script/run_job_sync.py --drain --loop     # keep draining; run several for more throughput
+    python script/run_job_sync.py --retry-dead       # re-queue dead-lettered entries
 """
 
 import os
 import sys
 import json
+import time
 import argparse
 from datetime import datetime
 
@@ -55,18 +61,55 @@ def display_config_summary(config):
     print(f"  Incremental: {'Yes' if sync_config['incremental'] else 'No'}")
     print(f"  Interval: {sync_config['sync_interval_minutes']} minutes")
 
+def run_outbox_worker(config_file, loop: bool = False, idle_seconds: float = 5.0):
+    """Drain the sync outbox once, or forever with `loop` (sleeping while it is empty)."""
+    sync = JobDataSynchronizer(config_file=config_file)
+    while True:
+        results = sync.drain_outbox()
+        if results['status'] != 'success':
+            print(f"❌ Outbox drain failed: {results.get('error')}")
+        elif results['claimed'] or not loop:
+            print(
+                f"📤 Outbox: {results['delivered']} delivered, {results['deferred']} deferred "
+                f"(busy portals: {results['locked_portals']}), {results['retrying']} retrying, "
+                f"{results['dead']} dead (queue: {results['outbox']})"
+            )
+        if not loop:
+            return results
+        if results['status'] != 'success' or not results['claimed']:
+            time.sleep(idle_seconds)
+
+
 def main():
     """Interactive job sync runner."""
-    print("="*60)
-    print("JOB DATA SYNCHRONIZER")
-    print("Scrapper Database → Job Portals")
-    print("="*60)
-    
     # Parse optional --config argument
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--config', help='Path to configuration file')
+    parser.add_argument('--drain', action='store_true', help='Deliver queued outbox entries (non-interactive)')
+    parser.add_argument('--loop', action='store_true', help='With --drain: keep draining as entries arrive')
+    parser.add_argument('--retry-dead', action='store_true', help='Re-queue dead-lettered outbox entries')
     args, _ = parser.parse_known_args()
 
+    if args.drain or args.retry_dead:
+        config_file = args.config if args.config and os.path.exists(args.config) else None
+        if args.retry_dead:
+            # connect() sets up Django in django database mode
+            sync = JobDataSynchronizer(config_file=config_file)
+            sync.db_connector.connect()
+            from apps.jobs.services import JobSyncOutboxService
+            print(f"♻ Re-queued {JobSyncOutboxService.retry_dead()} dead outbox entries")
+        if args.drain:
+            try:
+                run_outbox_worker(config_file, loop=args.loop)
+            except KeyboardInterrupt:
+                pass
+        return
+
+    print("="*60)
+    print("JOB DATA SYNCHRONIZER")
+    print("Scrapper Database → Job Portals")
+    print("="*60)
+
     # Resolve config file
     config_file = None
     if args.config and os.path.exists(args.config):
@@ -166,8 +209,12 @@ def main():
                 
                 print(f"\n📋 Portal Results:")
                 for portal, stats in results['portals'].items():
+                    if stats.get('status') == 'locked':
+                        print(f"  {portal.title()}: skipped, held by another sync run")
+                        continue
                     success_rate = stats['success_rate'] * 100
-                    print(f"  {portal.title()}: {stats['success']}/{stats['success'] + stats['failed']} ({success_rate:.1f}%)")
+                    skipped_text = f", {stats['skipped']} unchanged" if stats.get('skipped') else ""
+                    print(f"  {portal.title()}: {stats['success']}/{stats['success'] + stats['failed']}{skipped_text} ({success_rate:.1f}%)")
                 
                 # Save results
                 result_file = f"sync_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -185,6 +232,14 @@ if __name__ == "__main__":
     main()
 
 
+def default_config_file():
+    """Sync config path for non-interactive runs: $JOB_SYNC_CONFIG, else script/job_sync_config.json, else None."""
+    # Prefer explicit env-provided config path if given
+    env_cfg = os.getenv('JOB_SYNC_CONFIG')
+    config_path = env_cfg if env_cfg and os.path.exists(env_cfg) else os.path.join(CURRENT_DIR, 'job_sync_config.json')
+    return config_path if os.path.exists(config_path) else None
+
+
 # Non-interactive entrypoint for Celery scheduler
 def run():
     """Run a non-interactive sync using config in this directory.
@@ -193,12 +248,21 @@ def run():
     - Uses `script/job_sync_config.json` if present
     - Respects env var `SYNC_FULL=true` to perform a full sync
     - Otherwise performs incremental sync
+    - Respects env var `SYNC_FORCE=true` to re-push jobs already delivered unchanged
     """
-    # Prefer explicit env-provided config path if given
-    env_cfg = os.getenv('JOB_SYNC_CONFIG')
-    config_path = env_cfg if env_cfg and os.path.exists(env_cfg) else os.path.join(CURRENT_DIR, 'job_sync_config.json')
-    config_file = config_path if os.path.exists(config_path) else None
-
-    sync = JobDataSynchronizer(config_file=config_file)
+    sync = JobDataSynchronizer(config_file=default_config_file())
     full_env = (os.getenv('SYNC_FULL', 'false').lower() == 'true')
-    return sync.sync_jobs(incremental=not full_env)
+    force_env = (os.getenv('SYNC_FORCE', 'false').lower() == 'true')
+    return sync.sync_jobs(incremental=not full_env, force=force_env)
+
+
+def drain():
+    """Deliver due sync outbox entries once; non-interactive.
+
+    Designed to be called as `script.run_job_sync:drain` from the scheduler.
+    Config resolution matches `run()`; the synchronizer is the worker's
+    shared one (`apps.jobs.tasks._synchronizer`), not rebuilt every call.
+    """
+    from apps.jobs.tasks import _synchronizer
+
+    return _synchronizer().drain_outbox()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Stand-in Job Portal Receiver
+============================
+
+Local HTTP receiver for exercising JobDataSynchronizer without a real portal.
+
+- POST <single path> (default /jobs/external/create/): one job object
+- POST <batch path> (default /jobs/external/bulk-create/): JSON array of jobs,
+  optionally sent with Content-Encoding: gzip, or an encrypted batch envelope
+  (needs --encryption-key); answers {"results": [...]} with one
+  {index, success, id|error} entry per job
+- GET <capabilities path> (default /jobs/external/capabilities/): envelope
+  formats accepted, for `envelope.capabilities_path` negotiation
+- GET /stats: request and job counters
+- POST /reset: clear stored jobs and counters
+
+Job POSTs can be throttled like a rate-limited portal: beyond --max-rps
+requests per second, and for a --throttle-rate share of the rest, the
+receiver answers 429 with a Retry-After of --retry-after seconds.
+
+Usage:
+    python script/sync_test_receiver.py --port 8002 --latency 0.05 --item-error-rate 0.01
+    python script/sync_test_receiver.py --max-rps 20 --throttle-rate 0.05 --retry-after 1
+
+Point a portal at it with base_url http://127.0.0.1:8002 and, for batch mode,
+"batch_endpoint_path": "/jobs/external/bulk-create/".
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from script.job_data_sync import ENCRYPTION_AVAILABLE, EnvelopeCodec, decode_envelope
+
+
+class ReceiverState:
+    """Jobs received so far, keyed by external id, plus counters."""
+
+    def __init__(self, latency: float = 0.0, item_error_rate: float = 0.0, encryption_key: Optional[str] = None,
+                 throttle_rate: float = 0.0, max_rps: float = 0.0, retry_after: float = 1.0):
+        self.latency = latency
+        self.item_error_rate = item_error_rate
+        self.encryption_key = encryption_key
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_requests = 0
+        self.reset()
+
+    def reset(self):
+        self.jobs: Dict[str, Any] = {}
+        self.stats = {
+            'requests': 0, 'single_requests': 0, 'batch_requests': 0, 'envelopes': 0,
+            'items': 0, 'item_errors': 0, 'bytes': 0, 'throttled': 0,
+        }
+
+    def throttled(self) -> bool:
+        """Count a job POST; True when it should be answered with 429."""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start, self.window_requests = now, 0
+            self.window_requests += 1
+            throttled = bool(self.max_rps and self.window_requests > self.max_rps) or (
+                self.throttle_rate and random.random() < self.throttle_rate
+            )
+            if throttled:
+                self.stats['throttled'] += 1
+            return bool(throttled)
+
+    def accept(self, job: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Store one job; returns (success, result entry)."""
+        if not isinstance(job, dict):
+            return False, {'error': 'job must be an object'}
+        if self.item_error_rate and random.random() < self.item_error_rate:
+            return False, {'error': 'simulated item failure'}
+        key = str(job.get('external_id') or job.get('job_id') or job.get('id') or len(self.jobs))
+        with self.lock:
+            created = key not in self.jobs
+            self.jobs[key] = job
+        return True, {'id': key, 'status': 'created' if created else 'updated'}
+
+
+def make_handler(state: ReceiverState, single_path: str, batch_path: str,
+                 capabilities_path: str = '/jobs/external/capabilities/'):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_json(self) -> Optional[Any]:
+            raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            with state.lock:
+                state.stats['bytes'] += len(raw)
+            if self.headers.get('X-Envelope-Version'):
+                if not state.encryption_key:
+                    return None
+                try:
+                    jobs = decode_envelope(raw, self.headers, state.encryption_key)
+                except Exception:
+                    return None
+                with state.lock:
+                    state.stats['envelopes'] += 1
+                return jobs
+            if self.headers.get('Content-Encoding') == 'gzip':
+                raw = gzip.decompress(raw)
+            try:
+                return json.loads(raw or b'null')
+            except ValueError:
+                return None
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] == capabilities_path:
+                envelope = {}
+                if state.encryption_key and ENCRYPTION_AVAILABLE:
+                    envelope = {
+                        'version': [EnvelopeCodec.VERSION],
+                        'compression': list(EnvelopeCodec.available_compressions()),
+                        'transport': list(EnvelopeCodec.TRANSPORTS),
+                    }
+                return self._send(200, {'envelope': envelope})
+            if self.path.rstrip('/') == '/stats':
+                with state.lock:
+                    body = dict(state.stats, jobs=len(state.jobs))
+                return self._send(200, body)
+            return self._send(404, {'detail': 'not found'})
+
+        def do_POST(self):
+            path = self.path.split('?', 1)[0]
+            if path.rstrip('/') == '/reset':
+                with state.lock:
+                    state.reset()
+                return self._send(200, {'reset': True})
+            if path not in (single_path, batch_path):
+                return self._send(404, {'detail': 'not found'})
+
+            payload = self._read_json()
+            with state.lock:
+                state.stats['requests'] += 1
+            # Rate limiting answers before any processing time
+            if state.throttled():
+                return self._send(429, {'detail': 'rate limited'}, {'Retry-After': f"{state.retry_after:g}"})
+            if state.latency:
+                time.sleep(state.latency)
+
+            if path == batch_path:
+                if not isinstance(payload, list):
+                    return self._send(400, {'detail': 'expected a JSON array'})
+                results = []
+                for index, job in enumerate(payload):
+                    success, entry = state.accept(job)
+                    results.append(dict(entry, index=index, success=success))
+                with state.lock:
+                    state.stats['batch_requests'] += 1
+                    state.stats['items'] += len(payload)
+                    state.stats['item_errors'] += sum(1 for r in results if not r['success'])
+                return self._send(200, {'results': results})
+
+            success, entry = state.accept(payload)
+            with state.lock:
+                state.stats['single_requests'] += 1
+                state.stats['items'] += 1
+                state.stats['item_errors'] += 0 if success else 1
+            return self._send(201 if success else 422, entry)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = '127.0.0.1', port: int = 8002, latency: float = 0.0, item_error_rate: float = 0.0,
+          single_path: str = '/jobs/external/create/', batch_path: str = '/jobs/external/bulk-create/',
+          encryption_key: Optional[str] = None, capabilities_path: str = '/jobs/external/capabilities/',
+          throttle_rate: float = 0.0, max_rps: float = 0.0, retry_after: float = 1.0):
+    """Create the server (not started; port 0 picks a free one). Returns (server, state)."""
+    state = ReceiverState(latency=latency, item_error_rate=item_error_rate, encryption_key=encryption_key,
+                          throttle_rate=throttle_rate, max_rps=max_rps, retry_after=retry_after)
+    server = ThreadingHTTPServer((host, port), make_handler(state, single_path, batch_path, capabilities_path))
+    server.daemon_threads = True
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in job portal receiver for sync tests')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8002)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to sleep per request')
+    parser.add_argument('--item-error-rate', type=float, default=0.0, help='Fraction of jobs to reject')
+    parser.add_argument('--single-path', default='/jobs/external/create/')
+    parser.add_argument('--batch-path', default='/jobs/external/bulk-create/')
+    parser.add_argument('--capabilities-path', default='/jobs/external/capabilities/')
+    parser.add_argument('--encryption-key', default=None,
+                        help='Shared sync key; enables encrypted batch envelopes')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of job POSTs answered with 429')
+    parser.add_argument('--max-rps', type=float, default=0.0, help='Answer 429 beyond this many job POSTs per second')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    args = parser.parse_args()
+
+    server, _ = serve(args.host, args.port, args.latency, args.item_error_rate, args.single_path, args.batch_path,
+                      args.encryption_key, args.capabilities_path, args.throttle_rate, args.max_rps, args.retry_after)
+    print(f"Receiving on http://{args.host}:{args.port} (single {args.single_path}, batch {args.batch_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()